@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtWidgets import QComboBox, QStyledItemDelegate
+
+SIGNS = [u"\u2264", u"\u2265", "="]
+
+
+def parse_number(text):
+    """Число из ячейки: запятая как десятичный разделитель, пустая ячейка - 0. None - не число."""
+    text = str(text).strip().replace(',', '.')
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def format_cell(value):
+    return f"{value:.15g}"
+
+
+def get_bounds_data(bounds_table):
+    """
+    Считывает границы переменных из таблицы PyQt (строка 0 - нижние, строка 1 - верхние).
+    Пустая нижняя граница - 0, пустая или '∞' верхняя - без ограничения.
+    """
+    lower, upper = [], []
+    for j in range(bounds_table.columnCount()):
+        for row, out, default in ((0, lower, 0.0), (1, upper, float('inf'))):
+            item = bounds_table.item(row, j)
+            text = item.text().strip().replace(',', '.') if item else ""
+            if not text:
+                out.append(default)
+            elif text.lstrip('+') in ('∞', 'inf'):
+                out.append(float('inf'))
+            else:
+                out.append(float(text))
+    return lower, upper
+
+
+class ProblemData:
+    """
+    Данные задачи для редактора: raw - матрица задачи для
+    simplex_core.calculate_simplex (строка 0 - [0, c], строки 1..m -
+    [b_i, a_i]), signs - знаки ограничений.
+    Таблицы ЦФ и ограничений - модели над одним массивом (ProblemTableModel),
+    решатель получает сам массив без копирования и разбора строк.
+    """
+
+    def __init__(self, num_constrs=2, num_vars=2):
+        self.raw = np.zeros((num_constrs + 1, num_vars + 1))
+        self.signs = [SIGNS[0]] * num_constrs
+        self.models = []
+
+    @property
+    def num_vars(self):
+        return self.raw.shape[1] - 1
+
+    @property
+    def num_constrs(self):
+        return self.raw.shape[0] - 1
+
+    def simplex_data(self):
+        """(raw_matrix, rhs, obj_coeffs) для решателя; raw_matrix - сам массив, не копия."""
+        return self.raw, self.raw[1:, 0].tolist(), self.raw[0, 1:].tolist()
+
+    @contextmanager
+    def _reset(self):
+        for model in self.models:
+            model.beginResetModel()
+        try:
+            yield
+        finally:
+            for model in self.models:
+                model.endResetModel()
+
+    def add_constraint(self):
+        with self._reset():
+            self.raw = np.vstack((self.raw, np.zeros(self.raw.shape[1])))
+            self.signs.append(SIGNS[0])
+
+    def remove_constraint(self):
+        """Удаляет последнее ограничение (одно всегда остается)."""
+        if self.num_constrs > 1:
+            with self._reset():
+                self.raw = self.raw[:-1].copy()
+                self.signs.pop()
+
+    def add_variable(self):
+        with self._reset():
+            self.raw = np.column_stack((self.raw, np.zeros(self.raw.shape[0])))
+
+    def remove_variable(self):
+        """Удаляет последнюю переменную (две всегда остаются)."""
+        if self.num_vars > 2:
+            with self._reset():
+                self.raw = self.raw[:, :-1].copy()
+
+    def set_value(self, row, col, value):
+        """raw[row, col] = value с уведомлением таблиц (например, от слайдера)."""
+        self.raw[row, col] = value
+        for model in self.models:
+            model.raw_changed(row, col)
+
+
+class ProblemTableModel(QAbstractTableModel):
+    """
+    Таблица над ProblemData: строка ЦФ (objective=True) или строки
+    ограничений. Столбцы, как в прежних таблицах: X1..Xn, 'Знак', 'Значение'.
+    Представление запрашивает только видимые ячейки, отдельных объектов
+    на ячейку нет.
+    """
+
+    def __init__(self, problem, objective=False, parent=None):
+        super().__init__(parent)
+        self.problem = problem
+        self.objective = objective
+        problem.models.append(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else (1 if self.objective else self.problem.num_constrs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.problem.num_vars + 2
+
+    def _raw_index(self, row, col):
+        """Ячейка raw для ячейки таблицы; None - столбец знака."""
+        n = self.problem.num_vars
+        if col == n:
+            return None
+        return (0 if self.objective else row + 1), (col + 1 if col < n else 0)
+
+    def raw_changed(self, raw_row, raw_col):
+        row = 0 if self.objective else raw_row - 1
+        if (raw_row == 0) != self.objective:
+            return
+        col = self.problem.num_vars + 1 if raw_col == 0 else raw_col - 1
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        n = self.problem.num_vars
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if col == n:
+                return "=" if self.objective else self.problem.signs[row]
+            if self.objective and col == n + 1:
+                return "E"
+            r, c = self._raw_index(row, col)
+            return format_cell(self.problem.raw[r, c])
+        if role == Qt.TextAlignmentRole and col >= n:
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        if col == self.problem.num_vars:
+            if self.objective or value not in SIGNS:
+                return False
+            self.problem.signs[row] = value
+        else:
+            number = parse_number(value)
+            if number is None:
+                return False
+            r, c = self._raw_index(row, col)
+            self.problem.raw[r, c] = number
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.objective and index.column() >= self.problem.num_vars:
+            return Qt.ItemIsEnabled
+        return flags | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return str(section + 1)
+        n = self.problem.num_vars
+        if section < n:
+            return f"X{section+1}"
+        return "Знак" if section == n else "Значение"
+
+
+class SignDelegate(QStyledItemDelegate):
+    """Выбор знака ограничения выпадающим списком при редактировании ячейки (без виджета в каждой строке)."""
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.addItems(SIGNS)
+        combo.setStyleSheet("border: none; background: transparent;")
+        return combo
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
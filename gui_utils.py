@@ -1,4 +1,6 @@
 import math
+from fractions import Fraction
+
 import numpy as np
 import matplotlib
 matplotlib.use('Qt5Agg') 
@@ -15,6 +17,12 @@ try:
 except:
     pass
 
+def format_number(value, digits):
+    """Число для таблиц: дроби точного метода выводятся как p/q, остальные - с digits знаками."""
+    if isinstance(value, Fraction):
+        return str(value)
+    return f"{value:.{digits}f}"
+
 class MplCanvas(FigureCanvasQTAgg):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         # Прозрачный фон фигуры, чтобы сливался с карточкой интерфейса
@@ -75,8 +83,37 @@ class MplCanvas(FigureCanvasQTAgg):
         
         self.fig.canvas.draw_idle()
 
-def plot_constraints(canvas, constraint_table, optimal_vars, obj_coeffs=None):
-    """Рисует график ограничений, область и линию целевой функции."""
+def plot_parametric(canvas, segments, base, label):
+    """
+    Ломаная E(параметр) по участкам simplex_parametric: по оси X - значение
+    параметра (base + t), изломы отмечены точками, текущее значение -
+    вертикальной линией.
+    """
+    import simplex_parametric
+    ax = canvas.axes
+    ax.clear()
+    t, z = simplex_parametric.curve(segments)
+    ax.plot(base + t, z, color='#007AFF', linewidth=2, label='E')
+    ax.plot(base + t, z, 'o', color='#FF3B30', markersize=5, zorder=10, label='Изломы')
+    ax.axvline(x=base, linestyle='--', color='#8E8E93', alpha=0.8, label=f'{label} = {base:g}')
+
+    ax.grid(True, linestyle='-', color='#E5E5EA', alpha=0.6)
+    ax.set_title(f"Зависимость E от {label}", fontsize=12, fontweight='bold', pad=15)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color('#D2D2D7')
+    ax.spines['bottom'].set_color('#D2D2D7')
+    ax.set_xlabel(label, fontsize=10, weight='bold', color='#3C3C43')
+    ax.set_ylabel("E", fontsize=10, weight='bold', color='#3C3C43')
+    ax.legend(fontsize='small', loc='best', frameon=True, edgecolor='#D2D2D7')
+    canvas.draw()
+
+def plot_constraints(canvas, problem, optimal_vars, obj_coeffs=None, bounds=None):
+    """
+    Рисует график ограничений, область и линию целевой функции.
+    problem - gui_models.ProblemData (ограничения берутся из ее массива),
+    bounds - (нижние, верхние) границы X1, X2.
+    """
     ax = canvas.axes
     ax.clear()
     
@@ -87,31 +124,24 @@ def plot_constraints(canvas, constraint_table, optimal_vars, obj_coeffs=None):
     COLOR_GRID = '#E5E5EA'
     
     try:
-        rows = constraint_table.rowCount()
-        cols = constraint_table.columnCount()
-        constraints = []
-        
-        # Считывание ограничений
-        for i in range(rows):
-            a_item = constraint_table.item(i, 0)
-            b_item = constraint_table.item(i, 1)
-            c_item = constraint_table.item(i, cols - 1)
-            
-            a = float(a_item.text()) if a_item and a_item.text().strip() else 0.0
-            b = float(b_item.text()) if b_item and b_item.text().strip() else 0.0
-            c = float(c_item.text()) if c_item and c_item.text().strip() else 0.0
-            
-            sign_widget = constraint_table.cellWidget(i, cols - 2)
-            sign = sign_widget.currentText()
-            
-            constraints.append({'a': a, 'b': b, 'sign': sign, 'c': c})
+        # Ограничения: столбцы raw - правая часть, X1, X2
+        constraints = [
+            {'a': a, 'b': b, 'sign': sign, 'c': c}
+            for (c, a, b), sign in zip(problem.raw[1:, :3].tolist(), problem.signs)
+        ]
 
         # Поиск пересечений
         lines = []
         for const in constraints:
             lines.append((const['a'], const['b'], const['c']))
-        lines.append((1, 0, 0)) # X1 >= 0
-        lines.append((0, 1, 0)) # X2 >= 0
+        # Границы переменных (по умолчанию X1 >= 0, X2 >= 0)
+        low, high = [0.0, 0.0], [float('inf'), float('inf')]
+        if bounds:
+            low, high = list(bounds[0][:2]), list(bounds[1][:2])
+        lines.append((1, 0, low[0])) # X1 >= l1
+        lines.append((0, 1, low[1])) # X2 >= l2
+        if high[0] != float('inf'): lines.append((1, 0, high[0]))
+        if high[1] != float('inf'): lines.append((0, 1, high[1]))
 
         intersection_points = []
         for i in range(len(lines)):
@@ -126,7 +156,8 @@ def plot_constraints(canvas, constraint_table, optimal_vars, obj_coeffs=None):
 
         valid_points = []
         for px, py in intersection_points:
-            if px < -1e-5 or py < -1e-5: continue 
+            if px < low[0] - 1e-5 or py < low[1] - 1e-5: continue 
+            if px > high[0] + 1e-5 or py > high[1] + 1e-5: continue
             
             satisfies_all = True
             for const in constraints:
@@ -183,6 +214,12 @@ def plot_constraints(canvas, constraint_table, optimal_vars, obj_coeffs=None):
                 if abs(a) > 1e-9:
                     ax.axvline(x=c/a, linestyle='--', color=lc, alpha=0.7, label=f'{a}X1 {s} {c}')
 
+        # Верхние границы переменных
+        if high[0] != float('inf'):
+            ax.axvline(x=high[0], linestyle=':', color='#8E8E93', alpha=0.8, label=f'X1 ≤ {high[0]}')
+        if high[1] != float('inf'):
+            ax.axhline(y=high[1], linestyle=':', color='#8E8E93', alpha=0.8, label=f'X2 ≤ {high[1]}')
+
         # === ОТРИСОВКА ЦЕЛЕВОЙ ФУНКЦИИ (Z) ===
         if obj_coeffs and len(obj_coeffs) >= 2:
             c1, c2 = obj_coeffs[0], obj_coeffs[1]
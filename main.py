@@ -1,16 +1,24 @@
 import sys
+from fractions import Fraction
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QTableWidget, 
                              QTableWidgetItem, QMessageBox, QVBoxLayout, QLabel, 
                              QComboBox, QPushButton, QHBoxLayout, QSizePolicy, 
                              QScrollArea, QFrame, QSlider, QHeaderView, 
-                             QGraphicsDropShadowEffect, QTabWidget, QGridLayout)
+                             QGraphicsDropShadowEffect, QTabWidget, QGridLayout, QCheckBox,
+                             QDialog, QTableView, QAbstractItemView)
 from PyQt5.QtCore import Qt, QSize, QTimer
 from PyQt5.QtGui import QColor, QFont, QIcon
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
 
 # Импорт наших модулей
-import simplex_core
+import numpy as np
+
+import simplex_api
+import simplex_cache
+import simplex_parametric
+import simplex_session
 import gui_utils
+import gui_models
 
 # --- STYLESHEET (Apple Style) ---
 STYLESHEET = """
@@ -80,7 +88,7 @@ QPushButton#PrimaryButton:pressed {
 }
 
 /* Таблицы */
-QTableWidget {
+QTableView {
     background-color: #FFFFFF;
     border: 1px solid #D1D1D6;
     border-radius: 8px;
@@ -199,6 +207,8 @@ class MainWindow(QMainWindow):
         
         self.slider_widgets = []
         self.canvas_widget = None
+        self.session = None # Сеанс повторной оптимизации для слайдеров
+        self.solve_cache = simplex_cache.SolveCache() # Повторные состояния задачи не решаются заново
         
         # self.recalc_timer = QTimer()
         # self.recalc_timer.setSingleShot(True)
@@ -282,7 +292,16 @@ class MainWindow(QMainWindow):
         lbl_constr.setProperty("class", "SubHeader")
         self.input_layout.addWidget(lbl_constr)
         
-        self.constraint_table = self.create_table(2, 4, self.CONSTRAINT_EQUALITY_SIGNS, self.create_header_labels(2))
+        # Таблицы ЦФ и ограничений - модели над одним массивом задачи (gui_models)
+        self.problem = gui_models.ProblemData(2, 2)
+        self.constraint_model = gui_models.ProblemTableModel(self.problem)
+        self.objective_model = gui_models.ProblemTableModel(self.problem, objective=True)
+        self.constraint_model.dataChanged.connect(self.constraint_data_changed)
+        self.objective_model.dataChanged.connect(self.objective_data_changed)
+        # Новые строки или столбцы: сеанс слайдеров создается заново
+        self.constraint_model.modelReset.connect(self.reset_session)
+
+        self.constraint_table = self.create_table(self.constraint_model, signs=True)
         self.input_layout.addWidget(self.constraint_table)
 
         # Секция целевой функции
@@ -298,21 +317,26 @@ class MainWindow(QMainWindow):
         obj_layout.addWidget(lbl_obj)
         obj_layout.addSpacing(10)
         obj_layout.addWidget(self.operation_combo)
+        obj_layout.addSpacing(10)
+        # Точный метод: таблицы и анализ чувствительности в обыкновенных дробях
+        self.exact_check = QCheckBox("Точные дроби")
+        self.exact_check.setCursor(Qt.PointingHandCursor)
+        obj_layout.addWidget(self.exact_check)
         obj_layout.addStretch()
         self.input_layout.addLayout(obj_layout)
 
-        self.objective_fxn_table = self.create_table(1, 4, ["="], self.create_header_labels(2))
-        # Скрываем combo box для Z строки или блокируем
-        self.objective_fxn_table.setItem(0, 3, QTableWidgetItem("E"))
-        self.objective_fxn_table.item(0, 3).setFlags(Qt.ItemIsEnabled)
-        self.objective_fxn_table.item(0, 3).setTextAlignment(Qt.AlignCenter)
-        # Убираем комбобокс знака для целевой функции, там всегда =
-        combo_widget = QWidget(); combo_widget.setDisabled(True)
-        self.objective_fxn_table.setCellWidget(0, 2, combo_widget)
-        self.objective_fxn_table.setItem(0, 2, QTableWidgetItem("="))
-        self.objective_fxn_table.item(0, 2).setTextAlignment(Qt.AlignCenter)
-        
+        # Знак ЦФ всегда "=", в последнем столбце - "E" (их задает модель, ячейки не редактируются)
+        self.objective_fxn_table = self.create_table(self.objective_model)
         self.input_layout.addWidget(self.objective_fxn_table)
+
+        # Секция границ переменных (не добавляют строк в симплекс-таблицу)
+        lbl_bounds = QLabel("3. Границы переменных")
+        lbl_bounds.setProperty("class", "SubHeader")
+        self.input_layout.addWidget(lbl_bounds)
+
+        self.bounds_table = self.create_bounds_table(2)
+        self.bounds_table.itemChanged.connect(self.bounds_changed)
+        self.input_layout.addWidget(self.bounds_table)
         
         # --- СЛАЙДЕРЫ ДЛЯ ЦЕЛЕВОЙ ФУНКЦИИ (инициализация контейнера) ---
         self.objective_sliders_container = QWidget()
@@ -372,44 +396,88 @@ class MainWindow(QMainWindow):
         self.canvas_widget.draw()
 
     # --- Table Methods ---
-    def create_table(self, rows, cols, signs=None, h_headers=None):
-        table = QTableWidget(self)
-        table.setColumnCount(cols)
-        table.setRowCount(rows)
+    def create_table(self, model, signs=False):
+        # Представление над моделью: рисуются только видимые ячейки
+        table = QTableView(self)
+        table.setModel(model)
         table.setShowGrid(False) # Apple style cleaner look (borders handled by CSS)
         table.setAlternatingRowColors(True) # Чередование цветов
-        
-        if h_headers: table.setHorizontalHeaderLabels(h_headers)
-        
-        # Настройка растягивания
+        table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked |
+                              QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        if signs:
+            table.sign_delegate = gui_models.SignDelegate(table)
+
+        self.setup_table_header(table)
+        table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.adjust_table_height(table)
+        return table
+
+    def setup_table_header(self, table):
+        # Настройка растягивания (при большом числе переменных - прокрутка вместо сжатия столбцов)
+        cols = table.model().columnCount()
         header = table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.Stretch)
+        header.setSectionResizeMode(QHeaderView.Stretch if cols <= 22 else QHeaderView.Interactive)
         # Последние две колонки фиксируем поменьше
         header.setSectionResizeMode(cols-1, QHeaderView.Fixed)
         header.setSectionResizeMode(cols-2, QHeaderView.Fixed)
         table.setColumnWidth(cols-1, 80)
         table.setColumnWidth(cols-2, 60)
-
-        if signs:
-            for i in range(rows): self.set_combo_box(table, i, signs)
-            
-        table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        # Делегат знака переезжает вместе со столбцом "Знак"
+        delegate = getattr(table, 'sign_delegate', None)
+        if delegate:
+            for col in range(cols):
+                table.setItemDelegateForColumn(col, delegate if col == cols - 2 else None)
+
+    def create_bounds_table(self, n):
+        table = QTableWidget(2, n, self)
+        table.setShowGrid(False)
+        table.setAlternatingRowColors(True)
+        table.setHorizontalHeaderLabels([f"X{i+1}" for i in range(n)])
+        table.setVerticalHeaderLabels(["Нижняя", "Верхняя"])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        for j in range(n): self.set_default_bounds(table, j)
         self.adjust_table_height(table)
         return table
 
-    def set_combo_box(self, table, row, options):
-        combo = QComboBox()
-        combo.addItems(options)
-        # Стилизация для ячейки таблицы
-        combo.setStyleSheet("border: none; background: transparent;") 
-        combo.currentIndexChanged.connect(lambda: self.fast_solve_event() if self.canvas_widget else None)
-        table.setCellWidget(row, table.columnCount() - 2, combo)
+    def set_default_bounds(self, table, col):
+        # По умолчанию 0 <= Xj < +inf
+        for row, text in ((0, "0"), (1, "∞")):
+            it = QTableWidgetItem(text)
+            it.setTextAlignment(Qt.AlignCenter)
+            table.setItem(row, col, it)
+
+    def constraint_data_changed(self, top_left, bottom_right, roles=None):
+        # Правка таблицы или слайдер: правые части передаются в сеанс, при изменении
+        # коэффициентов сеанс создается заново; знак ограничения только перерисовывает график
+        n = self.problem.num_vars
+        if top_left.column() < n:
+            self.reset_session()
+        elif self.session and bottom_right.column() == n + 1:
+            for i in range(top_left.row(), bottom_right.row() + 1):
+                self.session.set_rhs(i, float(self.problem.raw[i + 1, 0]))
+        if self.canvas_widget:
+            self.fast_solve_event()
+
+    def objective_data_changed(self, top_left, bottom_right, roles=None):
+        if self.session:
+            for j in range(top_left.column(), min(bottom_right.column(), self.problem.num_vars - 1) + 1):
+                self.session.set_cost(j, float(self.problem.raw[0, j + 1]))
+        if self.canvas_widget:
+            self.fast_solve_event()
+
+    def bounds_changed(self, item):
+        self.reset_session()
+        if self.canvas_widget:
+            self.fast_solve_event()
+
+    def reset_session(self):
+        self.session = None
 
     def adjust_table_height(self, table):
         # Высота строки + хедер + отступы
         row_h = 36 # Чуть выше стандартного
         table.verticalHeader().setDefaultSectionSize(row_h)
-        h = table.horizontalHeader().height() + (row_h * table.rowCount()) + 4
+        h = table.horizontalHeader().height() + (row_h * table.model().rowCount()) + 4
         table.setMinimumHeight(min(h, 300))
         table.setMaximumHeight(min(h, 300))
         table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -419,57 +487,45 @@ class MainWindow(QMainWindow):
 
     # --- Events ---
     def add_row_event(self):
-        self.constraint_table.insertRow(self.constraint_table.rowCount())
-        self.set_combo_box(self.constraint_table, self.constraint_table.rowCount()-1, self.CONSTRAINT_EQUALITY_SIGNS)
+        self.problem.add_constraint()
         self.adjust_table_height(self.constraint_table)
 
     def del_row_event(self):
-        if self.constraint_table.rowCount() > 1:
-            self.constraint_table.removeRow(self.constraint_table.rowCount()-1)
-            self.adjust_table_height(self.constraint_table)
+        self.problem.remove_constraint()
+        self.adjust_table_height(self.constraint_table)
 
     def add_column_event(self):
-        # Вставляем перед "Знаком" и "Значением"
-        idx = self.constraint_table.columnCount()-2
-        self.constraint_table.insertColumn(idx)
-        self.objective_fxn_table.insertColumn(idx)
-        
-        h = self.create_header_labels(self.constraint_table.columnCount()-2)
-        self.constraint_table.setHorizontalHeaderLabels(h)
-        self.objective_fxn_table.setHorizontalHeaderLabels(h)
-        
+        # Новая переменная встает перед "Знаком" и "Значением"
+        idx = self.problem.num_vars
+        self.problem.add_variable()
         # Сброс растяжения
-        self.constraint_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.constraint_table.horizontalHeader().setSectionResizeMode(self.constraint_table.columnCount()-1, QHeaderView.Fixed)
-        self.constraint_table.horizontalHeader().setSectionResizeMode(self.constraint_table.columnCount()-2, QHeaderView.Fixed)
-        self.constraint_table.setColumnWidth(self.constraint_table.columnCount()-1, 80)
-        self.constraint_table.setColumnWidth(self.constraint_table.columnCount()-2, 60)
-
-        self.objective_fxn_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.objective_fxn_table.horizontalHeader().setSectionResizeMode(self.objective_fxn_table.columnCount()-1, QHeaderView.Fixed)
-        self.objective_fxn_table.horizontalHeader().setSectionResizeMode(self.objective_fxn_table.columnCount()-2, QHeaderView.Fixed)
-        self.objective_fxn_table.setColumnWidth(self.objective_fxn_table.columnCount()-1, 80)
-        self.objective_fxn_table.setColumnWidth(self.objective_fxn_table.columnCount()-2, 60)
+        self.setup_table_header(self.constraint_table)
+        self.setup_table_header(self.objective_fxn_table)
+
+        h = self.create_header_labels(self.problem.num_vars)
+        self.bounds_table.insertColumn(idx)
+        self.bounds_table.setHorizontalHeaderLabels(h[:-2])
+        self.set_default_bounds(self.bounds_table, idx)
 
         # Обновляем слайдеры ЦФ при изменении числа переменных
-        if self.objective_fxn_table.columnCount() - 2 == 2:
+        if self.problem.num_vars == 2:
             self.create_objective_sliders()
         else:
             self.clear_objective_sliders()
     
     def del_col_event(self):
-        if self.constraint_table.columnCount() > 4: # Min 2 vars + sign + val
-            idx = self.constraint_table.columnCount() - 3
-            self.constraint_table.removeColumn(idx)
-            self.objective_fxn_table.removeColumn(idx)
-            
-            # Повторно создаем и устанавливаем заголовки
-            h = self.create_header_labels(self.constraint_table.columnCount() - 2)
-            self.constraint_table.setHorizontalHeaderLabels(h)
-            self.objective_fxn_table.setHorizontalHeaderLabels(h)
+        if self.problem.num_vars > 2: # Минимум 2 переменные
+            self.problem.remove_variable()
+            self.bounds_table.removeColumn(self.problem.num_vars)
+            self.setup_table_header(self.constraint_table)
+            self.setup_table_header(self.objective_fxn_table)
+
+            # Повторно создаем и устанавливаем заголовки границ
+            h = self.create_header_labels(self.problem.num_vars)
+            self.bounds_table.setHorizontalHeaderLabels(h[:-2])
 
         # Обновляем слайдеры ЦФ при изменении числа переменных
-        if self.objective_fxn_table.columnCount() - 2 == 2:
+        if self.problem.num_vars == 2:
             self.create_objective_sliders()
         else:
             self.clear_objective_sliders()
@@ -496,11 +552,18 @@ class MainWindow(QMainWindow):
 
     def full_solve_event(self):
         try:
-            raw_matrix, rhs, obj_coeffs = simplex_core.get_simplex_data(self.objective_fxn_table, self.constraint_table)
-            num_vars = self.constraint_table.columnCount() - 2
+            raw_matrix, rhs, obj_coeffs = self.problem.simplex_data()
+            lower, upper = gui_models.get_bounds_data(self.bounds_table)
+            num_vars = self.problem.num_vars
             operation = self.operation_combo.currentText()
             
-            final_z, history, opt_vars, err, headers = simplex_core.calculate_simplex(raw_matrix, operation, num_vars)
+            # Решение - через программный интерфейс (simplex_api), окно только показывает результат
+            engine = 'exact' if self.exact_check.isChecked() else 'tableau'
+            problem = simplex_api.Problem.from_raw(raw_matrix, operation, num_vars, lower=lower, upper=upper)
+            result = simplex_api.solve(problem, engine=engine, history='full', cache=self.solve_cache)
+            final_z, history, opt_vars, err, headers = result.objective, result.history, result.values, result.err, result.headers
+            # Сеанс для слайдеров создается при первом пересчете (fast_solve_event)
+            self.reset_session()
             
             if err:
                 # При ошибке просто выходим, не трогая UI, чтобы placeholder остался
@@ -509,6 +572,8 @@ class MainWindow(QMainWindow):
 
             # Только при успешном решении очищаем старые данные
             self.clear_ui_results()
+            # График строится в float (точный метод возвращает дроби)
+            plot_vars = {name: float(v) for name, v in opt_vars.items()}
             
             # --- 1. График (если 2 переменные) ---
             if num_vars == 2:
@@ -543,7 +608,7 @@ class MainWindow(QMainWindow):
                 self.canvas_widget = gui_utils.MplCanvas(self, width=6, height=5)
                 self.graph_layout.addWidget(self.canvas_widget)
                 
-                constrs = gui_utils.plot_constraints(self.canvas_widget, self.constraint_table, opt_vars, obj_coeffs=obj_coeffs)
+                constrs = gui_utils.plot_constraints(self.canvas_widget, self.problem, plot_vars, obj_coeffs=obj_coeffs, bounds=(lower, upper))
                 
                 # --- NEW: Store initial zoom ---
                 self.initial_xlim = self.canvas_widget.axes.get_xlim()
@@ -588,10 +653,7 @@ class MainWindow(QMainWindow):
             tabs.addTab(tab_steps, "Пошаговый расчет")
 
             # --- Вкладка 2: Анализ чувствительности (Красивый) ---
-            is_max = (operation == "Максимизация")
-            var_an, constr_an, detail_report = simplex_core.perform_sensitivity_analysis(
-                history[-1]['table'], rhs, obj_coeffs, num_vars, self.constraint_table.rowCount(), is_max
-            )
+            var_an, constr_an = simplex_api.sensitivity_analysis(problem, result)
             
             tab_sens = QWidget()
             self.setup_sensitivity_tab(tab_sens, var_an, constr_an)
@@ -607,16 +669,19 @@ class MainWindow(QMainWindow):
     def fast_solve_event(self):
         if not self.canvas_widget: return
         try:
-            # Получаем obj_coeffs (третий аргумент)
-            raw_matrix, _, obj_coeffs = simplex_core.get_simplex_data(self.objective_fxn_table, self.constraint_table)
-            
-            num_vars = self.constraint_table.columnCount() - 2
-            op = self.operation_combo.currentText()
-            _, _, opt_vars, err, _ = simplex_core.calculate_simplex(raw_matrix, op, num_vars)
+            if self.session is None:
+                # Первый пересчет после решения или правки коэффициентов и границ: сеанс по текущим данным
+                raw_matrix, _, _ = self.problem.simplex_data()
+                lower, upper = gui_models.get_bounds_data(self.bounds_table)
+                self.session = simplex_session.SimplexSession(raw_matrix, self.operation_combo.currentText(), self.problem.num_vars, lower=lower, upper=upper)
+            # Изменения уже переданы в сеанс (constraint_data_changed, objective_data_changed): в пределах
+            # допустимых диапазонов решение пересчитано линейно, иначе дорешиваем от прежнего базиса
+            self.session.set_operation(self.operation_combo.currentText())
+            _, opt_vars, err = self.session.reoptimize()
             
             if not err:
-                # ИЗМЕНЕНИЕ ЗДЕСЬ: добавляем obj_coeffs=obj_coeffs
-                gui_utils.plot_constraints(self.canvas_widget, self.constraint_table, opt_vars, obj_coeffs=obj_coeffs)
+                bounds = (self.session.lower.tolist(), self.session.upper.tolist())
+                gui_utils.plot_constraints(self.canvas_widget, self.problem, opt_vars, obj_coeffs=self.session.c.tolist(), bounds=bounds)
         except:
             pass
 
@@ -655,7 +720,7 @@ class MainWindow(QMainWindow):
             
             vals = tbl_dict[key]
             for c_idx, val in enumerate(vals):
-                it = QTableWidgetItem(f"{val:.3f}")
+                it = QTableWidgetItem(gui_utils.format_number(val, 3))
                 it.setTextAlignment(Qt.AlignCenter)
                 is_r = (r_idx == pivot_r)
                 is_c = (c_idx == pivot_c)
@@ -669,7 +734,7 @@ class MainWindow(QMainWindow):
                 ratios = data['ratios']
                 if r_idx > 0 and (r_idx-1) < len(ratios):
                     v = ratios[r_idx-1]
-                    th_val = f"{v:.3f}" if v != float('inf') else "-"
+                    th_val = gui_utils.format_number(v, 3) if v != float('inf') else "-"
                 it_th = QTableWidgetItem(th_val)
                 it_th.setTextAlignment(Qt.AlignCenter)
                 if r_idx == pivot_r: it_th.setBackground(hl_row)
@@ -690,7 +755,7 @@ class MainWindow(QMainWindow):
         frame = QFrame()
         frame.setStyleSheet("background-color: #34C759; border-radius: 8px;")
         l = QHBoxLayout(frame)
-        lbl = QLabel(f"Оптимальное решение найдено: E = {z:.4f}")
+        lbl = QLabel(f"Оптимальное решение найдено: E = {gui_utils.format_number(z, 4)}")
         lbl.setStyleSheet("color: white; font-weight: bold; font-size: 15px;")
         l.addWidget(lbl)
         self.results_layout.addWidget(frame)
@@ -712,7 +777,7 @@ class MainWindow(QMainWindow):
             for i, d in enumerate(data_list):
                 for j, key in enumerate(keys):
                     val = d[key]
-                    if isinstance(val, float): val = f"{val:.4f}"
+                    if isinstance(val, (float, Fraction)): val = gui_utils.format_number(val, 4)
                     it = QTableWidgetItem(str(val))
                     it.setTextAlignment(Qt.AlignCenter)
                     t.setItem(i, j, it)
@@ -784,12 +849,15 @@ class MainWindow(QMainWindow):
             def change_handler(v, idx=i, lb=lbl_val):
                 real = v / 10.0
                 lb.setText(f"{real:.1f}")
-                self.constraint_table.item(idx, self.constraint_table.columnCount()-1).setText(str(real))
+                # Сеанс и график обновляет constraint_data_changed
+                self.problem.set_value(idx + 1, 0, real)
                 #self.recalc_timer.start()
-                self.fast_solve_event()
                 
             sl.valueChanged.connect(change_handler)
-            h.addWidget(lbl_name); h.addWidget(sl); h.addWidget(lbl_val)
+            curve_btn = QPushButton("E(b)")
+            curve_btn.setCursor(Qt.PointingHandCursor)
+            curve_btn.clicked.connect(lambda _, idx=i, hi=max_val: self.show_parametric_curve('rhs', idx, 0.0, hi))
+            h.addWidget(lbl_name); h.addWidget(sl); h.addWidget(lbl_val); h.addWidget(curve_btn)
             l.addLayout(h)
             self.slider_widgets.append(sl)
             
@@ -817,8 +885,8 @@ class MainWindow(QMainWindow):
         """Handles value changes from an objective function slider."""
         real_value = value / 10.0
         label_widget.setText(f"{real_value:.1f}")
-        self.objective_fxn_table.setItem(0, index, QTableWidgetItem(str(real_value)))
-        self.fast_solve_event()
+        # Сеанс и график обновляет objective_data_changed
+        self.problem.set_value(0, index + 1, real_value)
 
     def create_objective_sliders(self):
         self.clear_objective_sliders()
@@ -832,11 +900,10 @@ class MainWindow(QMainWindow):
         head.setStyleSheet("font-weight: bold; color: #555; margin-bottom: 5px;")
         l.addWidget(head)
 
-        num_vars = self.objective_fxn_table.columnCount() - 2
+        num_vars = self.problem.num_vars
         
         for i in range(num_vars):
-            item = self.objective_fxn_table.item(0, i)
-            current_val = float(item.text()) if item and item.text().strip() else 10.0
+            current_val = float(self.problem.raw[0, i + 1])
             
             h_layout = QHBoxLayout()
             slider = QSlider(Qt.Horizontal)
@@ -852,13 +919,61 @@ class MainWindow(QMainWindow):
                 lambda val, idx=i, label=val_label: self.update_obj_from_slider(val, idx, label)
             )
             
+            curve_btn = QPushButton("E(c)")
+            curve_btn.setCursor(Qt.PointingHandCursor)
+            curve_btn.clicked.connect(lambda _, idx=i: self.show_parametric_curve('cost', idx, -20.0, 20.0))
+
             h_layout.addWidget(QLabel(f"Коэф. C{i+1} (X{i+1}):"))
             h_layout.addWidget(slider)
             h_layout.addWidget(val_label)
+            h_layout.addWidget(curve_btn)
             l.addLayout(h_layout)
 
         self.objective_sliders_layout.addWidget(box)
 
+    def show_parametric_curve(self, kind, index, low, high):
+        """
+        Точная кривая E от правой части (kind='rhs') или коэффициента ЦФ
+        (kind='cost') на всем диапазоне слайдера - один параметрический
+        проход (simplex_parametric) вместо решения на каждом шаге слайдера.
+        """
+        try:
+            raw_matrix, rhs, obj_coeffs = self.problem.simplex_data()
+            lower, upper = gui_models.get_bounds_data(self.bounds_table)
+            num_vars = self.problem.num_vars
+            operation = self.operation_combo.currentText()
+
+            values = rhs if kind == 'rhs' else obj_coeffs
+            base = values[index]
+            direction = np.zeros(len(values))
+            direction[index] = 1.0
+            solve = simplex_parametric.parametric_rhs if kind == 'rhs' else simplex_parametric.parametric_cost
+            segments, stop, err = solve(raw_matrix, operation, num_vars, direction, low - base, high - base, lower=lower, upper=upper)
+            if err:
+                QMessageBox.warning(self, "Параметрический анализ", err)
+                return
+
+            label = f"b{index+1}" if kind == 'rhs' else f"C{index+1}"
+            dialog = QDialog(self)
+            dialog.setWindowTitle(f"Параметрический анализ: E({label})")
+            layout = QVBoxLayout(dialog)
+            canvas = gui_utils.MplCanvas(dialog, width=6, height=4)
+            gui_utils.plot_parametric(canvas, segments, base, label)
+            layout.addWidget(canvas)
+
+            info = f"Участков: {len(segments)}, изломов: {max(len(segments) - 1, 0)}"
+            if stop:
+                end = base + (segments[-1]['t_to'] if segments else low - base)
+                info += f". При {label} > {gui_utils.format_number(end, 3)}: {stop}"
+            info_lbl = QLabel(info)
+            info_lbl.setWordWrap(True)
+            info_lbl.setStyleSheet("color: #86868B; font-size: 13px;")
+            layout.addWidget(info_lbl)
+            dialog.resize(700, 500)
+            dialog.exec_()
+        except Exception as e:
+            QMessageBox.critical(self, "Критическая ошибка", f"Произошел сбой: {str(e)}")
+
     def add_iteration_table_to_layout(self, layout, i, data, headers):
         tbl_dict = data['table']
         pivot_r = data['pivot_row']
@@ -914,7 +1029,7 @@ class MainWindow(QMainWindow):
             
             vals = tbl_dict[key]
             for c_idx, val in enumerate(vals):
-                it = QTableWidgetItem(f"{val:.3f}")
+                it = QTableWidgetItem(gui_utils.format_number(val, 3))
                 it.setTextAlignment(Qt.AlignCenter)
                 is_r = (r_idx == pivot_r)
                 is_c = (c_idx == pivot_c)
@@ -928,7 +1043,7 @@ class MainWindow(QMainWindow):
                 ratios = data['ratios']
                 if r_idx > 0 and (r_idx-1) < len(ratios):
                     v = ratios[r_idx-1]
-                    th_val = f"{v:.3f}" if v != float('inf') else "-"
+                    th_val = gui_utils.format_number(v, 3) if v != float('inf') else "-"
                 it_th = QTableWidgetItem(th_val)
                 it_th.setTextAlignment(Qt.AlignCenter)
                 if r_idx == pivot_r: it_th.setBackground(hl_row)
@@ -943,10 +1058,19 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(table)
         
+        if data.get('flipped'):
+            names = ", ".join(data['flipped'])
+            bounds_lbl = QLabel(f"На верхней границе (в таблице x' = u - x): <b>{names}</b>")
+            bounds_lbl.setStyleSheet("color: #86868B; font-size: 13px;")
+            layout.addWidget(bounds_lbl)
+
         if pivot_c is not None:
             entering = data.get('entering', '')
             leaving = data.get('leaving', '')
-            info_lbl = QLabel(f"➡ Входит в базис: <b>{entering}</b>, Выходит из базиса: <b>{leaving}</b>")
+            if data.get('bound_flip'):
+                info_lbl = QLabel(f"➡ <b>{entering}</b> переходит на другую границу, базис не меняется")
+            else:
+                info_lbl = QLabel(f"➡ Входит в базис: <b>{entering}</b>, Выходит из базиса: <b>{leaving}</b>")
             info_lbl.setStyleSheet("color: #555; margin-bottom: 20px; font-size: 14px; background: #F9F9F9; padding: 8px; border-radius: 6px;")
             layout.addWidget(info_lbl)
             
@@ -974,7 +1098,7 @@ class MainWindow(QMainWindow):
                 low_str = "-∞"
             else:
                 # Иначе отнимаем от базы
-                low_str = f"{(base_val - dec):.2f}"
+                low_str = gui_utils.format_number(base_val - dec, 2)
             
             # Обработка верхней границы
             # Если allow_increase == inf, значит можно увеличивать до +бесконечности
@@ -982,7 +1106,7 @@ class MainWindow(QMainWindow):
                 high_str = "+∞"
             else:
                 # Иначе прибавляем к базе
-                high_str = f"{(base_val + inc):.2f}"
+                high_str = gui_utils.format_number(base_val + inc, 2)
             
             return f"[{low_str} ; {high_str}]"
         # ---------------------------------------
@@ -999,7 +1123,7 @@ class MainWindow(QMainWindow):
             card = self.create_analysis_card(
                 title=f"{item['name']}",
                 main_val=f"Текущий коэф. Cj: <b>{base_c}</b>",
-                sub_val=f"Финальное значение: {item['final_value']:.2f}",
+                sub_val=f"Финальное значение: {gui_utils.format_number(item['final_value'], 2)}",
                 delta_low=item['allow_decrease'],
                 delta_high=item['allow_increase'],
                 abs_range=range_str,
@@ -1019,7 +1143,7 @@ class MainWindow(QMainWindow):
             card = self.create_analysis_card(
                 title=f"{item['name']}",
                 main_val=f"Текущий запас Bi: <b>{base_b}</b>",
-                sub_val=f"Теневая цена: {item['shadow_price']:.2f}",
+                sub_val=f"Теневая цена: {gui_utils.format_number(item['shadow_price'], 2)}",
                 delta_low=item['allow_decrease'],
                 delta_high=item['allow_increase'],
                 abs_range=range_str,
@@ -1082,8 +1206,8 @@ class MainWindow(QMainWindow):
         rl.setSpacing(4)
         
         # Форматирование дельт
-        d_low = delta_low if isinstance(delta_low, str) else f"{delta_low:.2f}"
-        d_high = delta_high if isinstance(delta_high, str) else f"{delta_high:.2f}"
+        d_low = delta_low if isinstance(delta_low, str) else gui_utils.format_number(delta_low, 2)
+        d_high = delta_high if isinstance(delta_high, str) else gui_utils.format_number(delta_high, 2)
         
         # Строка 1: Дельты
         lbl_delta = QLabel(f"Доп. изменение: [-{d_low} ; +{d_high}]")
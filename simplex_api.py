@@ -0,0 +1,147 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import simplex_core
+
+# Программный интерфейс решателя: задача - Problem, ответ - Result. Граф импорта
+# модуля - только numpy и стандартная библиотека (без Qt и matplotlib), поэтому
+# он подходит для рабочих процессов и серверов; main.py - надстройка над ним.
+
+OPERATIONS = {'max': 'Максимизация', 'min': 'Минимизация'}
+_SIGNS = {'<=': u"\u2264", u"\u2264": u"\u2264", '>=': u"\u2265", u"\u2265": u"\u2265"}
+
+
+@dataclass
+class Problem:
+    """
+    Задача max/min c·x при A·x (<= | >=) b, lower <= x <= upper.
+    signs - знаки ограничений ('<=', '>=' или '≤', '≥'; None - все <=),
+    lower/upper - границы X1..Xn (None - 0 и +inf).
+    """
+    c: np.ndarray
+    A: np.ndarray
+    b: np.ndarray
+    sense: str = 'max'
+    signs: list = None
+    lower: list = None
+    upper: list = None
+
+    def __post_init__(self):
+        self.c = np.asarray(self.c, dtype=np.float64)
+        self.A = np.asarray(self.A, dtype=np.float64)
+        self.b = np.asarray(self.b, dtype=np.float64)
+
+    @property
+    def num_vars(self):
+        return len(self.c)
+
+    @property
+    def num_constrs(self):
+        return len(self.b)
+
+    @property
+    def operation(self):
+        return OPERATIONS.get(self.sense)
+
+    @classmethod
+    def from_raw(cls, raw_matrix, operation, num_vars, constr_signs=None, lower=None, upper=None):
+        """Задача из матрицы calculate_simplex ([0, c] и строки [b_i, a_i]) и названия операции."""
+        raw = np.asarray(raw_matrix, dtype=np.float64)
+        sense = 'min' if operation == OPERATIONS['min'] else 'max'
+        return cls(raw[0, 1:num_vars + 1], raw[1:, 1:num_vars + 1], raw[1:, 0], sense, constr_signs, lower, upper)
+
+    def raw_matrix(self):
+        """Матрица в формате calculate_simplex."""
+        raw = np.zeros((self.num_constrs + 1, self.num_vars + 1))
+        raw[0, 1:] = self.c
+        raw[1:, 0] = self.b
+        raw[1:, 1:] = self.A
+        return raw
+
+    def check(self):
+        """Текст ошибки в данных задачи или None."""
+        if self.operation is None:
+            return f"Неизвестное направление оптимизации: {self.sense}"
+        if self.c.ndim != 1 or self.b.ndim != 1 or self.A.shape != (len(self.b), len(self.c)):
+            return "Размеры c, A и b не согласованы"
+        if self.signs is not None:
+            if len(self.signs) != len(self.b):
+                return "Число знаков не совпадает с числом ограничений"
+            unknown = [s for s in self.signs if s not in _SIGNS]
+            if unknown:
+                return f"Неподдерживаемый знак ограничения: {unknown[0]}"
+        return None
+
+    def constr_signs(self):
+        return None if self.signs is None else [_SIGNS[s] for s in self.signs]
+
+
+@dataclass
+class Result:
+    """
+    Ответ решателя. objective - значение ЦФ, values - значения переменных
+    по именам (X1..Xn и балансовые, нулевые небазисные не включаются),
+    err - текст ошибки (None - решение найдено), history и headers - история
+    таблиц и заголовки столбцов (как у calculate_simplex), stats - сведения
+    о решении, sensitivity - {'variables', 'constraints'} или None.
+    """
+    objective: object = None
+    values: dict = field(default_factory=dict)
+    err: str = None
+    history: object = None
+    headers: list = None
+    stats: dict = field(default_factory=dict)
+    sensitivity: dict = None
+
+    @property
+    def ok(self):
+        return self.err is None
+
+
+def solve(problem, engine='tableau', pricing='dantzig', options=None, history='none', presolve=False, scaling=False, sensitivity=False, cache=None):
+    """
+    Решение задачи Problem, параметры - как у calculate_simplex (по умолчанию
+    без истории таблиц: хранится только финальная). sensitivity=True добавляет
+    анализ чувствительности по финальной таблице, cache - необязательный
+    simplex_cache.SolveCache.
+    """
+    err = problem.check()
+    if err:
+        return Result(err=err)
+    stats = {}
+    solver = cache.calculate_simplex if cache is not None else simplex_core.calculate_simplex
+    final_z, steps, final_vars, err, headers = solver(
+        problem.raw_matrix(), problem.operation, problem.num_vars, problem.constr_signs(),
+        engine=engine, lower=problem.lower, upper=problem.upper, pricing=pricing, stats=stats,
+        options=options, history=history, presolve=presolve, scaling=scaling,
+    )
+    if err:
+        return Result(err=err, stats=stats)
+    result = Result(final_z, final_vars, None, steps, headers, stats)
+    if sensitivity:
+        var_an, constr_an = sensitivity_analysis(problem, result, options)
+        result.sensitivity = {'variables': var_an, 'constraints': constr_an}
+    return result
+
+
+def sensitivity_analysis(problem, result, options=None):
+    """
+    Анализ чувствительности (var_analysis, constr_analysis) по финальной
+    таблице result; после предварительного упрощения - по исходной задаче
+    (simplex_presolve.sensitivity).
+    """
+    if result.stats.get('presolve') is not None:
+        import simplex_presolve
+        var_an, constr_an, _ = simplex_presolve.sensitivity(
+            problem.raw_matrix(), problem.operation, problem.num_vars, result.values,
+            problem.constr_signs(), problem.lower, problem.upper, options,
+        )
+        return var_an, constr_an
+    final = result.history[-1]
+    var_an, constr_an, _ = simplex_core.perform_sensitivity_analysis(
+        final['table'], problem.b.tolist(), problem.c.tolist(),
+        problem.num_vars, problem.num_constrs, problem.sense == 'max', options,
+        problem.lower, problem.upper, final.get('flipped'),
+    )
+    return var_an, constr_an
@@ -0,0 +1,188 @@
+import numpy as np
+
+import simplex_core
+
+# Состояние задачи пакета после решения
+OPTIMAL = 0
+UNBOUNDED = 1
+ITERATION_LIMIT = 2
+INFEASIBLE = 3
+STATUS_NAMES = {
+    OPTIMAL: "Оптимум найден",
+    UNBOUNDED: "Задача не ограничена (нет конечного решения)",
+    ITERATION_LIMIT: "Превышено число итераций",
+    INFEASIBLE: "Задача не имеет допустимых решений",
+}
+
+
+def _stack(value, tail_ndim, name):
+    """Приводит массив к пакетному виду (B, ...): одиночный массив получает ось пакета длины 1."""
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.ndim == tail_ndim:
+        arr = arr[None]
+    if arr.ndim != tail_ndim + 1:
+        raise ValueError(f"Неверная размерность {name}: {arr.shape}")
+    return arr
+
+
+def _build_tableaux(c, A, b, is_min, constr_signs):
+    """
+    Пакет симплекс-таблиц (B, m+1, n+m+1) той же структуры, что у
+    simplex_core._build_tableau. c - (n,) или (B, n), A - (m, n) или (B, m, n),
+    b - (m,) или (B, m); общие части распространяются на весь пакет.
+    """
+    c, A, b = _stack(c, 1, 'c'), _stack(A, 2, 'A'), _stack(b, 1, 'b')
+    m, n = A.shape[1:]
+    if c.shape[1] != n or b.shape[1] != m:
+        raise ValueError("Размеры c, A и b не согласованы")
+    size = max(len(c), len(A), len(b))
+    for arr, name in ((c, 'c'), (A, 'A'), (b, 'b')):
+        if len(arr) not in (1, size):
+            raise ValueError(f"Длина пакета {name} ({len(arr)}) не совпадает с {size}")
+
+    T = np.zeros((size, m + 1, n + m + 1), dtype=np.float64)
+    T[:, 0, :n] = c if is_min else -c
+    T[:, 1:, :n] = A
+    T[:, np.arange(1, m + 1), np.arange(n, n + m)] = 1.0
+    T[:, 1:, -1] = b
+    if constr_signs:
+        # Ограничения >= превращаем в <= умножением строки на -1 (как _split_raw_matrix)
+        ge = [i + 1 for i, sign in enumerate(constr_signs) if sign == u"\u2265"]
+        T[:, ge, :n] *= -1
+        T[:, ge, -1] *= -1
+    basis = np.tile(np.arange(n, n + m), (size, 1))
+    return T, basis
+
+
+def solve_batch(c, A, b, operation, constr_signs=None, options=None, max_iter=None):
+    """
+    Решение пакета задач одинаковой формы за один векторизованный проход:
+    max/min c_k·x при A_k·x <= b_k, x >= 0 для k = 0..B-1. Обычно A общая,
+    а различаются b или c (сценарии цен, планы по магазинам).
+
+    Повороты выполняются сразу над всеми еще не решенными задачами по оси
+    пакета; у каждой задачи свой базис, решенные задачи исключаются из
+    дальнейших поворотов. Выбор столбца - правило Данцига, тест отношений -
+    первое минимальное отношение (как в calculate_simplex с параметрами по
+    умолчанию), поэтому ответ совпадает с поочередными вызовами
+    calculate_simplex. После options['stall_limit'] вырожденных поворотов
+    подряд задача переходит на правило Бленда до первого невырожденного
+    шага. Как и в табличном методе, исходный базис - балансовые переменные;
+    задачи, где он недопустим (отрицательная правая часть, например у
+    ограничений >=), решаются по одной табличным методом с первой фазой.
+
+    Возвращает (final_z, values, basis, status, iterations, err) - массивы:
+    final_z (B,), values (B, n+m) - значения X1..Xn и балансовых переменных,
+    basis (B, m), status (B,) - OPTIMAL, UNBOUNDED, ITERATION_LIMIT или
+    INFEASIBLE (у нерешенных задач final_z и values - nan), iterations (B,).
+    """
+    is_min = (operation == 'Минимизация')
+    try:
+        opts = simplex_core.solver_options(options)
+        T, basis = _build_tableaux(c, A, b, is_min, constr_signs)
+    except ValueError as e:
+        return None, None, None, None, None, str(e)
+    size, m = basis.shape
+    num_cols = T.shape[2] - 1
+    max_iter = simplex_core.iteration_limit(opts, m, num_cols - m, max_iter)
+    opt_tol, pivot_tol, feas_tol = opts['opt_tol'], opts['pivot_tol'], opts['feas_tol']
+    always_bland = opts['ratio_test'] == 'bland'
+    stall_limit = np.inf if opts['degeneracy'] == 'none' else opts['stall_limit']
+
+    final_T = np.full_like(T, np.nan)
+    final_basis = basis.copy()
+    status = np.full(size, ITERATION_LIMIT)
+    iterations = np.zeros(size, dtype=np.int64)
+
+    # Недопустимый исходный базис: такие задачи решаются отдельно после общего прохода
+    phase_one = np.flatnonzero((T[:, 1:, -1] < -feas_tol).any(axis=1))
+    T0 = T[phase_one]
+
+    # Рабочий набор - только нерешенные задачи; active - их номера в пакете
+    active = np.flatnonzero(~np.isin(np.arange(size), phase_one))
+    T, basis = T[active], basis[active]
+    run = np.zeros(len(active), dtype=np.int64)   # вырожденных поворотов подряд
+    bland = np.zeros(len(active), dtype=bool)
+
+    for counter in range(max_iter + 1):
+        if not len(active):
+            break
+        k = np.arange(len(active))
+        price = T[:, 0, :-1] if is_min else -T[:, 0, :-1]
+        improving = price > opt_tol
+        # По правилу Данцига - первый наибольший столбец, по правилу Бленда - первый улучшающий
+        pivot_col = np.where(bland, np.argmax(improving, axis=1), np.argmax(price, axis=1))
+        done = ~improving.any(axis=1)
+
+        col = T[k, 1:, pivot_col]
+        rhs = T[:, 1:, -1]
+        ratios = np.full(col.shape, np.inf)
+        np.divide(rhs, col, out=ratios, where=col > pivot_tol)
+        best = ratios.min(axis=1)
+        unbounded = ~done & (best == np.inf)
+        tied = ratios <= (best + feas_tol)[:, None]
+        use_bland = bland | always_bland
+        pivot_row = np.where(
+            use_bland,
+            np.argmin(np.where(tied, basis, np.iinfo(basis.dtype).max), axis=1),
+            np.argmin(ratios, axis=1),
+        )
+
+        finished = done | unbounded
+        if counter == max_iter:
+            # Как в calculate_simplex: после max_iter поворотов оптимальность не проверяется
+            finished[:] = False
+        if finished.any():
+            ids = active[finished]
+            status[ids] = np.where(done[finished], OPTIMAL, UNBOUNDED)
+            final_T[ids[done[finished]]] = T[done & finished]
+            final_basis[ids] = basis[finished]
+            keep = ~finished
+            T, basis, active = T[keep], basis[keep], active[keep]
+            pivot_col, pivot_row, best = pivot_col[keep], pivot_row[keep], best[keep]
+            run, bland = run[keep], bland[keep]
+            k = np.arange(len(active))
+        if counter == max_iter or not len(active):
+            break
+
+        # Поворот всех рабочих задач (та же арифметика, что в simplex_core._pivot)
+        r = pivot_row + 1
+        T[k, r] /= T[k, r, pivot_col][:, None]
+        factors = T[k, :, pivot_col]
+        factors[k, r] = 0.0
+        T -= factors[:, :, None] * T[k, r][:, None, :]
+        basis[k, pivot_row] = pivot_col
+        iterations[active] += 1
+
+        # Серия вырожденных поворотов включает правило Бленда до первого невырожденного шага
+        degenerate = best <= feas_tol
+        run = np.where(degenerate, run + 1, 0)
+        bland = degenerate & (bland | (run >= stall_limit))
+        run[bland] = 0
+
+    final_basis[active] = basis
+
+    values = np.full((size, num_cols), np.nan)
+    ok = status == OPTIMAL
+    solved = np.flatnonzero(ok)
+    values[solved] = 0.0
+    values[solved[:, None], final_basis[solved]] = final_T[solved, 1:, -1]
+    final_z = np.full(size, np.nan)
+    # Как в calculate_simplex: z = -E (min) или E (max), final_z = -z при минимизации
+    final_z[ok] = final_T[ok, 0, -1]
+
+    n = num_cols - m
+    var_names = [f"X{j+1}" for j in range(num_cols)]
+    codes = {name: code for code, name in STATUS_NAMES.items()}
+    for k, T_k in zip(phase_one, T0):
+        c_k = T_k[0, :n] if is_min else -T_k[0, :n]
+        _, state, err = simplex_core._tableau_engine(c_k, T_k[1:, :n], T_k[1:, -1], is_min, var_names, max_iter, options=opts, history='none')
+        if err:
+            status[k] = codes.get(err, ITERATION_LIMIT)
+            continue
+        status[k] = OPTIMAL
+        final_basis[k] = state['basis']
+        values[k] = state['values']
+        final_z[k] = -state['z'] if is_min else state['z']
+        iterations[k] = state['iterations']
+    return final_z, values, final_basis, status, iterations, None
@@ -0,0 +1,416 @@
+import copy
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import time
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+import simplex_core
+
+# Параметры решателя, не влияющие на ответ и историю (только на способ вычислений)
+_EXECUTION_OPTIONS = ('threads', 'thread_min_size', 'scratch_dir')
+
+
+def fingerprint(raw_matrix, operation, num_vars, constr_signs=None, engine='tableau', lower=None, upper=None, pricing='dantzig', options=None, history='full', presolve=False, scaling=False):
+    """
+    Канонический отпечаток задачи для calculate_simplex (параметры те же):
+    хэш c, A, b после приведения ограничений >= к <= (как в
+    _split_raw_matrix), направления, границ и параметров решения. Одинаково
+    записанные задачи (например, строка >= и та же строка, умноженная на -1,
+    со знаком <=) получают один отпечаток. None - задачу нельзя кэшировать:
+    правило выбора передано объектом (у него есть состояние) или параметры
+    неверны (ошибку вернет сам calculate_simplex).
+    """
+    if not isinstance(pricing, str):
+        return None
+    try:
+        c, A, b = simplex_core._split_raw_matrix(raw_matrix, constr_signs)
+        opts = simplex_core.solver_options(options)
+    except (ValueError, TypeError):
+        return None
+    l, u, err = simplex_core._prepare_bounds(num_vars, lower, upper)
+    if err:
+        return None
+
+    h = hashlib.sha256()
+    for arr in (c, A, b, l, u):
+        # + 0.0 приводит -0.0 к 0.0
+        arr = np.ascontiguousarray(arr, dtype=np.float64) + 0.0
+        h.update(repr(arr.shape).encode())
+        h.update(arr.tobytes())
+    for key in _EXECUTION_OPTIONS:
+        opts.pop(key)
+    h.update(repr((
+        int(num_vars), operation == 'Минимизация', engine, pricing, history,
+        bool(presolve), bool(scaling), sorted(opts.items()),
+    )).encode())
+    return h.hexdigest()
+
+
+def structure(raw_matrix, num_vars, constr_signs=None, lower=None, upper=None):
+    """
+    Отпечаток структуры задачи: размеры, расположение ненулевых элементов A
+    и то, какие границы заданы. У задач одной структуры с другими числами
+    базис одной годится как стартовый для другой (DiskCache). None - при
+    неверных данных.
+    """
+    try:
+        _, A, _ = simplex_core._split_raw_matrix(raw_matrix, constr_signs)
+    except (ValueError, TypeError):
+        return None
+    l, u, err = simplex_core._prepare_bounds(num_vars, lower, upper)
+    if err:
+        return None
+    h = hashlib.sha256()
+    h.update(repr((A.shape, int(num_vars))).encode())
+    for mask in (A != 0, l != 0, np.isfinite(u)):
+        h.update(np.packbits(mask).tobytes())
+    return h.hexdigest()
+
+
+def _nbytes(obj, seen):
+    """Оценка памяти, удерживаемой объектом (массивы - по nbytes, файлы memmap не учитываются)."""
+    if id(obj) in seen or isinstance(obj, (types.ModuleType, type, types.FunctionType)):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.memmap):
+        return 0
+    if isinstance(obj, np.ndarray):
+        if isinstance(obj.base, np.ndarray):
+            return _nbytes(obj.base, seen)
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(_nbytes(x, seen) for x in obj.flat)
+        return size
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_nbytes(k, seen) + _nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_nbytes(x, seen) for x in obj)
+    elif hasattr(obj, '__dict__'):
+        size += _nbytes(vars(obj), seen)
+    return size
+
+
+def result_nbytes(result):
+    """Оценка памяти результата calculate_simplex вместе с историей."""
+    return _nbytes(result, set())
+
+
+class SolveCache:
+    """
+    Ограниченный по памяти LRU-кэш результатов calculate_simplex.
+
+    Ключ - fingerprint() задачи, значение - кортеж (final_z, history,
+    final_vars, err, headers) и stats решения. При повторе задачи
+    решение не выполняется. get() и calculate_simplex возвращают копии
+    final_vars, headers и stats, поэтому изменения результата вызывающим
+    кодом не портят запись. Объект ленивой истории выдается поверхностной
+    копией: таблицы и операции общие (при просмотре они только читаются),
+    а восстановленные при просмотре таблицы остаются в копии, и размер
+    записи, измеренный в put(), не растет. Когда суммарный объем превышает max_bytes,
+    вытесняются давно не использованные записи; результат больше max_bytes
+    не сохраняется. Счетчики: hits, misses, evictions.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()   # ключ -> (result, stats, nbytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Копии (result, stats) по ключу или None; найденная запись становится самой свежей."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_result(entry[0]), copy.deepcopy(entry[1])
+
+    def put(self, key, result, stats=None):
+        """Сохраняет результат; возвращает False, если он больше всего кэша."""
+        size = result_nbytes(result)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[2]
+        if size > self.max_bytes:
+            return False
+        self._entries[key] = (result, dict(stats or {}), size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, _, old) = self._entries.popitem(last=False)
+            self.nbytes -= old
+            self.evictions += 1
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def info(self):
+        """Счетчики и заполнение кэша."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def calculate_simplex(self, raw_matrix, operation, num_vars, constr_signs=None, engine='tableau', lower=None, upper=None, pricing='dantzig', stats=None, options=None, history='full', presolve=False, scaling=False):
+        """
+        calculate_simplex с кэшем (параметры и результат те же). stats
+        заполняется и при попадании - сохраненными данными решения.
+        """
+        params = dict(constr_signs=constr_signs, engine=engine, lower=lower, upper=upper, pricing=pricing,
+                      options=options, history=history, presolve=presolve, scaling=scaling)
+        key = fingerprint(raw_matrix, operation, num_vars, **params)
+        if key is not None:
+            found = self.get(key)
+            if found is not None:
+                result, saved = found
+                if stats is not None:
+                    stats.update(saved)
+                return result
+
+        solve_stats = {}
+        result = simplex_core.calculate_simplex(raw_matrix, operation, num_vars, stats=solve_stats, **params)
+        if stats is not None:
+            stats.update(solve_stats)
+        if key is not None:
+            self.put(key, result, copy.deepcopy(solve_stats))
+        return _copy_result(result)
+
+
+def _copy_result(result):
+    """Результат calculate_simplex, не разделяющий изменяемые объекты с записью кэша."""
+    final_z, history, final_vars, err, headers = result
+    if isinstance(history, list):
+        history = copy.deepcopy(history)
+    elif history is not None:
+        history = copy.copy(history)
+    return (final_z, history, None if final_vars is None else dict(final_vars), err,
+            None if headers is None else list(headers))
+
+
+def _pack(record):
+    """Запись дискового кэша -> сжатый npz (без pickle)."""
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **record)
+    return buf.getvalue()
+
+
+def _unpack(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+class DiskCache:
+    """
+    Постоянный кэш решений в файле SQLite, общий для запусков и процессов.
+
+    Запись - сжатый npz: final_z, значения переменных, оптимальный базис
+    и переменные на верхней границе, двойственные оценки y и массивы
+    анализа чувствительности (simplex_core.sensitivity_arrays); историй
+    таблиц нет. Ключ - fingerprint() задачи, дополнительно хранится
+    structure(): при промахе базис последней задачи той же структуры
+    служит стартовым (SimplexSession.warm_start).
+
+    Файл в режиме WAL: читатели не блокируют писателя, запись - короткая
+    транзакция BEGIN IMMEDIATE, ожидание блокировки - до timeout секунд.
+    Каждый процесс открывает свое соединение (объект можно передавать
+    в рабочие процессы). Записи старше max_age секунд с последнего
+    обращения и самые старые записи сверх max_bytes удаляются при записи.
+    """
+
+    def __init__(self, path, max_bytes=256 << 20, max_age=30 * 24 * 3600, timeout=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self.hits = 0
+        self.warm = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._connect()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_conn'] = state['_pid'] = None
+        return state
+
+    def _connect(self):
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "key TEXT PRIMARY KEY, structure TEXT, ok INTEGER, "
+                "created REAL, accessed REAL, size INTEGER, data BLOB)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS solutions_structure ON solutions (structure, ok, accessed)")
+            conn.execute("CREATE INDEX IF NOT EXISTS solutions_accessed ON solutions (accessed)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = self._pid = None
+
+    def get(self, key):
+        """Запись по ключу (словарь массивов) или None; отмечает обращение."""
+        conn = self._connect()
+        row = conn.execute("SELECT data FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE solutions SET accessed = ? WHERE key = ?", (time.time(), key))
+        return _unpack(row[0])
+
+    def nearest(self, structure_key):
+        """Последняя решенная без ошибки запись той же структуры или None."""
+        row = self._connect().execute(
+            "SELECT data FROM solutions WHERE structure = ? AND ok = 1 ORDER BY accessed DESC LIMIT 1",
+            (structure_key,),
+        ).fetchone()
+        return None if row is None else _unpack(row[0])
+
+    def put(self, key, structure_key, record):
+        """Сохраняет запись и сразу вытесняет устаревшие и лишние."""
+        blob = _pack(record)
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, structure_key, int(not str(record['err'])), now, now, len(blob), blob),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, now):
+        if self.max_age is not None:
+            conn.execute("DELETE FROM solutions WHERE accessed < ?", (now - self.max_age,))
+        if self.max_bytes is not None:
+            # Оставляем самые свежие записи, пока их суммарный размер не больше max_bytes
+            conn.execute(
+                "DELETE FROM solutions WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS total FROM solutions) "
+                "WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def evict(self):
+        """Удаляет устаревшие записи и записи сверх max_bytes."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._evict(conn, time.time())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        self._connect().execute("DELETE FROM solutions")
+
+    def info(self):
+        """Счетчики этого процесса и заполнение файла."""
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM solutions").fetchone()
+        return {
+            'hits': self.hits,
+            'warm': self.warm,
+            'misses': self.misses,
+            'entries': entries,
+            'nbytes': size,
+            'max_bytes': self.max_bytes,
+        }
+
+    def solve(self, raw_matrix, operation, num_vars, constr_signs=None, lower=None, upper=None, options=None, stats=None):
+        """
+        Решение с дисковым кэшем (модифицированный метод, SimplexSession).
+        Возвращает (final_z, final_vars, solution, err); solution - словарь
+        'basis', 'at_upper', 'duals', 'sensitivity' (массивы по оптимальному
+        базису) или None при ошибке. В stats записываются 'cache' ('hit',
+        'warm' - решено от базиса похожей задачи, 'miss') и 'iterations'.
+        """
+        import simplex_revised
+        import simplex_session
+
+        key = fingerprint(raw_matrix, operation, num_vars, constr_signs, engine='revised', lower=lower,
+                          upper=upper, options=options, history='none')
+        record = self.get(key) if key is not None else None
+        if record is not None:
+            self.hits += 1
+            if stats is not None:
+                stats.update(cache='hit', iterations=0)
+            return _record_result(record)
+
+        session = simplex_session.SimplexSession(raw_matrix, operation, num_vars, constr_signs, lower, upper, options=options)
+        if session.error:
+            return None, None, None, session.error
+        structure_key = structure(raw_matrix, num_vars, constr_signs, lower, upper)
+        near = self.nearest(structure_key)
+        warm = near is not None and session.warm_start(near['basis'], near['at_upper'])
+        if warm:
+            self.warm += 1
+        else:
+            self.misses += 1
+
+        final_z, final_vars, err = session.reoptimize()
+        if stats is not None:
+            stats.update(cache='warm' if warm else 'miss', iterations=session.last_iterations)
+        if err:
+            record = {'err': np.array(err)}
+        else:
+            st = session.state
+            ranges = simplex_revised.sensitivity_from_basis(st, num_vars, not session.is_min, session.options, session.lower)
+            record = {
+                'err': np.array(''),
+                'final_z': np.array(final_z),
+                'names': np.array(list(final_vars)),
+                'values': np.array(list(final_vars.values()), dtype=np.float64),
+                'basis': st['basis'],
+                'at_upper': st['at_upper'],
+                'duals': st['y'],
+            }
+            record.update({'sens_' + name: arr for name, arr in ranges.items()})
+        if key is not None:
+            self.put(key, structure_key, record)
+        return _record_result(record)
+
+
+def _record_result(record):
+    """(final_z, final_vars, solution, err) по записи DiskCache."""
+    err = str(record['err'])
+    if err:
+        return None, None, None, err
+    final_vars = dict(zip(record['names'].tolist(), record['values'].tolist()))
+    solution = {
+        'basis': record['basis'],
+        'at_upper': record['at_upper'],
+        'duals': record['duals'],
+        'sensitivity': {key[5:]: arr for key, arr in record.items() if key.startswith('sens_')},
+    }
+    return float(record['final_z']), final_vars, solution, None
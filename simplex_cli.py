@@ -0,0 +1,205 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+import simplex_api
+
+# Пакетное решение из командной строки без интерфейса (для cron и конвейеров):
+#   python -m simplex_cli solve model.json models/ --jobs 4 --sensitivity
+# На каждую задачу в stdout выводится одна строка JSON по мере готовности.
+
+ENGINES = ('tableau', 'revised', 'exact')
+PRICING = ('dantzig', 'partial', 'multiple', 'devex', 'steepest')
+HISTORY = ('none', 'pivots', 'full')
+
+
+def model_files(paths):
+    """Файлы задач: файлы - как указаны, из каталогов - *.json в порядке имен."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith('.json') and os.path.isfile(os.path.join(path, name))
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def load_model(path):
+    """
+    Задача из JSON-файла: {"sense": "max" | "min", "c": [...], "A": [[...]],
+    "b": [...], "signs": ["<=", ">=", ...], "lower": [...], "upper": [...]}
+    (sense, signs и границы необязательны; null в upper - без ограничения).
+    Возвращает (Problem, err).
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return None, f"Не удалось прочитать задачу: {e}"
+    if not isinstance(data, dict):
+        return None, "Задача должна быть объектом JSON"
+    missing = [key for key in ('c', 'A', 'b') if key not in data]
+    if missing:
+        return None, f"В задаче нет поля {missing[0]}"
+    upper = data.get('upper')
+    if upper is not None:
+        upper = [math.inf if u is None else u for u in upper]
+    try:
+        problem = simplex_api.Problem(
+            data['c'], data['A'], data['b'], data.get('sense', 'max'),
+            data.get('signs'), data.get('lower'), upper,
+        )
+    except (TypeError, ValueError) as e:
+        return None, f"Неверные данные задачи: {e}"
+    return problem, problem.check()
+
+
+def plain(value):
+    """Значение для JSON: дроби и числа numpy - float, бесконечность и nan - null."""
+    if isinstance(value, dict):
+        return {str(k): plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [plain(v) for v in value]
+    if isinstance(value, (Fraction, np.floating, np.integer, float)):
+        value = float(value)
+        return value if math.isfinite(value) else None
+    return value
+
+
+def _history_report(history, level):
+    """Записи истории для вывода: 'pivots' - только повороты, 'full' - с таблицами."""
+    if level == 'none' or history is None:
+        return None
+    keys = ('pivot_col', 'pivot_row', 'entering', 'leaving') + (('table', 'ratios') if level == 'full' else ())
+    return [{key: step[key] for key in keys if key in step} for step in history]
+
+
+def _record(path, problem, final_z, final_vars, err, stats, times, args):
+    record = {
+        'model': path,
+        'status': 'error' if err else 'optimal',
+        'objective': None,
+        'solution': None,
+        'error': err,
+        'iterations': stats.get('iterations'),
+        'engine': args.engine,
+        'time': {key: round(value, 6) for key, value in times.items()},
+    }
+    if not err:
+        num_vars = problem.num_vars + problem.num_constrs
+        record['objective'] = final_z
+        record['solution'] = {f'X{j+1}': final_vars.get(f'X{j+1}', 0.0) for j in range(num_vars)}
+        if args.sensitivity:
+            record['sensitivity'] = stats.get('sensitivity')
+        if args.history != 'none':
+            record['history'] = _history_report(stats.get('history'), args.history)
+    return plain(record)
+
+
+def _solve_kwargs(args):
+    return {
+        'engine': args.engine, 'pricing': args.pricing,
+        'history': args.history, 'presolve': args.presolve, 'scaling': args.scaling,
+    }
+
+
+def _solve_serial(models, args):
+    """Решение в текущем процессе: (path, problem, final_z, final_vars, err, stats, times) по порядку."""
+    for path, problem, load_time in models:
+        started = time.perf_counter()
+        result = simplex_api.solve(problem, sensitivity=args.sensitivity, **_solve_kwargs(args))
+        stats = dict(result.stats)
+        if result.ok:
+            stats['sensitivity'] = result.sensitivity
+            stats['history'] = list(result.history) if args.history != 'none' else None
+        times = {'load': load_time, 'solve': time.perf_counter() - started}
+        yield path, problem, result.objective, result.values, result.err, stats, times
+
+
+def _solve_parallel(models, args):
+    """Решение в пуле процессов simplex_parallel.solve_many: результаты - по мере готовности."""
+    import simplex_parallel
+    tasks = []
+    for _, problem, _ in models:
+        task = {
+            'raw_matrix': problem.raw_matrix(), 'operation': problem.operation,
+            'num_vars': problem.num_vars, 'constr_signs': problem.constr_signs(),
+            'lower': problem.lower, 'upper': problem.upper,
+            'sensitivity': args.sensitivity,
+        }
+        task.update(_solve_kwargs(args))
+        tasks.append(task)
+    for index, final_z, final_vars, err, stats in simplex_parallel.solve_many(tasks, args.jobs or None, args.timeout):
+        path, problem, load_time = models[index]
+        times = {'load': load_time, 'solve': stats.pop('time', 0.0)}
+        yield path, problem, final_z, final_vars, err, stats, times
+
+
+def solve_command(args, out=sys.stdout):
+    """Команда solve: решает все задачи и пишет по строке JSON на каждую. Код выхода - 0, если решены все."""
+    models, failed = [], 0
+    for path in model_files(args.paths):
+        started = time.perf_counter()
+        problem, err = load_model(path)
+        load_time = time.perf_counter() - started
+        if err:
+            # Ошибки чтения выводятся сразу, задача не решается
+            failed += 1
+            _write(out, _record(path, None, None, None, err, {}, {'load': load_time}, args))
+        else:
+            models.append((path, problem, load_time))
+
+    solver = _solve_parallel if args.jobs != 1 and len(models) > 1 else _solve_serial
+    for path, problem, final_z, final_vars, err, stats, times in solver(models, args):
+        failed += bool(err)
+        _write(out, _record(path, problem, final_z, final_vars, err, stats, times, args))
+    return 1 if failed else 0
+
+
+def _write(out, record):
+    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    out.flush()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='simplex_cli', description="Решение задач ЛП симплекс-методом без интерфейса")
+    commands = parser.add_subparsers(dest='command', required=True)
+    solve = commands.add_parser('solve', help="решить задачи из JSON-файлов (одна строка JSON на задачу)")
+    solve.add_argument('paths', nargs='+', help="файлы задач или каталоги с файлами *.json")
+    solve.add_argument('--engine', choices=ENGINES, default='tableau', help="метод решения (по умолчанию tableau)")
+    solve.add_argument('--pricing', choices=PRICING, default='dantzig', help="правило выбора входящей переменной")
+    solve.add_argument('--history', choices=HISTORY, default='none',
+                       help="история в выводе: none, pivots - повороты, full - с таблицами")
+    solve.add_argument('--sensitivity', action='store_true', help="добавить анализ чувствительности")
+    solve.add_argument('--presolve', action='store_true', help="предварительное упрощение задачи")
+    solve.add_argument('--scaling', action='store_true', help="масштабирование перед решением")
+    solve.add_argument('-j', '--jobs', type=int, default=1,
+                       help="число процессов (0 - по числу ядер, 1 - в текущем процессе)")
+    solve.add_argument('--timeout', type=float, default=None,
+                       help="предельное время решения одной задачи, с (только при --jobs больше 1)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.jobs < 0:
+        build_parser().error("--jobs не может быть отрицательным")
+    try:
+        return solve_command(args)
+    except BrokenPipeError:
+        # Читатель вывода завершился раньше (например, head): остальное не выводим
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,299 +1,1104 @@
+import os
+
 import numpy as np
-import copy
-
-def get_simplex_data(objective_table, constraint_table):
-    """Считывает данные из таблиц PyQt и возвращает numpy матрицу."""
-    # Чтение целевой функции
-    obj_cols = objective_table.columnCount() - 2
-    obj_coeffs = []
-    for i in range(obj_cols):
-        item = objective_table.item(0, i)
-        text = item.text() if item else ""
-        obj_coeffs.append(float(text.replace(',', '.')) if text and text.strip() else 0.0)
-    
-    # Вставка 0 для Z-колонки
-    obj_row = np.insert(np.array(obj_coeffs), 0, 0) # НЕ инвертируем здесь
-    
-    # Чтение ограничений
-    rows = constraint_table.rowCount()
-    cols = constraint_table.columnCount()
-    
-    rhs_list = [] # Правые части (bi)
-    coeff_matrix = []
-    
-    for i in range(rows):
-        # bi - последняя колонка
-        item_bi = constraint_table.item(i, cols - 1)
-        text_bi = item_bi.text() if item_bi else ""
-        rhs_list.append(float(text_bi.replace(',', '.')) if text_bi and text_bi.strip() else 0.0)
-        
-        # Коэффициенты
-        row_coeffs = []
-        for j in range(cols - 2):
-            item_c = constraint_table.item(i, j)
-            text_c = item_c.text() if item_c else ""
-            row_coeffs.append(float(text_c.replace(',', '.')) if text_c and text_c.strip() else 0.0)
-        coeff_matrix.append(row_coeffs)
-        
-    matrix_body = np.concatenate((np.array(rhs_list).reshape(-1, 1), np.array(coeff_matrix)), axis=1)
-    full_matrix = np.vstack((obj_row, matrix_body))
-    
-    return full_matrix, rhs_list, obj_coeffs
-
-def calculate_simplex(raw_matrix, operation, num_vars, constr_signs=None):
-    """Основной алгоритм симплекс-метода."""
+
+# Модуль не зависит от Qt и matplotlib: чтение таблиц интерфейса - в gui_models.
+# Редко нужные модули (потоки, дроби, движки) импортируются при первом обращении.
+
+def _split_raw_matrix(raw_matrix, constr_signs=None):
+    """Разбирает матрицу задачи ([0, c] и строки [b_i, a_i]) на вектор ЦФ c, матрицу A и правые части b."""
+    full = np.array(raw_matrix, dtype=np.float64)
+    # Ограничения >= превращаем в <= умножением строки на -1
+    if constr_signs:
+        for i, sign in enumerate(constr_signs):
+            if sign == u"\u2265":
+                full[i + 1] *= -1
+    c = full[0, 1:].copy()
+    b = full[1:, 0].copy()
+    A = full[1:, 1:].copy()
+    return c, A, b
+
+class PricingRule:
+    """
+    Правило выбора входящей переменной (по умолчанию - правило Данцига).
+
+    Движки передают в select() функцию price(start, stop), которая возвращает
+    «выгодность» d_j столбцов start..stop-1 (d_j > 0 - переменная улучшает ЦФ),
+    и получают номер входящего столбца или None в точке оптимума. Перед каждым
+    поворотом вызывается update() с ленивыми функциями для ведущей строки
+    и произведений столбцов на ведущий столбец - они считаются, только
+    если правилу нужны веса.
+    """
+    name = 'dantzig'
+    uses_norms = False    # нужны ли start() квадраты норм столбцов B^-1·a_j
+    tol = 1e-9            # допуск оптимальности, движок задает его из options['opt_tol']
+
+    def start(self, num_cols, column_norms_sq=None):
+        pass
+
+    def select(self, price, num_cols):
+        d = price(0, num_cols)
+        if d.max() <= self.tol:
+            return None
+        return int(np.argmax(d))
+
+    def update(self, entering, leaving, pivot_value, pivot_row, col_products):
+        pass
+
+class DantzigPricing(PricingRule):
+    """Наибольшая оценка (классическое правило)."""
+
+class PartialPricing(PricingRule):
+    """
+    Частичный выбор: столбцы делятся на сегменты, оцениваются сегменты
+    по кругу до первого, где есть улучшающий столбец. В модифицированном
+    методе оценки вне сегмента не вычисляются вовсе.
+    """
+    name = 'partial'
+
+    def __init__(self, segments=8):
+        self.segments = segments
+
+    def start(self, num_cols, column_norms_sq=None):
+        self.seg_len = max(1, -(-num_cols // self.segments))
+        self.next_seg = 0
+
+    def select(self, price, num_cols):
+        count = -(-num_cols // self.seg_len)
+        for k in range(count):
+            seg = (self.next_seg + k) % count
+            a = seg * self.seg_len
+            b = min(a + self.seg_len, num_cols)
+            d = price(a, b)
+            if d.max() > self.tol:
+                self.next_seg = (seg + 1) % count
+                return a + int(np.argmax(d))
+        return None
+
+class MultiplePricing(PricingRule):
+    """
+    Множественный выбор: при полном просмотре запоминаются несколько лучших
+    столбцов-кандидатов, на следующих итерациях пересчитываются только их
+    оценки. Полный просмотр повторяется, когда кандидаты исчерпаны.
+    """
+    name = 'multiple'
+
+    def __init__(self, candidates=8):
+        self.candidates = candidates
+
+    def start(self, num_cols, column_norms_sq=None):
+        self.pool = []
+
+    def select(self, price, num_cols):
+        best, best_d = None, self.tol
+        alive = []
+        for j in self.pool:
+            dj = price(j, j + 1)[0]
+            if dj > self.tol:
+                alive.append(j)
+                if dj > best_d:
+                    best, best_d = j, dj
+        self.pool = alive
+        if best is not None:
+            return best
+
+        d = price(0, num_cols)
+        if d.max() <= self.tol:
+            return None
+        order = np.argsort(-d, kind='stable')[:self.candidates]
+        self.pool = [int(j) for j in order if d[j] > self.tol]
+        return self.pool[0]
+
+class BlandPricing(PricingRule):
+    """Правило Бленда: первый улучшающий столбец (исключает зацикливание)."""
+    name = 'bland'
+
+    def select(self, price, num_cols):
+        candidates = np.flatnonzero(price(0, num_cols) > self.tol)
+        return int(candidates[0]) if len(candidates) else None
+
+class DevexPricing(PricingRule):
+    """Приближенный наискорейший спуск (Devex) с весами в опорной системе и сбросом при росте весов."""
+    name = 'devex'
+
+    def start(self, num_cols, column_norms_sq=None):
+        self.weights = np.ones(num_cols)
+
+    def select(self, price, num_cols):
+        d = price(0, num_cols)
+        if d.max() <= self.tol:
+            return None
+        score = np.where(d > self.tol, d * d / self.weights, -1.0)
+        return int(np.argmax(score))
+
+    def update(self, entering, leaving, pivot_value, pivot_row, col_products):
+        ratio = pivot_row() / pivot_value
+        w_q = self.weights[entering]
+        np.maximum(self.weights, ratio * ratio * w_q, out=self.weights)
+        self.weights[leaving] = max(w_q / (pivot_value * pivot_value), 1.0)
+        if self.weights.max() > 1e6:
+            self.weights[:] = 1.0
+
+class SteepestEdgePricing(DevexPricing):
+    """
+    Точный наискорейший спуск: вес столбца gamma_j = 1 + ||B^-1·a_j||^2,
+    веса пересчитываются рекуррентно (формулы Гольдфарба - Рида).
+    """
+    name = 'steepest'
+    uses_norms = True
+
+    def start(self, num_cols, column_norms_sq=None):
+        self.weights = 1.0 + column_norms_sq
+
+    def update(self, entering, leaving, pivot_value, pivot_row, col_products):
+        ratio = pivot_row() / pivot_value
+        kappa = col_products()
+        w_q = self.weights[entering]
+        updated = self.weights - 2.0 * ratio * kappa + ratio * ratio * w_q
+        np.maximum(updated, 1.0 + ratio * ratio, out=self.weights)
+        self.weights[leaving] = max(w_q / (pivot_value * pivot_value), 1.0)
+
+PRICING_RULES = {
+    'dantzig': DantzigPricing,
+    'partial': PartialPricing,
+    'multiple': MultiplePricing,
+    'bland': BlandPricing,
+    'devex': DevexPricing,
+    'steepest': SteepestEdgePricing,
+}
+
+def make_pricing(pricing=None):
+    """Правило выбора по имени (ключ PRICING_RULES) или готовый экземпляр PricingRule."""
+    if pricing is None:
+        return DantzigPricing()
+    if isinstance(pricing, PricingRule):
+        return pricing
+    if pricing not in PRICING_RULES:
+        raise ValueError(f"Неизвестное правило выбора: {pricing}")
+    return PRICING_RULES[pricing]()
+
+DEFAULT_OPTIONS = {
+    'pivot_tol': 1e-9,          # минимальный |элемент| ведущего столбца (строки) в тесте отношений
+    'feas_tol': 1e-9,           # допуск допустимости базисных значений
+    'opt_tol': 1e-9,            # допуск оптимальности оценок
+    'ratio_test': 'standard',   # 'standard' - первое минимальное отношение, 'harris' - двухпроходный тест Харриса,
+                                # 'bland' - среди равных отношений переменная с меньшим номером
+    'degeneracy': 'perturb',    # реакция на серию вырожденных поворотов: 'perturb', 'bland' или 'none'
+    'stall_limit': 20,          # сколько вырожденных поворотов подряд считается зацикливанием
+    'perturb_scale': 1e-6,      # относительная величина возмущения правых частей
+    'max_iter': None,           # предел итераций; None - max(100, 10·(m + n))
+    'threads': 1,               # потоков для поворота таблицы; None - по числу ядер
+    'thread_min_size': 1 << 18, # таблицы меньшего числа элементов поворачиваются в одном потоке
+    'storage': 'memory',        # 'disk' - таблица и история таблиц в файлах numpy.memmap (simplex_storage)
+    'scratch_dir': None,        # каталог для файлов при storage='disk'; None - системный временный каталог
+}
+
+def solver_options(options=None):
+    """Параметры решателя: DEFAULT_OPTIONS, дополненные options."""
+    opts = dict(DEFAULT_OPTIONS)
+    if options:
+        unknown = [key for key in options if key not in DEFAULT_OPTIONS]
+        if unknown:
+            raise ValueError(f"Неизвестный параметр решателя: {unknown[0]}")
+        opts.update(options)
+    if opts['ratio_test'] not in ('standard', 'harris', 'bland'):
+        raise ValueError(f"Неизвестный тест отношений: {opts['ratio_test']}")
+    if opts['degeneracy'] not in ('perturb', 'bland', 'none'):
+        raise ValueError(f"Неизвестный способ борьбы с вырожденностью: {opts['degeneracy']}")
+    if opts['storage'] not in ('memory', 'disk'):
+        raise ValueError(f"Неизвестный способ хранения таблицы: {opts['storage']}")
+    if opts['threads'] is None:
+        opts['threads'] = os.cpu_count() or 1
+    if not isinstance(opts['threads'], int) or opts['threads'] < 1:
+        raise ValueError(f"Число потоков должно быть целым и положительным: {opts['threads']}")
+    return opts
+
+def iteration_limit(opts, num_rows, num_cols, max_iter=None):
+    """Предел итераций: явный max_iter, options['max_iter'] или оценка по размеру задачи."""
+    if max_iter is not None:
+        return max_iter
+    if opts['max_iter'] is not None:
+        return opts['max_iter']
+    return max(100, 10 * (num_rows + num_cols))
+
+def _ratio_test(x_B, alpha, ub_B, opts, basis=None):
+    """
+    Тест отношений по ведущему столбцу alpha; ub_B - верхние границы
+    базисных переменных или None. Возвращает (ratios, r, limit):
+    ratios - точные отношения (inf - строка не ограничивает шаг), r - ведущая
+    строка (-1, если ограничивающих строк нет), limit - наибольший допустимый
+    шаг, с которым сравнивается верхняя граница входящей переменной.
+
+    Тест Харриса: в первом проходе границы ослабляются на feas_tol и находится
+    предельный шаг theta_max, во втором из строк с отношением не больше theta_max
+    выбирается строка с наибольшим |alpha_r| - это исключает крошечные ведущие элементы.
+    Тест Бленда: из равных минимальных отношений - строка базисной переменной
+    с наименьшим номером (нужен basis).
+    """
+    tol = opts['pivot_tol']
+    ratios = np.full(len(x_B), np.inf)
+    np.divide(x_B, alpha, out=ratios, where=alpha > tol)
+    if ub_B is not None:
+        # Базисная переменная растет до своей верхней границы
+        to_upper = (alpha < -tol) & np.isfinite(ub_B)
+        np.divide(ub_B - x_B, -alpha, out=ratios, where=to_upper)
+
+    if not (ratios != np.inf).any():
+        return ratios, -1, np.inf
+    if opts['ratio_test'] == 'bland':
+        tied = np.flatnonzero(ratios <= ratios.min() + opts['feas_tol'])
+        r = int(tied[np.argmin(basis[tied])])
+        return ratios, r, ratios[r]
+    if opts['ratio_test'] != 'harris':
+        r = int(np.argmin(ratios))
+        return ratios, r, ratios[r]
+
+    feas = opts['feas_tol']
+    relaxed = np.full(len(x_B), np.inf)
+    np.divide(x_B + feas, alpha, out=relaxed, where=alpha > tol)
+    if ub_B is not None:
+        np.divide(ub_B - x_B + feas, -alpha, out=relaxed, where=to_upper)
+    theta_max = relaxed.min()
+    r = int(np.argmax(np.where(ratios <= theta_max, np.abs(alpha), -1.0)))
+    return ratios, r, theta_max
+
+class StallMonitor:
+    """
+    Учет вырожденных поворотов (шаг theta <= feas_tol). После stall_limit
+    таких поворотов подряд при degeneracy='perturb' движок возмущает правые
+    части (если возмущение уже действует - переходит на правило Бленда),
+    при degeneracy='bland' - сразу переходит на правило Бленда. Правило
+    Бленда действует до первого невырожденного шага.
+    """
+
+    def __init__(self, opts):
+        self.mode = opts['degeneracy']
+        self.limit = opts['stall_limit']
+        self.tol = opts['feas_tol']
+        self.bland_opts = dict(opts, ratio_test='bland')
+        self.run = 0
+        self.degenerate_pivots = 0
+        self.bland_pivots = 0
+        self.perturbations = 0
+        self.perturbed = False
+        self.bland = False
+
+    def step(self, theta):
+        """Учитывает шаг очередного поворота; возвращает True, если пора возмущать правые части."""
+        if self.bland:
+            self.bland_pivots += 1
+        if theta > self.tol:
+            self.run = 0
+            self.bland = False
+            return False
+        self.degenerate_pivots += 1
+        self.run += 1
+        if self.mode == 'none' or self.bland or self.run < self.limit:
+            return False
+        self.run = 0
+        if self.mode == 'perturb' and not self.perturbed:
+            self.perturbed = True
+            self.perturbations += 1
+            return True
+        self.bland = True
+        return False
+
+    def report(self):
+        return {
+            'degenerate_pivots': self.degenerate_pivots,
+            'bland_pivots': self.bland_pivots,
+            'perturbations': self.perturbations,
+        }
+
+def _perturbation(x_B, ub_B, opts, rng):
+    """Случайные положительные сдвиги базисных значений; не выводят переменные за верхние границы."""
+    delta = opts['perturb_scale'] * (1.0 + np.abs(x_B)) * rng.uniform(0.5, 1.0, len(x_B))
+    if ub_B is not None:
+        room = np.where(np.isfinite(ub_B), np.maximum(ub_B - x_B, 0.0) / 2, np.inf)
+        np.minimum(delta, room, out=delta)
+    return delta
+
+def _basis_product(A, basis, flipped, delta):
+    """
+    B·delta по исходным столбцам: базисный столбец - a_j (-a_j для замененной
+    x' = u - x) или единичный балансовый. Блок балансовых столбцов таблицы
+    равен B^-1, поэтому обращать его не нужно.
+    """
+    num_vars = A.shape[1]
+    struct = basis < num_vars
+    weights = np.where(flipped[basis], -delta, delta)
+    shift_b = A[:, basis[struct]] @ weights[struct]
+    shift_b[basis[~struct] - num_vars] += weights[~struct]
+    return shift_b
+
+def _build_tableau(c, A, b, is_min, storage=None):
+    """
+    Строит симплекс-таблицу как один непрерывный массив float64.
+    Строка 0 - Z-строка, строки 1..m - ограничения, последняя колонка - решение.
+    Колонки: X1..Xn, затем балансовые переменные, затем 'Решение'.
+    storage - хранилище из simplex_storage (по умолчанию - оперативная память).
+    """
+    m, n = A.shape
+    T = storage.zeros((m + 1, n + m + 1)) if storage else np.zeros((m + 1, n + m + 1), dtype=np.float64)
+    # Инверсия Z-строки ТОЛЬКО для максимизации
+    T[0, :n] = c if is_min else -c
+    T[1:, :n] = A
+    T[np.arange(1, m + 1), np.arange(n, n + m)] = 1.0
+    T[1:, -1] = b
+    basis = np.arange(n, n + m)
+    return T, basis
+
+_thread_pools = {}
+
+def _pivot_threads(opts, T):
+    """Число потоков для поворотов таблицы T: options['threads'], если таблица не меньше thread_min_size."""
+    return opts['threads'] if T.size >= opts['thread_min_size'] else 1
+
+def _pivot(T, pivot_row, pivot_col, work, threads=1):
+    """
+    Поворот таблицы на месте: строка-лидер делится на ведущий элемент, остальные строки обнуляются по ведущему столбцу.
+    При threads > 1 исключение выполняется блоками строк в пуле потоков (NumPy отпускает GIL).
+    Если work короче таблицы (таблица на диске), строки проходятся по порядку блоками длины work.
+    Каждый элемент считается той же операцией, поэтому результат побитово не зависит от разбиения.
+    """
+    T[pivot_row] /= T[pivot_row, pivot_col]
+    factors = T[:, pivot_col].copy()
+    factors[pivot_row] = 0.0
+    if threads <= 1 and len(work) == len(T):
+        np.multiply(factors[:, None], T[pivot_row], out=work)
+        T -= work
+        return
+    lead = T[pivot_row].copy()
+    step = len(work)
+    for start in range(0, len(T), step):
+        stop = min(start + step, len(T))
+        _eliminate(T[start:stop], factors[start:stop], lead, work[:stop - start], threads)
+
+def _eliminate(T, factors, lead, work, threads):
+    """T -= factors·lead по блокам строк в threads потоках."""
+    def eliminate(a, b):
+        np.multiply(factors[a:b, None], lead, out=work[a:b])
+        T[a:b] -= work[a:b]
+
+    if threads <= 1:
+        eliminate(0, len(T))
+        return
+    if threads not in _thread_pools:
+        from concurrent.futures import ThreadPoolExecutor
+        _thread_pools[threads] = ThreadPoolExecutor(threads, thread_name_prefix='simplex-pivot')
+    bounds = np.linspace(0, len(T), threads + 1).astype(int)
+    for future in [_thread_pools[threads].submit(eliminate, a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]:
+        future.result()
+
+def _column_norms_sq(T, block_rows):
+    """Квадраты норм столбцов T[1:, :-1] (для devex и steepest), по блокам строк."""
+    norms = np.zeros(T.shape[1] - 1)
+    for a in range(1, T.shape[0], block_rows):
+        norms += (T[a:a + block_rows, :-1] ** 2).sum(axis=0)
+    return norms
+
+def _tableau_dict(T, basis, var_names):
+    """Снимок таблицы в формате истории: {'E': [...], 'X3': [...], ...}."""
+    rows = T.tolist()
+    table = {'E': rows[0]}
+    for name_idx, row in zip(basis, rows[1:]):
+        table[var_names[name_idx]] = row
+    return table
+
+def _complement_row(T, row, var_idx, ub_val):
+    """Замена базисной переменной строки row на u - x (она выходит из базиса на верхней границе)."""
+    T[row, -1] = ub_val - T[row, -1]
+    T[row, :-1] *= -1
+    T[row, var_idx] = 1.0
+
+def _tableau_dual_cleanup(T, basis, ub, flipped, price, opts, work, max_iter, history):
+    """
+    Двойственный симплекс по таблице: восстанавливает допустимость решения
+    после снятия возмущения (оценки при этом остаются оптимальными), а с
+    нулевыми оценками price - ищет допустимый базис в первой фазе.
+    При равных отношениях входит столбец с наибольшим по модулю элементом.
+    Возвращает (iterations, err).
+    """
+    num_cols = T.shape[1] - 1
+    tol = opts['pivot_tol']
+    counter = 0
+    while counter < max_iter:
+        rhs, ub_B = T[1:, -1], ub[basis]
+        below = -rhs
+        above = np.where(np.isfinite(ub_B), rhs - ub_B, -np.inf)
+        violation = np.maximum(below, above)
+        r = int(np.argmax(violation))
+        if violation[r] <= opts['feas_tol']:
+            return counter, None
+        if above[r] > below[r]:
+            # Переменная выше верхней границы: в строке u - x она отрицательна
+            _complement_row(T, r + 1, basis[r], ub_B[r])
+            flipped[basis[r]] = not flipped[basis[r]]
+            history.op('complement', r + 1, basis[r])
+
+        row = T[r + 1, :-1].copy()
+        row[basis] = 0.0
+        eligible = row < -tol
+        if not eligible.any():
+            return counter, "Задача не имеет допустимых решений"
+        ratios = np.full(num_cols, np.inf)
+        np.divide(price(0, num_cols), row, out=ratios, where=eligible)
+        q = int(np.argmax(np.where(ratios <= ratios.min(), -row, -np.inf)))
+        _pivot(T, r + 1, q, work, _pivot_threads(opts, T))
+        basis[r] = q
+        history.op('pivot', r + 1, q)
+        counter += 1
+    return counter, "Превышено число итераций"
+
+def _tableau_engine(c, A, b, is_min, var_names, max_iter=None, upper=None, pricing=None, options=None, history='full'):
+    """
+    Табличный симплекс-метод. upper - верхние границы переменных X1..Xn
+    (np.inf - без границы); они учитываются неявно: небазисная переменная
+    на верхней границе хранится в таблице как x' = u - x.
+    pricing - правило выбора входящей переменной (см. make_pricing),
+    options - допуски, тест отношений и борьба с вырожденностью (см. DEFAULT_OPTIONS),
+    history - режим истории 'none', 'pivots' или 'full' (см. simplex_history).
+    Возвращает (history_steps, state, err).
+    """
+    return _drain(_tableau_steps(c, A, b, is_min, var_names, max_iter, upper, pricing, options, history))
+
+def _drain(steps):
+    """Прогоняет генератор движка до конца и возвращает его результат."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def _tableau_steps(c, A, b, is_min, var_names, max_iter=None, upper=None, pricing=None, options=None, history='full'):
+    """
+    Генератор табличного метода (см. _tableau_engine): после каждой записи
+    истории выдает history_steps, результат (history_steps, state, err)
+    возвращается через StopIteration.
+    """
+    import simplex_history
+    import simplex_storage
+    opts = solver_options(options)
+    num_constrs, num_vars = A.shape
+    storage = simplex_storage.make_storage(opts)
+    T, basis = _build_tableau(c, A, b, is_min, storage)
+    work = storage.work(T)
+    threads = _pivot_threads(opts, T)
+    num_cols = T.shape[1] - 1
+    max_iter = iteration_limit(opts, num_constrs, num_vars, max_iter)
+
+    rule = make_pricing(pricing)
+    rule.tol = opts['opt_tol']
+    rule.start(num_cols, _column_norms_sq(T, len(work)) if rule.uses_norms else None)
+    bland_rule = BlandPricing()
+    bland_rule.tol = opts['opt_tol']
+    # Выгодность столбцов: в строке E улучшающие столбцы отрицательны (max) или положительны (min)
+    if is_min:
+        price = lambda a, b: T[0, a:b]
+    else:
+        price = lambda a, b: -T[0, a:b]
+
+    # Верхние границы всех переменных таблицы (у балансовых их нет)
+    ub = np.full(T.shape[1] - 1, np.inf)
+    if upper is not None:
+        ub[:num_vars] = upper
+    bounded = bool(np.isfinite(ub).any())
+    flipped = np.zeros(len(ub), dtype=bool)
+
+    monitor = StallMonitor(opts)
+    rng = np.random.default_rng(0)
+    # Столбцы балансовых переменных - производная правых частей таблицы по b
+    slack_cols = slice(num_vars, num_vars + num_constrs)
+    shift_b = None
+
+    history_steps = simplex_history.TableauHistory(history, T, var_names, ub, slack_cols, storage)
+    counter = 0
+    optimal = False
+
+    if (T[1:, -1] < -opts['feas_tol']).any():
+        # Первая фаза (b < 0 из-за ограничений >= или сдвига на нижние границы): двойственный
+        # симплекс с нулевыми оценками ищет допустимый базис, строка E пересчитывается поворотами
+        counter, err = _tableau_dual_cleanup(T, basis, ub, flipped, lambda a, b: np.zeros(b - a), opts, work, max_iter, history_steps)
+        if err:
+            return None, None, err
+        rule.start(num_cols, _column_norms_sq(T, len(work)) if rule.uses_norms else None)
+
+    while counter < max_iter:
+        # По правилу Данцига argmax возвращает первый индекс, как и list.index
+        pivot_col = (bland_rule if monitor.bland else rule).select(price, num_cols) if num_cols else None
+        if pivot_col is None:
+            if shift_b is not None:
+                # Снимаем возмущение и восстанавливаем допустимость двойственным симплексом
+                T[:, -1] -= T[:, slack_cols] @ shift_b
+                history_steps.op('shift', -shift_b)
+                shift_b = None
+                monitor.perturbed = False
+                k, err = _tableau_dual_cleanup(T, basis, ub, flipped, price, opts, work, max_iter - counter, history_steps)
+                counter += k
+                if err:
+                    return None, None, err
+                rule.start(num_cols, _column_norms_sq(T, len(work)) if rule.uses_norms else None)
+                continue
+            history_steps.record({'pivot_col': None, 'pivot_row': None}, T, basis, flipped)
+            yield history_steps
+            optimal = True
+            break
+
+        col = T[1:, pivot_col]
+        ratios, ratio_idx, limit = _ratio_test(
+            T[1:, -1], col, ub[basis] if bounded else None,
+            monitor.bland_opts if monitor.bland else opts, basis
+        )
+
+        if ub[pivot_col] < np.inf and ub[pivot_col] <= limit:
+            # Переменная доходит до своей верхней границы раньше базисных - базис не меняется
+            history_steps.record({
+                'pivot_col': pivot_col,
+                'pivot_row': None,
+                'entering': var_names[pivot_col],
+                'leaving': var_names[pivot_col],
+                'bound_flip': True
+            }, T, basis, flipped, ratios)
+            yield history_steps
+            T[:, -1] -= ub[pivot_col] * T[:, pivot_col]
+            T[:, pivot_col] *= -1
+            flipped[pivot_col] = not flipped[pivot_col]
+            history_steps.op('flip', pivot_col)
+            monitor.step(ub[pivot_col])
+            counter += 1
+            continue
+
+        if ratio_idx < 0:
+            return None, None, "Задача не ограничена (нет конечного решения)"
+
+        pivot_row_idx = ratio_idx + 1
+        leaving = basis[ratio_idx]
+
+        history_steps.record({
+            'pivot_col': pivot_col,
+            'pivot_row': pivot_row_idx,
+            'entering': var_names[pivot_col],
+            'leaving': var_names[leaving]
+        }, T, basis, flipped, ratios)
+        yield history_steps
+
+        if bounded and col[ratio_idx] < 0:
+            _complement_row(T, pivot_row_idx, leaving, ub[leaving])
+            flipped[leaving] = not flipped[leaving]
+            history_steps.op('complement', pivot_row_idx, leaving)
+
+        rule.update(
+            pivot_col, leaving, T[pivot_row_idx, pivot_col],
+            lambda: T[pivot_row_idx, :-1],
+            lambda: T[1:, :-1].T @ T[1:, pivot_col]
+        )
+        _pivot(T, pivot_row_idx, pivot_col, work, threads)
+        basis[ratio_idx] = pivot_col
+        history_steps.op('pivot', pivot_row_idx, pivot_col)
+        counter += 1
+
+        if monitor.step(ratios[ratio_idx]):
+            # Зацикливание: сдвигаем базисные значения на delta > 0, т.е. b на B·delta
+            delta = _perturbation(T[1:, -1], ub[basis] if bounded else None, opts, rng)
+            shift_b = _basis_product(A, basis, flipped, delta)
+            T[:, -1] += T[:, slack_cols] @ shift_b
+            history_steps.op('shift', shift_b)
+
+    if not optimal:
+        return None, None, f"Превышено число итераций ({max_iter})"
+
+    # Значения переменных в исходной ориентации (x = u - x' для замененных)
+    values = np.zeros(len(ub))
+    values[basis] = T[1:, -1]
+    values[flipped] = ub[flipped] - values[flipped]
+    at_upper = flipped.copy()
+    at_upper[basis] = False
+    z = -T[0, -1] if is_min else T[0, -1]
+    state = {'basis': basis, 'values': values, 'z': z, 'at_upper': at_upper, 'iterations': counter}
+    state.update(monitor.report())
+    return history_steps, state, None
+
+def _prepare_bounds(num_vars, lower=None, upper=None):
+    """Проверяет границы переменных; возвращает (l, u, err)."""
+    l = np.zeros(num_vars) if lower is None else np.asarray(lower, dtype=np.float64)
+    u = np.full(num_vars, np.inf) if upper is None else np.asarray(upper, dtype=np.float64)
+    if l.shape != (num_vars,) or u.shape != (num_vars,):
+        return None, None, "Число границ не совпадает с числом переменных"
+    if not np.isfinite(l).all():
+        return None, None, "Переменные без конечной нижней границы не поддерживаются"
+    if (u < l).any():
+        bad = int(np.flatnonzero(u < l)[0])
+        return None, None, f"Нижняя граница X{bad+1} больше верхней"
+    return l, u, None
+
+def _final_result(state, l, c, is_min, var_names):
+    """final_z и final_vars по финальному состоянию движка (с учетом сдвига x = l + x')."""
+    basis, values = state['basis'], state['values']
+    num_vars = len(l)
+    shifted = bool(l.any())
+    z = state['z'] + c @ l if shifted else state['z']
+    final_z = float(-z if is_min else z)
+
+    final_vars = {}
+    for j in basis:
+        v = values[j] + l[j] if j < num_vars else values[j]
+        final_vars[var_names[j]] = float(v)
+    # Небазисные переменные с ненулевым значением (на верхней или ненулевой нижней границе)
+    for j in range(num_vars):
+        v = values[j] + l[j]
+        if var_names[j] not in final_vars and v != 0.0:
+            final_vars[var_names[j]] = float(v)
+    return final_z, final_vars
+
+def calculate_simplex(raw_matrix, operation, num_vars, constr_signs=None, engine='tableau', lower=None, upper=None, pricing='dantzig', stats=None, options=None, history='full', presolve=False, scaling=False):
+    """
+    Основной алгоритм симплекс-метода.
+    engine: 'tableau' - полная симплекс-таблица, 'revised' - модифицированный
+    симплекс-метод с LU-разложением базиса (выгоден, когда столбцов много больше строк),
+    'exact' - точная арифметика без дробей при поворотах (simplex_exact): таблицы,
+    final_z и final_vars - дроби Fraction.
+    lower/upper - границы переменных X1..Xn (по умолчанию 0 и +inf); они
+    не добавляются строками в таблицу, а учитываются в тесте отношений.
+    pricing - правило выбора входящей переменной: 'dantzig', 'partial',
+    'multiple', 'devex', 'steepest' или экземпляр PricingRule.
+    stats - необязательный словарь, в который записываются метод, правило,
+    число итераций и счетчики вырожденных поворотов (для сравнения правил
+    на одной задаче).
+    options - допуски и тест отношений ('standard' или 'harris'), см. DEFAULT_OPTIONS.
+    history - режим истории: 'full' (все таблицы), 'pivots' (только повороты,
+    таблицы восстанавливаются при обращении) или 'none' (только финальная запись).
+    presolve - предварительное упрощение задачи (simplex_presolve): решается
+    упрощенная задача (история - по ней, с исходными именами переменных),
+    ответ переносится на исходную, отчет об удалениях - в stats['presolve'].
+    Двойственные оценки и диапазоны для исходной задачи дает simplex_presolve.sensitivity.
+    scaling - масштабирование строк и столбцов перед решением (simplex_scaling):
+    таблицы истории, ответ и, значит, анализ чувствительности по history[-1]
+    остаются в исходных единицах; разброс коэффициентов до и после - в
+    stats['scaling'].
+    """
+    for kind, payload in _solve_steps(raw_matrix, operation, num_vars, constr_signs, engine, lower, upper, pricing, stats, options, history, presolve, scaling):
+        if kind == 'result':
+            return payload
+
+def iter_simplex(raw_matrix, operation, num_vars, constr_signs=None, engine='tableau', lower=None, upper=None, pricing='dantzig', stats=None, options=None, history='full', presolve=False, scaling=False):
+    """
+    Пошаговый вариант calculate_simplex (параметры те же). Генератор выдает
+    ('step', запись) сразу после каждой записи истории - перед каждым
+    поворотом и в точке оптимума, запись в формате элементов history.
+    Последним выдается ('result', (final_z, history, final_vars, err, headers)) -
+    то, что вернул бы calculate_simplex. Вызывающий может прервать решение,
+    просто перестав перебирать генератор; при history='none' записи не
+    накапливаются и могут сразу уходить, например, в файл.
+    """
+    for kind, payload in _solve_steps(raw_matrix, operation, num_vars, constr_signs, engine, lower, upper, pricing, stats, options, history, presolve, scaling):
+        yield kind, (payload.current() if kind == 'step' else payload)
+
+def _solve_steps(raw_matrix, operation, num_vars, constr_signs, engine, lower, upper, pricing, stats, options, history, presolve, scaling):
+    """
+    Общий генератор для calculate_simplex и iter_simplex: выдает
+    ('step', history_steps) после каждой записи и ('result', кортеж) в конце.
+    """
     try:
-        # --- FIX: Обработка ограничений >= ---
-        # Умножаем строку ограничения на -1, чтобы превратить >= в <=
-        if constr_signs:
-            # raw_matrix[0] это целевая функция, ограничения начинаются с индекса 1
-            for i, sign in enumerate(constr_signs):
-                if sign == u"\u2265":
-                    raw_matrix[i+1] *= -1
-        # --- END FIX ---
-
-        tab = np.flip(raw_matrix).tolist()
-        rows = len(tab)
-        
-        l, soln = [], []
-        for r in tab:
-            soln.append(r[-1])
-            l.append(r[:-1])
-
-        art = np.identity(rows - 1).tolist()[::-1]
-        zeros = np.zeros(rows - 1).tolist()
-        
-        weird = []
-        for i in range(rows):
-            if i == rows - 1:
-                row = l[i][::-1] + zeros + [0]
-            else:
-                row = l[i][::-1] + art[i] + [soln[i]]
-            weird.append(row)
-        
-        weird = weird[::-1]
-        
-        # Инверсия Z-строки ТОЛЬКО для максимизации
-        if operation == 'Максимизация':
-            weird[0] = [-1 * x for x in weird[0]]
-        
-        # Имена переменных
-        x_vars = [f'X{i+1}' for i in range(num_vars)]
-        num_slack = rows - 1
-        s_vars = [f'X{num_vars + i + 1}' for i in range(num_slack)]
+        c, A, b = _split_raw_matrix(raw_matrix, constr_signs)
+        is_min = (operation == 'Минимизация')
+
+        l, u, err = _prepare_bounds(num_vars, lower, upper)
+        if err:
+            yield 'result', (None, None, None, err, None)
+            return
+        if not isinstance(pricing, PricingRule) and pricing not in PRICING_RULES:
+            yield 'result', (None, None, None, f"Неизвестное правило выбора: {pricing}", None)
+            return
+        try:
+            opts = solver_options(options)
+        except ValueError as e:
+            yield 'result', (None, None, None, str(e), None)
+            return
+        if history not in ('none', 'pivots', 'full'):
+            yield 'result', (None, None, None, f"Неизвестный режим истории: {history}", None)
+            return
+
+        rows, cols = range(A.shape[0]), range(num_vars)
+        if presolve:
+            if engine == 'exact':
+                yield 'result', (None, None, None, "Предварительное упрощение несовместимо с точным методом", None)
+                return
+            import simplex_presolve
+            model, err = simplex_presolve.presolve(c, A, b, l, u, opts)
+            if err:
+                yield 'result', (None, None, None, err, None)
+                return
+            if stats is not None:
+                stats['presolve'] = model['report']
+            A_orig, b_orig = A, b
+            c, A, b, l, u = model['c'], model['A'], model['b'], model['lower'], model['upper']
+            rows, cols = model['rows'], model['cols']
+
+        if scaling:
+            if engine == 'exact':
+                yield 'result', (None, None, None, "Масштабирование не используется точным методом", None)
+                return
+            import simplex_scaling
+            scaled = simplex_scaling.scale_problem(c, A, b, l, u)
+            if stats is not None:
+                stats['scaling'] = {'spread': scaled['spread']}
+            c, A, b, l, u = scaled['c'], scaled['A'], scaled['b'], scaled['lower'], scaled['upper']
+            # Оценки масштабированной задачи сравниваются с допуском в единицах пользователя
+            opts = dict(opts, opt_tol=opts['opt_tol'] * scaled['tol'])
+
+        # Сдвиг x = l + x': нижние границы становятся нулевыми (точный метод сдвигает сам)
+        b_raw = b
+        if l.any():
+            b = b - A @ l
+        ub = u - l if np.isfinite(u).any() else None
+
+        # Имена переменных (после упрощения - номера в исходной задаче)
+        x_vars = [f'X{j+1}' for j in cols]
+        s_vars = [f'X{num_vars + i + 1}' for i in rows]
         headers = x_vars + s_vars + ['Решение']
         l4 = x_vars + s_vars
-        
-        current_dic = {}
-        basis = ['E'] + s_vars
-        for i, row in enumerate(weird):
-            current_dic[basis[i]] = row
 
-        history_steps = []
-        is_min = (operation == 'Минимизация')
-        max_iter = 100
-        counter = 0
-        
-        curr_list = weird
-        curr_dic_algo = current_dic
-        
-        curr_list = copy.deepcopy(curr_list)
-
-        while counter < max_iter:
-            z_row = curr_list[0][:-1]
-            
-            is_optimal = False
-            if is_min:
-                if max(z_row) <= 1e-9: is_optimal = True
-            else:
-                if min(z_row) >= -1e-9: is_optimal = True
-            
-            if is_optimal:
-                history_steps.append({
-                    'table': copy.deepcopy(curr_dic_algo),
-                    'pivot_col': None, 'pivot_row': None, 'ratios': []
-                })
+        if engine == 'tableau':
+            steps = _tableau_steps(c, A, b, is_min, l4, upper=ub, pricing=pricing, options=opts, history=history)
+        elif engine == 'revised':
+            import simplex_revised
+            steps = simplex_revised.revised_steps(
+                c, A, b, is_min, l4, upper=ub, pricing=pricing, options=opts, history=history
+            )
+        elif engine == 'exact':
+            import simplex_exact
+            steps = simplex_exact.exact_steps(
+                c, A, b_raw, l, is_min, l4, upper=ub, pricing=pricing, options=opts, history=history
+            )
+        else:
+            yield 'result', (None, None, None, f"Неизвестный метод решения: {engine}", None)
+            return
+
+        view = None
+        while True:
+            try:
+                history_steps = next(steps)
+            except StopIteration as stop:
+                history_steps, state, err = stop.value
                 break
+            if scaling and view is None:
+                # Записи масштабированной задачи выдаются в исходных единицах
+                view = simplex_scaling.ScaledHistory(history_steps, scaled, l4)
+            yield 'step', view or history_steps
 
-            limit = max(z_row) if is_min else min(z_row)
-            pivot_col = z_row.index(limit)
-            
-            ratios = []
-            last_col = len(curr_list[0]) - 1
-            
-            for i in range(1, len(curr_list)):
-                row = curr_list[i]
-                val = row[pivot_col]
-                rhs = row[last_col]
-                if val > 1e-9: 
-                    ratios.append(rhs / val)
-                else: 
-                    ratios.append(float('inf'))
-            
-            valid_ratios = [r for r in ratios if r != float('inf')]
-            if not valid_ratios:
-                return None, None, None, "Задача не ограничена (нет конечного решения)", None
-            
-            min_r = min(valid_ratios)
-            ratio_idx = ratios.index(min_r)
-            pivot_row_idx = ratio_idx + 1
-            
-            entering_var = l4[pivot_col]
-            current_basis_keys = list(curr_dic_algo.keys())
-            leaving_var = current_basis_keys[pivot_row_idx]
-            
-            history_steps.append({
-                'table': copy.deepcopy(curr_dic_algo),
-                'pivot_col': pivot_col,
-                'pivot_row': pivot_row_idx,
-                'ratios': ratios,
-                'entering': entering_var,
-                'leaving': leaving_var
+        if err:
+            yield 'result', (None, None, None, err, None)
+            return
+        if stats is not None:
+            stats.update({
+                'engine': engine,
+                'pricing': getattr(pricing, 'name', pricing),
+                'iterations': state['iterations'],
+                'degenerate_pivots': state['degenerate_pivots'],
+                'bland_pivots': state['bland_pivots'],
+                'perturbations': state['perturbations'],
             })
 
-            pivot_val = curr_list[pivot_row_idx][pivot_col]
-            new_pivot_row = [x / pivot_val for x in curr_list[pivot_row_idx]]
-            
-            new_table = []
-            for i in range(len(curr_list)):
-                if i == pivot_row_idx:
-                    new_table.append(new_pivot_row)
-                else:
-                    factor = curr_list[i][pivot_col]
-                    row = [curr_list[i][k] - factor * new_pivot_row[k] for k in range(len(new_pivot_row))]
-                    new_table.append(row)
-            
-            new_dic = {}
-            old_keys = list(curr_dic_algo.keys())
-            
-            for i in range(len(new_table)):
-                if i == pivot_row_idx: new_dic[entering_var] = new_table[i]
-                else: new_dic[old_keys[i]] = new_table[i]
-            
-            curr_dic_algo = new_dic
-            curr_list = list(curr_dic_algo.values())
-            counter += 1
-            
-        final_z = list(history_steps[-1]['table'].values())[0][-1]
-        final_vars = {}
-        for k, v in history_steps[-1]['table'].items():
-            if k != 'E': final_vars[k] = v[-1]
-            
+        if engine == 'exact':
+            final_z, final_vars = simplex_exact.final_result(state, is_min, l4)
+        else:
+            final_z, final_vars = _final_result(state, l, c, is_min, l4)
+        if scaling:
+            history_steps = simplex_scaling.ScaledHistory(history_steps, scaled, l4)
+            final_z, final_vars = simplex_scaling.unscale_result(scaled, final_z, final_vars, l4)
+        if presolve:
+            final_z, final_vars = simplex_presolve.postsolve(model, final_z, final_vars, is_min, num_vars, A_orig, b_orig)
+        yield 'result', (final_z, history_steps, final_vars, None, headers)
+
+    except Exception as e:
+        yield 'result', (None, None, None, f"Ошибка в вычислениях: {str(e)}", None)
+
+def _sparse_problem(obj_coeffs, constraint_matrix, rhs, constr_signs=None):
+    """Приводит разреженную задачу к виду (c, A, b) с ограничениями <=."""
+    from simplex_sparse import as_constraint_matrix
+    A = as_constraint_matrix(constraint_matrix)
+    c = np.asarray(obj_coeffs, dtype=np.float64)
+    b = np.asarray(rhs, dtype=np.float64)
+    if constr_signs:
+        s = np.array([-1.0 if sign == u"\u2265" else 1.0 for sign in constr_signs])
+        A, b = A.scale_rows(s), b * s
+    return c, A, b
+
+def calculate_simplex_sparse(obj_coeffs, constraint_matrix, rhs, operation, constr_signs=None, lower=None, upper=None, pricing='dantzig', stats=None, options=None, history='full'):
+    """
+    Симплекс-метод для разреженной матрицы ограничений (scipy.sparse,
+    simplex_sparse.CscMatrix или плотный массив). Балансовые столбцы не
+    хранятся, A не преобразуется в плотную матрицу, таблицы итераций не строятся.
+    Возвращает (final_z, history, final_vars, err, headers) как calculate_simplex;
+    в последней записи истории хранится 'basis' для perform_sparse_sensitivity.
+    pricing, stats, options и history - как в calculate_simplex; для широких моделей выгодно 'partial'.
+    """
+    try:
+        import simplex_revised
+        c, A, b = _sparse_problem(obj_coeffs, constraint_matrix, rhs, constr_signs)
+        num_constrs, num_vars = A.shape
+        is_min = (operation == 'Минимизация')
+
+        l, u, err = _prepare_bounds(num_vars, lower, upper)
+        if err:
+            return None, None, None, err, None
+        try:
+            opts = solver_options(options)
+        except ValueError as e:
+            return None, None, None, str(e), None
+        if history not in ('none', 'pivots', 'full'):
+            return None, None, None, f"Неизвестный режим истории: {history}", None
+        if l.any():
+            b = b - A.matvec(l)
+        ub = u - l if np.isfinite(u).any() else None
+
+        l4 = [f'X{i+1}' for i in range(num_vars + num_constrs)]
+        headers = l4 + ['Решение']
+
+        history_steps, state, err = simplex_revised.revised_engine(
+            c, A, b, is_min, l4, record_tables=False, upper=ub, pricing=pricing, options=opts, history=history
+        )
+        if err:
+            return None, None, None, err, None
+        if stats is not None:
+            stats.update({
+                'engine': 'revised',
+                'pricing': getattr(pricing, 'name', pricing),
+                'iterations': state['iterations'],
+                'degenerate_pivots': state['degenerate_pivots'],
+                'bland_pivots': state['bland_pivots'],
+                'perturbations': state['perturbations'],
+            })
+
+        final_z, final_vars = _final_result(state, l, c, is_min, l4)
+        history_steps.steps[-1]['basis'] = state['basis'].tolist()
+
         return final_z, history_steps, final_vars, None, headers
 
     except Exception as e:
         return None, None, None, f"Ошибка в вычислениях: {str(e)}", None
 
-def perform_sensitivity_analysis(final_tableau, original_rhs, original_obj_coeffs, num_dec_vars, num_constrs, is_max):
+def perform_sparse_sensitivity(obj_coeffs, constraint_matrix, rhs, basis, is_max, constr_signs=None, options=None, lower=None, upper=None, flipped=None):
+    """
+    Анализ чувствительности для результата calculate_simplex_sparse по его финальному базису.
+    lower/upper - границы X1..Xn, flipped - имена переменных на верхней границе
+    (ключ 'flipped' последней записи истории).
+    """
+    try:
+        import simplex_revised
+        c, A, b = _sparse_problem(obj_coeffs, constraint_matrix, rhs, constr_signs)
+        num_vars = A.shape[1]
+        l, u, err = _prepare_bounds(num_vars, lower, upper)
+        if err:
+            return [], [], err
+        problem = simplex_revised.RevisedProblem(c, A, b - A.matvec(l) if l.any() else b)
+        basis = np.asarray(basis)
+        ub = np.concatenate((u - l, np.full(problem.m, np.inf)))
+        at_upper = np.zeros(problem.n + problem.m, dtype=bool)
+        at_upper[[int(name[1:]) - 1 for name in flipped or ()]] = True
+        at_upper[basis] = False
+        state = {'problem': problem, 'basis': basis, 'ub': ub, 'at_upper': at_upper,
+                 'factor': simplex_revised.BasisFactor(problem, basis)}
+        simplex_revised.recompute_primal(problem, state)
+        _, state['d'] = simplex_revised.reduced_costs(problem, state)
+        return simplex_revised.perform_sensitivity_from_basis(
+            state, list(rhs), list(obj_coeffs), problem.n, is_max, options, l
+        )
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        return [], [], ""
+
+_SENSITIVITY_BLOCK = 1 << 20   # элементов в одном блоке маскированных минимумов
+
+def _ratio_ranges(num, den, keep, axis):
+    """
+    Маскированные минимумы отношений вдоль оси axis среди элементов den, отобранных keep(den):
+    (min num/den по den > 0, min num/(-den) по den < 0); inf, если таких элементов нет.
+    num согласован с den по broadcasting. Считается блоками по другой оси, чтобы не создавать
+    временных массивов размером с таблицу.
+    """
+    other = 1 - axis
+    size = den.shape[other]
+    dtype = object if den.dtype == object else np.float64
+    pos_min = np.full(size, np.inf, dtype=dtype)
+    neg_min = np.full(size, np.inf, dtype=dtype)
+    if not den.shape[axis]:
+        return pos_min, neg_min
+    step = max(1, _SENSITIVITY_BLOCK // den.shape[axis])
+    for a in range(0, size, step):
+        block = [slice(None), slice(None)]
+        block[other] = slice(a, a + step)
+        block = tuple(block)
+        d = den[block]
+        n = num[block] if num.shape[other] > 1 else num
+        mask = keep(d)
+        ratio = n / np.where(mask, d, 1)
+        pos_min[a:a + step] = np.where(mask & (d > 0), ratio, np.inf).min(axis=axis)
+        neg_min[a:a + step] = np.where(mask & (d < 0), -ratio, np.inf).min(axis=axis)
+    return pos_min, neg_min
+
+def _index_blocks(count, length):
+    """Номера 0..count-1 группами, чтобы блок length x k был не больше _SENSITIVITY_BLOCK элементов."""
+    step = max(1, _SENSITIVITY_BLOCK // max(length, 1))
+    return [np.arange(start, min(start + step, count)) for start in range(0, count, step)]
+
+
+def _concat(parts, dtype):
+    return np.concatenate(parts) if parts else np.empty(0, dtype=object if dtype == object else np.float64)
+
+
+def sensitivity_arrays(z_row, binv_columns, x_B, basis, basic_rows, num_dec_vars, is_max, options=None, lower=None, upper=None, flipped=None):
+    """
+    Анализ чувствительности массивами по оптимальному базису (общая часть
+    perform_sensitivity_analysis и simplex_revised.perform_sensitivity_from_basis).
+    z_row - строка E без 'Решения' (оценки всех столбцов, у базисных - нули),
+    binv_columns(cols) - столбцы B^-1 с номерами cols (столбец i - столбец
+    балансовой переменной ограничения i), x_B - значения базисных переменных,
+    basis - номера базисных столбцов по строкам (-1 - не столбец таблицы),
+    basic_rows(rows) - строки B^-1·[A I] для номеров строк rows. Столбцы B^-1
+    и строки таблицы запрашиваются блоками (_SENSITIVITY_BLOCK элементов),
+    вся B^-1 и таблица целиком не нужны. Диапазоны правых частей - минимумы отношений
+    x_B / B^-1 (и запаса до верхней границы базисной переменной) по
+    столбцам, диапазоны коэффициентов ЦФ базисных X - минимумы отношений
+    оценок к элементам их строк по ненулевым оценкам.
+    Таблица - как у табличного метода с границами: переменные сдвинуты
+    на lower (x = lower + x'), столбцы flipped (маска по столбцам таблицы)
+    хранят u - x', их оценки и диапазоны переводятся обратно (направления
+    увеличения и уменьшения коэффициента меняются местами).
+    lower/upper - границы X1..Xn в единицах пользователя (по умолчанию 0 и +inf).
+    Массивы из дробей (точный метод) обрабатываются точно, без допусков.
+    Возвращает словарь массивов: 'shadow_price', 'rhs_increase', 'rhs_decrease'
+    (по ограничениям), 'value', 'reduced_cost', 'cost_increase', 'cost_decrease' (по X1..Xn).
+    """
+    opts = solver_options(options)
+    exact = z_row.dtype == object
+    if exact:
+        nonzero_elem = lambda a: a != 0
+        nonzero_cost = z_row != 0
+    else:
+        nonzero_elem = lambda a: np.abs(a) >= opts['pivot_tol']
+        nonzero_cost = np.abs(z_row) >= opts['opt_tol']
+    m, n = len(x_B), num_dec_vars
+    l = np.zeros(n) if lower is None else np.asarray(lower, dtype=np.float64)
+    u = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=np.float64)
+    flipped = np.zeros(len(z_row), dtype=bool) if flipped is None else np.asarray(flipped, dtype=bool)
+    basis = np.asarray(basis)
+    rows = np.flatnonzero((basis >= 0) & (basis < n))
+
+    # 1. Правые части: положительные элементы столбца B^-1 ограничивают уменьшение b_i, отрицательные - увеличение;
+    # базисные X с верхней границей - наоборот, по запасу u - l - x_B
+    shadow_price = z_row[n:n + m]
+    if not is_max:
+        shadow_price = np.abs(shadow_price)
+    room = np.full(len(x_B), np.inf)
+    room[rows] = (u - l)[basis[rows]]
+    bounded = np.isfinite(room).any()
+    if bounded:
+        room = np.where(np.isfinite(room), room - x_B, np.inf).astype(x_B.dtype)
+    decrease, increase = [], []
+    for cols in _index_blocks(m, m):
+        binv = binv_columns(cols)
+        dec, inc = _ratio_ranges(x_B[:, None], binv, nonzero_elem, axis=0)
+        if bounded:
+            up_inc, up_dec = _ratio_ranges(room[:, None], binv, nonzero_elem, axis=0)
+            inc, dec = np.minimum(inc, up_inc), np.minimum(dec, up_dec)
+        decrease.append(dec)
+        increase.append(inc)
+    rhs_decrease, rhs_increase = _concat(decrease, z_row.dtype), _concat(increase, z_row.dtype)
+
+    # 2. Значения X: нижняя граница, верхняя для замененных небазисных, u - x' для замененных базисных
+    if exact:
+        from fractions import Fraction
+        value = np.array([Fraction(v) for v in l], dtype=object)
+    else:
+        value = l.copy()
+    flipped_x = flipped[:n]
+    value[flipped_x] = u[flipped_x]
+    basic_x = basis[rows]
+    value[basic_x] = np.where(flipped_x[basic_x], u[basic_x] - x_B[rows], l[basic_x] + x_B[rows])
+
+    # 3. Коэффициенты ЦФ: небазисные X - по своей оценке, базисные - по строке таблицы
+    reduced_cost = z_row[:n]
+    inf = np.full(n, np.inf, dtype=z_row.dtype)
+    if is_max:
+        cost_increase, cost_decrease = reduced_cost.copy(), inf.copy()
+    else:
+        cost_increase, cost_decrease = inf.copy(), np.abs(reduced_cost)
+    for block in _index_blocks(len(rows), len(z_row)):
+        dec, inc = _ratio_ranges(z_row[None, :], basic_rows(rows[block]), lambda a: nonzero_elem(a) & nonzero_cost, axis=1)
+        cost_decrease[basic_x[block]] = dec
+        cost_increase[basic_x[block]] = inc
+    # Для u - x' коэффициент ЦФ меняет знак: увеличение c - это уменьшение коэффициента при u - x'
+    cost_increase[flipped_x], cost_decrease[flipped_x] = cost_decrease[flipped_x], cost_increase[flipped_x]
+    reduced_cost = np.where(flipped_x, -reduced_cost, reduced_cost) if flipped_x.any() else reduced_cost
+
+    return {
+        'shadow_price': shadow_price,
+        'rhs_increase': rhs_increase,
+        'rhs_decrease': rhs_decrease,
+        'value': value,
+        'reduced_cost': reduced_cost,
+        'cost_increase': cost_increase,
+        'cost_decrease': cost_decrease,
+    }
+
+def sensitivity_reports(ranges, original_rhs, original_obj_coeffs):
+    """Словари анализа чувствительности (var_analysis, constr_analysis) по массивам sensitivity_arrays."""
+    constr_analysis = [{
+        "name": f"Огр. {i+1}",
+        "rhs": original_rhs[i],
+        "shadow_price": price,
+        "allow_increase": inc,
+        "allow_decrease": dec
+    } for i, (price, inc, dec) in enumerate(zip(
+        ranges['shadow_price'].tolist(), ranges['rhs_increase'].tolist(), ranges['rhs_decrease'].tolist()
+    ))]
+    var_analysis = [{
+        "name": f"X{j+1}",
+        "final_value": value,
+        "obj_coeff": original_obj_coeffs[j],
+        "reduced_cost": rc,
+        "allow_increase": inc,
+        "allow_decrease": dec
+    } for j, (value, rc, inc, dec) in enumerate(zip(
+        ranges['value'].tolist(), ranges['reduced_cost'].tolist(),
+        ranges['cost_increase'].tolist(), ranges['cost_decrease'].tolist()
+    ))]
+    return var_analysis, constr_analysis
+
+def perform_sensitivity_analysis(final_tableau, original_rhs, original_obj_coeffs, num_dec_vars, num_constrs, is_max, options=None, lower=None, upper=None, flipped=None):
     """
     Расчет анализа чувствительности.
     ИСПРАВЛЕНО: Инвертирована логика знаков для переменных ЦФ (Objective Function),
     чтобы Increase/Decrease считались корректно.
+    options - допуски (нулевые элементы: pivot_tol, нулевые оценки: opt_tol).
+    lower/upper - границы X1..Xn, с которыми решалась задача, flipped - имена
+    переменных, хранящихся в таблице как u - x (ключ 'flipped' записи истории).
+    Таблица точного метода (дроби Fraction) анализируется точно: допуски не
+    применяются, диапазоны получаются дробями.
+    Расчет векторный (sensitivity_arrays): B^-1 - столбцы балансовых переменных таблицы.
     """
     try:
         z_row = final_tableau.get('E')
         if not z_row: return [], [], ""
 
-        sol_idx = len(z_row) - 1
-        
-        # 1. АНАЛИЗ ПРАВЫХ ЧАСТЕЙ (RHS) - ОСТАВЛЯЕМ КАК БЫЛО (РАБОТАЕТ ВЕРНО)
-        constr_analysis = []
-        slack_indices = range(num_dec_vars, num_dec_vars + num_constrs)
-        
-        for i, slack_idx in enumerate(slack_indices):
-            constr_name = f"Огр. {i+1}"
-            rhs_val = original_rhs[i]
-            shadow_price = z_row[slack_idx]
-            
-            if not is_max: shadow_price = abs(shadow_price)
-
-            d_max = float('inf') # Allowable Increase
-            d_min = float('inf') # Allowable Decrease
-            
-            for key, row_vals in final_tableau.items():
-                if key == 'E': continue
-                
-                b_i = row_vals[sol_idx]     
-                a_ik = row_vals[slack_idx]  
-                
-                if abs(a_ik) < 1e-9: continue
-                
-                if a_ik > 0:
-                    # Коэффициент положителен -> Ограничивает УМЕНЬШЕНИЕ RHS
-                    val = b_i / a_ik
-                    if val < d_min: d_min = val
-                else:
-                    # Коэффициент отрицателен -> Ограничивает УВЕЛИЧЕНИЕ RHS
-                    val = b_i / -a_ik
-                    if val < d_max: d_max = val
-
-            constr_analysis.append({
-                "name": constr_name,
-                "rhs": rhs_val,
-                "shadow_price": shadow_price,
-                "allow_increase": d_max,
-                "allow_decrease": d_min
-            })
+        names = [key for key in final_tableau if key != 'E']
+        from fractions import Fraction
+        dtype = object if isinstance(z_row[0], Fraction) else np.float64
+        T = np.array([z_row] + [final_tableau[key] for key in names], dtype=dtype).reshape(len(names) + 1, len(z_row))
+        column = {f"X{j+1}": j for j in range(len(z_row) - 1)}
+        basis = np.array([column.get(key, -1) for key in names], dtype=np.int64)
 
-        # 2. АНАЛИЗ ЦЕЛЕВОЙ ФУНКЦИИ (Cj)
-        var_analysis = []
-        basic_vars = list(final_tableau.keys())
-        if 'E' in basic_vars: basic_vars.remove('E')
-
-        for i in range(num_dec_vars):
-            var_name = f"X{i+1}"
-            orig_c = original_obj_coeffs[i]
-            current_val = final_tableau[var_name][sol_idx] if var_name in final_tableau else 0.0
-            reduced_cost = z_row[i] 
-            
-            d_increase = float('inf')
-            d_decrease = float('inf')
-            
-            if var_name not in basic_vars:
-                # Небазисная переменная
-                if is_max:
-                    d_increase = reduced_cost
-                    d_decrease = float('inf')
-                else:
-                    d_increase = float('inf')
-                    d_decrease = abs(reduced_cost)
-            else:
-                # Базисная переменная
-                row_vals = final_tableau[var_name]
-                
-                for j in range(len(z_row) - 1):
-                    if abs(z_row[j]) < 1e-9: continue
-                    
-                    rc_j = z_row[j]      # Reduced cost
-                    a_ij = row_vals[j]   # Коэффициент
-                    
-                    if abs(a_ij) < 1e-9: continue
-                    
-                    # === ИСПРАВЛЕННАЯ ЛОГИКА ЗДЕСЬ ===
-                    # Мы меняем местами Decrease и Increase по сравнению с предыдущей версией
-                    
-                    if a_ij > 0:
-                         # Раньше здесь был Increase, ТЕПЕРЬ DECREASE
-                         # Ограничивает УМЕНЬШЕНИЕ коэффициента ЦФ
-                         val = rc_j / a_ij
-                         if val < d_decrease: d_decrease = val
-                    else:
-                         # Раньше здесь был Decrease, ТЕПЕРЬ INCREASE
-                         # Ограничивает УВЕЛИЧЕНИЕ коэффициента ЦФ
-                         val = rc_j / -a_ij
-                         if val < d_increase: d_increase = val
-
-            var_analysis.append({
-                "name": var_name,
-                "final_value": current_val,
-                "obj_coeff": orig_c,
-                "reduced_cost": reduced_cost,
-                "allow_increase": d_increase,
-                "allow_decrease": d_decrease
-            })
+        flipped_mask = np.zeros(len(z_row) - 1, dtype=bool)
+        flipped_mask[[column[name] for name in flipped or ()]] = True
 
+        ranges = sensitivity_arrays(
+            T[0, :-1], lambda cols: T[1:, num_dec_vars + cols], T[1:, -1], basis,
+            lambda rows: T[1 + rows, :-1], num_dec_vars, is_max, options, lower, upper, flipped_mask
+        )
+        var_analysis, constr_analysis = sensitivity_reports(ranges, original_rhs, original_obj_coeffs)
         return var_analysis, constr_analysis, ""
-        
+
     except Exception as e:
         print(f"Ошибка: {e}")
-        return [], [], ""
\ No newline at end of file
+        return [], [], ""
@@ -0,0 +1,295 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+
+import simplex_core
+import simplex_history
+
+
+def to_fraction(value):
+    """Точное значение введенного числа: 0.1 -> 1/10 (по десятичной записи, а не по двоичной)."""
+    if isinstance(value, (int, Fraction)):
+        return Fraction(value)
+    return Fraction(repr(float(value)))
+
+
+def _integer_row(values):
+    """Строка дробей, умноженная на НОК знаменателей: (целые числа, множитель)."""
+    scale = 1
+    for v in values:
+        scale = scale * v.denominator // math.gcd(scale, v.denominator)
+    return [int(v * scale) for v in values], scale
+
+
+def _build_matrix(c, A, b, is_min):
+    """
+    Целочисленная таблица M (dtype=object) той же структуры, что у _build_tableau.
+    Каждая строка умножается на свой множитель, чтобы коэффициенты стали
+    целыми; балансовая переменная строки i масштабируется тем же множителем
+    (s_i' = scale_i·s_i), поэтому ее столбец остается единичным.
+    Возвращает (M, row_scale): row_scale[0] - множитель строки E.
+    """
+    m, n = len(A), len(c)
+    M = np.zeros((m + 1, n + m + 1), dtype=object)
+    row_scale = []
+    obj, scale = _integer_row([v if is_min else -v for v in c])
+    M[0, :n] = obj
+    row_scale.append(scale)
+    for i in range(m):
+        row, scale = _integer_row(list(A[i]) + [b[i]])
+        M[i + 1, :n] = row[:-1]
+        M[i + 1, -1] = row[-1]
+        M[i + 1, n + i] = 1
+        row_scale.append(scale)
+    return M, row_scale
+
+
+def _pivot_exact(M, d, row, col):
+    """
+    Поворот без дробей (Барейс): таблица равна M / d, после поворота -
+    M' / p, где p = M[row, col]. Деление на прежний знаменатель d точное,
+    элементы M остаются минорами исходной целочисленной матрицы и не
+    разрастаются. Возвращает новый знаменатель p.
+    """
+    p = M[row, col]
+    lead = M[row].copy()
+    M[:] = (p * M - np.multiply.outer(M[:, col], lead)) // d
+    M[row] = lead
+    return p
+
+
+class ExactTableau:
+    """Перевод целочисленной таблицы M / d в дроби в исходных единицах балансовых переменных."""
+
+    def __init__(self, row_scale, num_vars):
+        self.row_scale = row_scale
+        self.num_vars = num_vars
+        self.col_scale = [1] * num_vars + row_scale[1:] + [1]
+
+    def rows(self, basis):
+        """Множители строк: строка E и строки базисных балансовых переменных делятся на свой масштаб."""
+        n = self.num_vars
+        return [self.row_scale[0]] + [self.row_scale[j - n + 1] if j >= n else 1 for j in basis]
+
+    def table(self, M, d, basis):
+        rs, cs = self.rows(basis), self.col_scale
+        T = np.empty(M.shape, dtype=object)
+        for k in range(M.shape[0]):
+            den = d * rs[k]
+            T[k] = [Fraction(v * s, den) for v, s in zip(M[k], cs)]
+        return T
+
+
+class ExactHistory(simplex_history.SolveHistory):
+    """
+    История точного метода: таблицы из дробей собираются из целочисленной
+    матрицы только при обращении. Режимы те же, что у TableauHistory:
+    'full' хранит целочисленные матрицы, 'pivots' - исходную матрицу
+    и повороты, 'none' - только финальную запись.
+    """
+
+    def __init__(self, mode, M, var_names, view):
+        super().__init__(mode, var_names, M.shape[0] - 1, False)
+        self.view = view
+        if mode == 'pivots':
+            self.M0 = M.copy()
+            self.ops = []
+            self.marks = []
+            self._cache = None
+        elif mode == 'full':
+            self.frames = []
+
+    def record(self, step, M, d, basis, ratios=None):
+        self._add(step, ratios)
+        self._live = (M, d, basis)
+        if step['pivot_col'] is None:
+            self.final = (self.view.table(M, d, basis), basis.copy(), None)
+        if self.mode == 'full':
+            self.frames.append((M.copy(), d, basis.copy()))
+        elif self.mode == 'pivots':
+            self.marks.append(len(self.ops))
+
+    def op(self, row, col):
+        if self.mode == 'pivots':
+            self.ops.append((row, col))
+
+    def _add(self, step, ratios):
+        # Отношения точные: в записи хранятся их числители и знаменатели, дроби строятся при обращении
+        if self.mode == 'none':
+            self.steps = []
+        step['ratios'] = ratios
+        self.steps.append(step)
+
+    def _fill(self, step, i, T, basis, flags):
+        step['table'] = simplex_core._tableau_dict(T, basis, self.var_names)
+        if step['ratios'] is None:
+            step['ratios'] = []
+        else:
+            num, den = step['ratios']
+            step['ratios'] = [Fraction(a, q) if q > 0 else float('inf') for a, q in zip(num, den)]
+
+    def _state(self, i):
+        if self.mode == 'full':
+            M, d, basis = self.frames[i]
+            return self.view.table(M, d, basis), basis, None
+        if self._cache is not None and self._cache[0] <= i:
+            start, M, d, basis = self._cache
+            done = self.marks[start]
+        else:
+            M, d = self.M0.copy(), 1
+            m = M.shape[0] - 1
+            basis = np.arange(M.shape[1] - 1 - m, M.shape[1] - 1)
+            done = 0
+        for row, col in self.ops[done:self.marks[i]]:
+            d = _pivot_exact(M, d, row, col)
+            basis[row - 1] = col
+        self._cache = (i, M, d, basis)
+        return self.view.table(M, d, basis), basis, None
+
+    def _live_state(self):
+        M, d, basis = self._live
+        return self.view.table(M, d, basis), basis, None
+
+
+def exact_steps(c, A, b, lower, is_min, var_names, max_iter=None, upper=None, pricing=None, options=None, history='full'):
+    """
+    Генератор точного симплекс-метода (та же схема, что у _tableau_steps).
+    Данные переводятся в дроби по десятичной записи, строки масштабируются
+    до целых, повороты выполняются без дробей с общим знаменателем
+    (_pivot_exact). Все сравнения точные, допуски из options не нужны;
+    при серии вырожденных поворотов (degeneracy != 'none') метод переходит
+    на правило Бленда - в точной арифметике возмущение не требуется.
+    lower - нижние границы (сдвиг x = l + x' выполняется точно), верхние
+    границы не поддерживаются.
+    Возвращает через StopIteration (history_steps, state, err); значения
+    в state - дроби.
+    """
+    if upper is not None and np.isfinite(upper).any():
+        return None, None, "Точный метод не поддерживает верхние границы переменных"
+    rule = getattr(pricing, 'name', pricing) or 'dantzig'
+    if rule not in ('dantzig', 'bland'):
+        return None, None, f"Точный метод поддерживает только правила 'dantzig' и 'bland', а не '{rule}'"
+    opts = simplex_core.solver_options(options)
+    if opts['storage'] != 'memory':
+        return None, None, "Точный метод хранит таблицу только в оперативной памяти"
+
+    c = [to_fraction(v) for v in c]
+    l = [to_fraction(v) for v in lower]
+    A = [[to_fraction(v) for v in row] for row in A]
+    b = [to_fraction(v) for v in b]
+    if any(l):
+        b = [v - sum(a * lj for a, lj in zip(row, l)) for v, row in zip(b, A)]
+    num_constrs, num_vars = len(A), len(c)
+    max_iter = simplex_core.iteration_limit(opts, num_constrs, num_vars, max_iter)
+
+    M, row_scale = _build_matrix(c, A, b, is_min)
+    view = ExactTableau(row_scale, num_vars)
+    cs = view.col_scale
+    num_cols = M.shape[1] - 1
+    basis = np.arange(num_vars, num_vars + num_constrs)
+    d = 1
+
+    # Шаг theta сравнивается с нулем точно; Бленд включается вместо возмущения
+    monitor = simplex_core.StallMonitor(dict(
+        opts, feas_tol=0, degeneracy='none' if opts['degeneracy'] == 'none' else 'bland'
+    ))
+    sign = 1 if is_min else -1
+    history_steps = ExactHistory(history, M, var_names, view)
+    counter = 0
+    optimal = False
+
+    # Первая фаза при b < 0: двойственный симплекс с нулевыми оценками по правилу Бленда
+    # (уходит переменная с наименьшим номером среди отрицательных, входит первый столбец)
+    while counter < max_iter:
+        rows = [k for k in range(num_constrs) if M[k + 1, -1] < 0]
+        if not rows:
+            break
+        r = min(rows, key=lambda k: basis[k])
+        cols = [j for j in range(num_cols) if M[r + 1, j] < 0]
+        if not cols:
+            return None, None, "Задача не имеет допустимых решений"
+        d = _pivot_exact(M, d, r + 1, cols[0])
+        if d < 0:
+            # Ведущий элемент отрицателен: знаменатель делаем положительным, M / d не меняется
+            M[:] = -M
+            d = -d
+        basis[r] = cols[0]
+        history_steps.op(r + 1, cols[0])
+        counter += 1
+
+    while counter < max_iter:
+        # Выгодность столбцов в исходных единицах (общий положительный множитель не важен)
+        price = [sign * v * s for v, s in zip(M[0, :-1], cs)]
+        candidates = [j for j in range(num_cols) if price[j] > 0]
+        if not candidates:
+            history_steps.record({'pivot_col': None, 'pivot_row': None}, M, d, basis)
+            yield history_steps
+            optimal = True
+            break
+        if rule == 'bland' or monitor.bland:
+            pivot_col = candidates[0]
+        else:
+            pivot_col = max(candidates, key=lambda j: (price[j], -j))
+
+        col, rhs = M[1:, pivot_col], M[1:, -1]
+        rows = [k for k in range(num_constrs) if col[k] > 0]
+        if not rows:
+            return None, None, "Задача не ограничена (нет конечного решения)"
+        # Отношения rhs_k / col_k сравниваются перекрестным умножением, без дробей
+        best = rows[0]
+        for k in rows[1:]:
+            if rhs[k] * col[best] < rhs[best] * col[k]:
+                best = k
+        tied = [k for k in rows if rhs[k] * col[best] == rhs[best] * col[k]]
+        if opts['ratio_test'] == 'bland' or monitor.bland:
+            ratio_idx = min(tied, key=lambda k: basis[k])
+        else:
+            ratio_idx = tied[0]
+        theta = Fraction(rhs[ratio_idx], col[ratio_idx])
+        ratios = (rhs.copy(), col * cs[pivot_col])
+
+        pivot_row_idx = ratio_idx + 1
+        history_steps.record({
+            'pivot_col': pivot_col,
+            'pivot_row': pivot_row_idx,
+            'entering': var_names[pivot_col],
+            'leaving': var_names[basis[ratio_idx]]
+        }, M, d, basis, ratios)
+        yield history_steps
+
+        d = _pivot_exact(M, d, pivot_row_idx, pivot_col)
+        basis[ratio_idx] = pivot_col
+        history_steps.op(pivot_row_idx, pivot_col)
+        counter += 1
+        monitor.step(theta)
+
+    if not optimal:
+        return None, None, f"Превышено число итераций ({max_iter})"
+
+    T = history_steps.final[0]
+    values = [Fraction(0)] * num_cols
+    for k, j in enumerate(basis):
+        values[j] = T[k + 1, -1]
+    z = -T[0, -1] if is_min else T[0, -1]
+    state = {'basis': basis, 'values': values, 'z': z, 'at_upper': np.zeros(num_cols, dtype=bool),
+             'iterations': counter, 'lower': l, 'cost': c}
+    state.update(monitor.report())
+    return history_steps, state, None
+
+
+def final_result(state, is_min, var_names):
+    """final_z и final_vars точного метода - дроби (с учетом сдвига x = l + x')."""
+    basis, values, l, c = state['basis'], state['values'], state['lower'], state['cost']
+    num_vars = len(l)
+    z = state['z'] + sum(cj * lj for cj, lj in zip(c, l))
+    final_z = -z if is_min else z
+
+    final_vars = {}
+    for j in basis:
+        final_vars[var_names[j]] = values[j] + l[j] if j < num_vars else values[j]
+    for j in range(num_vars):
+        v = values[j] + l[j]
+        if var_names[j] not in final_vars and v != 0:
+            final_vars[var_names[j]] = v
+    return final_z, final_vars
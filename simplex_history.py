@@ -0,0 +1,281 @@
+import abc
+import copy
+
+import numpy as np
+
+import simplex_core
+
+HISTORY_MODES = ('none', 'pivots', 'full')
+
+
+class _ArrayLog:
+    """Растущий непрерывный массив записей одинаковой формы (емкость удваивается)."""
+
+    def __init__(self, shape, dtype=np.float64):
+        self.data = np.empty((4,) + tuple(shape), dtype=dtype)
+        self.size = 0
+
+    def append(self, item):
+        if self.size == len(self.data):
+            grown = np.empty((2 * len(self.data),) + self.data.shape[1:], dtype=self.data.dtype)
+            grown[:self.size] = self.data
+            self.data = grown
+        self.data[self.size] = item
+        self.size += 1
+
+    def __getitem__(self, i):
+        return self.data[i]
+
+    @property
+    def nbytes(self):
+        return self.data[:self.size].nbytes
+
+
+class SolveHistory(abc.ABC):
+    """
+    История решения - последовательность записей в прежнем формате
+    ({'table', 'pivot_col', 'pivot_row', 'ratios', ...}), но записи-словари
+    создаются только при обращении. mode:
+      'none'   - хранится только финальная запись;
+      'pivots' - хранятся сведения о поворотах и отношения, промежуточные
+                 таблицы восстанавливаются по запросу;
+      'full'   - все таблицы хранятся в одном непрерывном массиве float64.
+    """
+
+    def __init__(self, mode, var_names, num_rows, bounded, tables=True):
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"Неизвестный режим истории: {mode}")
+        self.mode = mode
+        self.var_names = var_names
+        self.bounded = bounded
+        self.tables = tables
+        self.steps = []                          # сведения о поворотах без таблиц
+        self.ratios = _ArrayLog((num_rows if tables else 0,))   # отношения каждого шага
+        self.final = None                        # (T, basis, flags) финальной записи
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Нет такой записи истории")
+        step = dict(self.steps[i])
+        if self.tables:
+            T, basis, flags = self.final if (i == len(self) - 1 and self.final) else self._state(i)
+            self._fill(step, i, T, basis, flags)
+        return step
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def current(self):
+        """
+        Последняя запись по текущему состоянию движка - без восстановления
+        таблицы. Действительна только сразу после записи (используется
+        генератором simplex_core.iter_simplex).
+        """
+        i = len(self) - 1
+        step = dict(self.steps[i])
+        if self.tables:
+            T, basis, flags = self.final if (step['pivot_col'] is None and self.final) else self._live_state()
+            self._fill(step, i, T, basis, flags)
+        return step
+
+    def _fill(self, step, i, T, basis, flags):
+        step['table'] = simplex_core._tableau_dict(T, basis, self.var_names)
+        step['ratios'] = [] if step['pivot_col'] is None else self.ratios[i].tolist()
+        if self.bounded:
+            step['flipped'] = [self.var_names[j] for j in np.flatnonzero(flags)]
+
+    def _add(self, step, ratios):
+        """Добавляет запись; в режиме 'none' предыдущие записи отбрасываются."""
+        if self.mode == 'none':
+            self.steps = []
+            self.ratios.size = 0
+        self.steps.append(step)
+        if self.tables:
+            self.ratios.append(np.inf if ratios is None else ratios)
+
+    @abc.abstractmethod
+    def _state(self, i):
+        """(T, basis, flags) i-й записи; реализуется в движках."""
+
+    @abc.abstractmethod
+    def _live_state(self):
+        """(T, basis, flags) текущего состояния движка; реализуется в движках."""
+
+
+class TableauHistory(SolveHistory):
+    """
+    История табличного метода. В режиме 'pivots' запоминается исходная
+    таблица и последовательность операций над ней (повороты, смены границ,
+    сдвиги правых частей); таблица i-й записи получается их повторением.
+    Последняя восстановленная таблица кэшируется, поэтому последовательный
+    просмотр всех записей стоит столько же, сколько само решение.
+    storage - хранилище таблиц (simplex_storage): при хранении на диске
+    исходная, восстановленные и финальная таблицы, а в режиме 'full' и все
+    снимки находятся в файлах.
+    """
+
+    def __init__(self, mode, T, var_names, ub, slack_cols, storage=None):
+        import simplex_storage
+        super().__init__(mode, var_names, T.shape[0] - 1, bool(np.isfinite(ub).any()))
+        self.ub = ub
+        self.slack_cols = slack_cols
+        self.storage = storage or simplex_storage.MemoryStorage()
+        if mode == 'pivots':
+            self.T0 = self.storage.copy(T)
+            self.ops = []
+            self.marks = []
+            self._cache = None
+        elif mode == 'full':
+            self.tableaux = self.storage.log(T.shape)
+            self.bases = _ArrayLog((T.shape[0] - 1,), np.int64)
+            self.flags = _ArrayLog((T.shape[1] - 1,), bool)
+
+    def record(self, step, T, basis, flipped, ratios=None):
+        self._add(step, ratios)
+        self._live = (T, basis, flipped)
+        if step['pivot_col'] is None:
+            self.final = (self.storage.copy(T), basis.copy(), flipped.copy())
+        if self.mode == 'full':
+            self.tableaux.append(T)
+            self.bases.append(basis)
+            self.flags.append(flipped)
+        elif self.mode == 'pivots':
+            self.marks.append(len(self.ops))
+
+    def op(self, *op):
+        """Запоминает операцию над таблицей: ('pivot', row, col), ('flip', col), ('complement', row, var), ('shift', shift_b)."""
+        if self.mode == 'pivots':
+            self.ops.append(op)
+
+    def _state(self, i):
+        if self.mode == 'full':
+            return self.tableaux[i], self.bases[i], self.flags[i]
+        if self._cache is not None and self._cache[0] <= i:
+            start, T, basis, flipped = self._cache
+            done = self.marks[start]
+        else:
+            T = self.storage.copy(self.T0)
+            m = T.shape[0] - 1
+            basis = np.arange(T.shape[1] - 1 - m, T.shape[1] - 1)
+            flipped = np.zeros(T.shape[1] - 1, dtype=bool)
+            done = 0
+        work = self.storage.work(T)
+        for op in self.ops[done:self.marks[i]]:
+            self._apply(T, basis, flipped, op, work)
+        self._cache = (i, T, basis, flipped)
+        return T, basis, flipped
+
+    def _live_state(self):
+        return self._live
+
+    def _apply(self, T, basis, flipped, op, work):
+        kind = op[0]
+        if kind == 'pivot':
+            _, row, col = op
+            simplex_core._pivot(T, row, col, work)
+            basis[row - 1] = col
+        elif kind == 'flip':
+            col = op[1]
+            T[:, -1] -= self.ub[col] * T[:, col]
+            T[:, col] *= -1
+            flipped[col] = not flipped[col]
+        elif kind == 'complement':
+            _, row, var = op
+            simplex_core._complement_row(T, row, var, self.ub[var])
+            flipped[var] = not flipped[var]
+        elif kind == 'shift':
+            T[:, -1] += T[:, self.slack_cols] @ op[1]
+
+    @property
+    def nbytes(self):
+        """Память, занятая таблицами и отношениями."""
+        size = self.ratios.nbytes
+        if self.mode == 'full':
+            size += self.tableaux.nbytes + self.bases.nbytes + self.flags.nbytes
+        elif self.mode == 'pivots':
+            size += self.T0.nbytes
+        if self.final:
+            size += self.final[0].nbytes
+        return size
+
+
+class RevisedHistory(SolveHistory):
+    """
+    История модифицированного метода. Таблицы в этом методе не строятся:
+    в режиме 'pivots' на каждом шаге запоминаются только базис и
+    переменные на верхней границе, таблица восстанавливается по запросу
+    через новое разложение базиса. В режиме 'full' таблица собирается при
+    записи шага и, как в табличном методе, дописывается в один массив
+    хранилища (сборка на каждом шаге делает метод медленнее табличного).
+    При tables=False (разреженные задачи) таблицы не строятся вовсе,
+    в записях хранится шаг theta.
+    """
+
+    def __init__(self, mode, problem, var_names, is_min, ub, tables=True, storage=None):
+        import simplex_storage
+        super().__init__(mode, var_names, problem.m, bool(np.isfinite(ub).any()), tables)
+        self.problem = problem
+        self.is_min = is_min
+        self.ub = ub
+        self.storage = storage or simplex_storage.MemoryStorage()
+        if tables and mode != 'none':
+            if mode == 'full':
+                self.tableaux = self.storage.log((problem.m + 1, problem.n + problem.m + 1))
+            else:
+                self.rhs = []   # ссылки на действующий вектор b (при возмущении он заменяется новым массивом)
+            self.bases = _ArrayLog((problem.m,), np.int64)
+            self.flags = _ArrayLog((problem.n + problem.m,), bool)
+
+    def record(self, step, st, ratios=None):
+        import simplex_revised
+        theta = step.pop('theta', None)
+        if not self.tables:
+            if theta is not None:
+                step['theta'] = theta
+            if self.bounded:
+                step['flipped'] = [self.var_names[j] for j in np.flatnonzero(st['at_upper'])]
+            self._add(step, None)
+            return
+
+        self._add(step, ratios)
+        self._live = st
+        if step['pivot_col'] is None or self.mode == 'full':
+            _, d = simplex_revised.reduced_costs(self.problem, st)
+            T = simplex_revised._snapshot_array(self.problem, st, d, self.is_min)
+        if step['pivot_col'] is None:
+            self.final = (T, st['basis'].copy(), st['at_upper'].copy())
+        if self.mode == 'full':
+            self.tableaux.append(T)
+        elif self.mode == 'pivots':
+            self.rhs.append(self.problem.b)
+        if self.mode != 'none':
+            self.bases.append(st['basis'])
+            self.flags.append(st['at_upper'])
+
+    def _state(self, i):
+        import simplex_revised
+        basis, at_upper = self.bases[i], self.flags[i]
+        if self.mode == 'full':
+            return self.tableaux[i], basis, at_upper
+        problem = copy.copy(self.problem)
+        problem.b = self.rhs[i]
+        st = {'basis': basis.copy(), 'ub': self.ub, 'at_upper': at_upper.copy()}
+        st['factor'] = simplex_revised.BasisFactor(problem, st['basis'])
+        simplex_revised.recompute_primal(problem, st)
+        _, d = simplex_revised.reduced_costs(problem, st)
+        return simplex_revised._snapshot_array(problem, st, d, self.is_min), basis, at_upper
+
+    def _live_state(self):
+        import simplex_revised
+        st = self._live
+        _, d = simplex_revised.reduced_costs(self.problem, st)
+        T = simplex_revised._snapshot_array(self.problem, st, d, self.is_min)
+        return T, st['basis'], st['at_upper']
@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import connection, shared_memory
+
+import numpy as np
+
+import simplex_core
+
+
+def _task_spec(problem):
+    """
+    Задача для solve_many: словарь {'raw_matrix', 'operation', 'num_vars', ...}
+    (остальные ключи - параметры calculate_simplex) или кортеж
+    (raw_matrix, operation, num_vars[, параметры]). Возвращает (матрица, параметры).
+    """
+    if isinstance(problem, dict):
+        kwargs = dict(problem)
+        raw = kwargs.pop('raw_matrix')
+    else:
+        raw, operation, num_vars, *rest = problem
+        kwargs = dict(rest[0]) if rest else {}
+        kwargs.update(operation=operation, num_vars=num_vars)
+    return np.asarray(raw, dtype=np.float64), kwargs
+
+
+def _worker(conn, shm_name):
+    """
+    Рабочий процесс: получает (index, offset, shape, kwargs), берет матрицу
+    задачи из общей памяти без копирования и отправляет
+    (index, final_z, final_vars, err, stats). None - сигнал завершения.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+            index, offset, shape, kwargs = task
+            raw = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=offset)
+            kwargs = dict({'history': 'none'}, **kwargs)
+            sensitivity = kwargs.pop('sensitivity', False)
+            stats = {}
+            started = time.perf_counter()
+            try:
+                final_z, steps, final_vars, err, _ = simplex_core.calculate_simplex(raw, stats=stats, **kwargs)
+                if not err and sensitivity:
+                    stats['sensitivity'] = _sensitivity(raw, final_z, steps, final_vars, stats, kwargs)
+                if not err and kwargs['history'] != 'none':
+                    stats['history'] = list(steps)
+            except Exception as e:
+                final_z, final_vars, err = None, None, f"Ошибка в вычислениях: {str(e)}"
+            stats['time'] = time.perf_counter() - started
+            steps = None
+            del raw
+            conn.send((index, final_z, final_vars, err, stats))
+    finally:
+        shm.close()
+
+
+def _sensitivity(raw, final_z, steps, final_vars, stats, kwargs):
+    """Анализ чувствительности решенной задачи ({'variables', 'constraints'}, как Result.sensitivity)."""
+    import simplex_api
+    problem = simplex_api.Problem.from_raw(
+        raw.copy(), kwargs['operation'], kwargs['num_vars'],
+        kwargs.get('constr_signs'), kwargs.get('lower'), kwargs.get('upper'),
+    )
+    result = simplex_api.Result(final_z, final_vars, None, steps, None, stats)
+    var_an, constr_an = simplex_api.sensitivity_analysis(problem, result, kwargs.get('options'))
+    return {'variables': var_an, 'constraints': constr_an}
+
+
+class _Slot:
+    """Рабочий процесс пула и задача, которую он решает."""
+
+    def __init__(self, ctx, shm_name):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(child, shm_name), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None
+        self.started = None
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(timeout=None if kill else 5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def solve_many(problems, workers=None, timeout=None, start_method='spawn'):
+    """
+    Решение независимых задач в пуле процессов (calculate_simplex не зависит
+    от Qt, поэтому рабочие процессы не импортируют интерфейс).
+
+    problems - последовательность задач (см. _task_spec); по умолчанию
+    history='none'. При history='pivots' или 'full' записи истории
+    передаются списком в stats['history'], при параметре sensitivity=True -
+    анализ чувствительности в stats['sensitivity'] (как Result.sensitivity);
+    время решения в процессе, с - в stats['time']. Матрицы всех
+    задач один раз копируются в общую память, процессам отправляются только
+    смещения и параметры. workers - число процессов (по умолчанию
+    os.cpu_count()), timeout - предельное время решения одной задачи
+    в секундах: процесс, превысивший его, завершается и заменяется новым;
+    так же заменяется аварийно завершившийся процесс.
+
+    Генератор: выдает (index, final_z, final_vars, err, stats) по мере
+    готовности задач, index - номер задачи в problems. Прерванный перебор
+    останавливает процессы и освобождает общую память.
+    """
+    specs = [_task_spec(p) for p in problems]
+    if not specs:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(specs)))
+    offsets = np.cumsum([0] + [raw.nbytes for raw, _ in specs])
+    ctx = multiprocessing.get_context(start_method)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+    slots = []
+    try:
+        for (raw, _), offset in zip(specs, offsets):
+            np.ndarray(raw.shape, dtype=np.float64, buffer=shm.buf, offset=offset)[...] = raw
+        slots = [_Slot(ctx, shm.name) for _ in range(workers)]
+        pending = list(range(len(specs)))[::-1]
+        running = 0
+
+        while pending or running:
+            for slot in slots:
+                if slot.task is None and pending:
+                    index = pending.pop()
+                    slot.conn.send((index, int(offsets[index]), specs[index][0].shape, specs[index][1]))
+                    slot.task, slot.started = index, time.monotonic()
+                    running += 1
+
+            busy = [slot for slot in slots if slot.task is not None]
+            wait = None
+            if timeout is not None:
+                wait = max(0.0, min(slot.started + timeout for slot in busy) - time.monotonic())
+            ready = connection.wait([s.conn for s in busy] + [s.process.sentinel for s in busy], wait)
+
+            for k, slot in enumerate(slots):
+                if slot.task is None:
+                    continue
+                err = None
+                if slot.conn in ready:
+                    try:
+                        result = slot.conn.recv()
+                    except (EOFError, OSError):
+                        err = "Процесс решателя завершился аварийно"
+                    else:
+                        slot.task = None
+                        running -= 1
+                        yield result
+                        continue
+                elif slot.process.sentinel in ready:
+                    err = "Процесс решателя завершился аварийно"
+                elif timeout is not None and time.monotonic() - slot.started >= timeout:
+                    err = f"Превышено время решения ({timeout} с)"
+                if err:
+                    index = slot.task
+                    slot.stop(kill=True)
+                    slots[k] = _Slot(ctx, shm.name)
+                    running -= 1
+                    yield index, None, None, err, {}
+    finally:
+        for slot in slots:
+            slot.stop(kill=slot.task is not None)
+        shm.close()
+        shm.unlink()
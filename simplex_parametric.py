@@ -0,0 +1,199 @@
+import numpy as np
+
+import simplex_core
+import simplex_revised
+import simplex_session
+
+
+def parametric_rhs(raw_matrix, operation, num_vars, direction, t_from=0.0, t_to=1.0, constr_signs=None, lower=None, upper=None, options=None, max_pivots=None):
+    """
+    Параметрическое программирование по правым частям: b(t) = b + t·direction
+    (direction - в ориентации ограничений пользователя), t от t_from до t_to.
+    Задача решается один раз при t_from, затем базис ведется по t: пока он
+    допустим, x и E линейны по t; в точке излома базисная переменная
+    достигает границы и уходит из базиса поворотом двойственного симплекса.
+    Возвращает (segments, stop, err): segments - участки (см. _segment),
+    stop - None, если пройден весь диапазон, иначе причина, по которой
+    задача не решается при t больше конца последнего участка (или t_from,
+    если участков нет): например, задача несовместна.
+    """
+    return _parametric('rhs', raw_matrix, operation, num_vars, direction, t_from, t_to, constr_signs, lower, upper, options, max_pivots)
+
+
+def parametric_cost(raw_matrix, operation, num_vars, direction, t_from=0.0, t_to=1.0, constr_signs=None, lower=None, upper=None, options=None, max_pivots=None):
+    """
+    Параметрическое программирование по коэффициентам ЦФ: c(t) = c + t·direction.
+    Решение постоянно на каждом участке, E линейна по t; в точке излома
+    оценка небазисной переменной меняет знак и она входит в базис поворотом
+    прямого симплекса. Результат - как у parametric_rhs.
+    """
+    return _parametric('cost', raw_matrix, operation, num_vars, direction, t_from, t_to, constr_signs, lower, upper, options, max_pivots)
+
+
+def curve(segments):
+    """Точки ломаной E(t): массивы t и E (начало первого участка и концы всех участков)."""
+    if not segments:
+        return np.array([]), np.array([])
+    t = [segments[0]['t_from']] + [s['t_to'] for s in segments]
+    z = [segments[0]['z_from']] + [s['z_to'] for s in segments]
+    return np.array(t), np.array(z)
+
+
+def _segment(t_from, t_to, start, end, basis_names):
+    """Участок с постоянным оптимальным базисом: границы t, E и значения переменных на концах."""
+    z_from, vars_from = start
+    z_to, vars_to = end
+    return {
+        't_from': t_from,
+        't_to': t_to,
+        'z_from': z_from,
+        'z_to': z_to,
+        'slope': (z_to - z_from) / (t_to - t_from) if t_to > t_from else 0.0,
+        'basis': basis_names,
+        'vars_from': vars_from,
+        'vars_to': vars_to,
+    }
+
+
+def _parametric(kind, raw_matrix, operation, num_vars, direction, t_from, t_to, constr_signs, lower, upper, options, max_pivots):
+    session = simplex_session.SimplexSession(raw_matrix, operation, num_vars, constr_signs, lower, upper, options=options)
+    if session.error:
+        return None, None, session.error
+    if t_to < t_from:
+        return None, None, "Конец диапазона параметра меньше начала"
+    direction = np.asarray(direction, dtype=np.float64)
+    if kind == 'rhs':
+        if direction.shape != session.b.shape:
+            return None, None, "Размер направления не совпадает с числом ограничений"
+        base, step = session.b.copy(), session.row_signs * direction
+    else:
+        if direction.shape != session.c.shape:
+            return None, None, "Размер направления не совпадает с числом переменных"
+        base, step = session.c.copy(), direction
+
+    def move(t):
+        # base и step - во внутренней записи (строки >= умножены на -1), знаки строк - сами себе обратные
+        if kind == 'rhs':
+            session.set_rhs_vector(session.row_signs * (base + t * step))
+        else:
+            session.set_cost_vector(base + t * step)
+
+    opts = session.options
+    move(t_from)
+    _, _, err = session.reoptimize()
+    if err:
+        return None, None, err
+
+    num_constrs = len(session.b)
+    names = [f'X{i+1}' for i in range(num_vars + num_constrs)]
+    max_pivots = simplex_core.iteration_limit(opts, num_constrs, num_vars, max_pivots)
+    segments = []
+    t = float(t_from)
+    pivots = 0
+    while True:
+        problem, st = session.problem, session.state
+        if kind == 'rhs':
+            length, blocking = _rhs_step(problem, st, step, opts)
+        else:
+            length, blocking = _cost_step(problem, st, step, opts)
+        t_next = float(min(t + length, t_to))
+        if t_next > t:
+            # Участки нулевой длины (вырожденные повороты в одной точке) не записываются
+            start = session.solution()
+            move(t_next)
+            segments.append(_segment(t, t_next, start, session.solution(), [names[j] for j in st['basis']]))
+            t = t_next
+        if t >= t_to:
+            return segments, None, None
+        if pivots >= max_pivots:
+            return segments, f"Превышено число поворотов ({max_pivots})", None
+        if kind == 'rhs':
+            stop = _rhs_pivot(session.problem, st, blocking, opts)
+        else:
+            stop = _cost_pivot(session.problem, st, blocking, opts)
+        if stop:
+            return segments, stop, None
+        pivots += 1
+
+
+def _rhs_step(problem, st, step, opts):
+    """
+    Длина участка по t при b(t) = b + t·step: x_B(t) = x_B + t·B^-1·step
+    остается в границах. Возвращает (длина, (строка, к верхней ли границе)).
+    """
+    tol = opts['pivot_tol']
+    x_B, ub_B = st['x_B'], st['ub'][st['basis']]
+    dx = st['factor'].ftran(step)
+    lengths = np.full(len(x_B), np.inf)
+    down = dx < -tol
+    up = (dx > tol) & np.isfinite(ub_B)
+    np.divide(np.maximum(x_B, 0.0), -dx, out=lengths, where=down)
+    np.divide(np.maximum(ub_B - x_B, 0.0), dx, out=lengths, where=up)
+    if not len(lengths):
+        return np.inf, None
+    r = int(np.argmin(lengths))
+    return lengths[r], (r, bool(up[r]))
+
+
+def _rhs_pivot(problem, st, blocking, opts):
+    """Поворот двойственного симплекса по строке r (ее переменная достигла границы). Возвращает причину остановки или None."""
+    r, to_upper = blocking
+    tol = opts['pivot_tol']
+    basis, at_upper = st['basis'], st['at_upper']
+    _, d = simplex_revised.reduced_costs(problem, st)
+    e = np.zeros(problem.m)
+    e[r] = 1.0
+    alpha_r = problem.tableau_row(st['factor'].btran(e))
+    s_alpha = np.where(at_upper, -1.0, 1.0) * alpha_r
+    s_alpha[basis] = 0.0
+    eligible = s_alpha > tol if to_upper else s_alpha < -tol
+    if not eligible.any():
+        return "Задача не имеет допустимых решений"
+    ratios = np.full(len(d), np.inf)
+    np.divide(np.abs(d), np.abs(alpha_r), out=ratios, where=eligible)
+    q = int(np.argmin(ratios))
+
+    alpha_q = st['factor'].ftran(problem.column(q))
+    at_upper[basis[r]] = to_upper
+    at_upper[q] = False
+    simplex_revised._replace_basic(problem, st, r, q, alpha_q)
+    simplex_revised.recompute_primal(problem, st)
+    return None
+
+
+def _cost_step(problem, st, step, opts):
+    """
+    Длина участка по t при c(t) = c + t·step: оценки d(t) = d + t·d_step
+    сохраняют знак оптимальности. Возвращает (длина, входящий столбец).
+    """
+    tol = opts['pivot_tol']
+    basis = st['basis']
+    _, d = simplex_revised.reduced_costs(problem, st)
+    y = st['factor'].btran(np.concatenate((step, np.zeros(problem.m)))[basis])
+    d_step = np.concatenate((step - problem.A.rmatvec(y), -y))
+    d_step[basis] = 0.0
+    sigma = np.where(st['at_upper'], -1.0, 1.0)
+    growing = sigma * d_step > tol
+    lengths = np.full(len(d), np.inf)
+    np.divide(np.maximum(-sigma * d, 0.0), sigma * d_step, out=lengths, where=growing)
+    q = int(np.argmin(lengths))
+    return lengths[q], q
+
+
+def _cost_pivot(problem, st, q, opts):
+    """Поворот прямого симплекса: входит столбец q (его оценка стала выгодной). Возвращает причину остановки или None."""
+    basis, ub, at_upper = st['basis'], st['ub'], st['at_upper']
+    alpha = st['factor'].ftran(problem.column(q))
+    # Переменная на верхней границе входит, уменьшаясь
+    alpha_dir = -alpha if at_upper[q] else alpha
+    _, r, limit = simplex_core._ratio_test(st['x_B'], alpha_dir, ub[basis], opts, basis)
+    if np.isfinite(ub[q]) and ub[q] <= limit:
+        at_upper[q] = not at_upper[q]
+    elif r < 0:
+        return "Задача не ограничена (нет конечного решения)"
+    else:
+        at_upper[basis[r]] = bool(alpha_dir[r] < 0)
+        at_upper[q] = False
+        simplex_revised._replace_basic(problem, st, r, q, alpha)
+    simplex_revised.recompute_primal(problem, st)
+    return None
@@ -0,0 +1,322 @@
+import numpy as np
+
+import simplex_core
+
+# Виды упрощений в порядке их применения на каждом проходе
+REDUCTIONS = (
+    'fixed_cols', 'empty_rows', 'singleton_rows', 'empty_cols',
+    'dominated_cols', 'duplicate_rows', 'redundant_rows',
+)
+
+
+def presolve(c, A, b, lower, upper, options=None, max_passes=20):
+    """
+    Упрощение задачи A·x <= b, lower <= x <= upper до решения. Направление
+    то же, что у симплекс-таблицы (строка E в обоих режимах ведет рост c·x),
+    поэтому упрощенная задача дает тот же ответ, что и исходная.
+
+    Проходы повторяются, пока что-то меняется:
+      fixed_cols     - переменные с lower = upper подставляются в b;
+      empty_rows     - пустые ограничения удаляются (или задача несовместна);
+      singleton_rows - ограничения с одной переменной становятся ее границей;
+      empty_cols     - переменные вне ограничений ставятся на выгодную границу;
+      dominated_cols - переменная, рост которой не улучшает ЦФ и только
+                       расходует ресурсы (или наоборот), фиксируется на границе;
+      duplicate_rows - из параллельных ограничений остается самое жесткое;
+      redundant_rows - ограничения, выполненные при любых значениях в границах,
+                       удаляются; по остальным границы переменных сужаются.
+
+    Возвращает (model, err). model - словарь: упрощенная задача ('c', 'A',
+    'b', 'lower', 'upper'), номера оставшихся строк и столбцов ('rows',
+    'cols'), значения снятых переменных ('fixed'), их вклад в c·x ('offset')
+    и отчет ('report') - списки удаленных строк и столбцов по видам
+    упрощений, число сужений границ и размеры задачи до и после.
+    """
+    opts = simplex_core.solver_options(options)
+    tol = opts['feas_tol']
+    c = np.array(c, dtype=np.float64)
+    A = np.array(A, dtype=np.float64)
+    b = np.array(b, dtype=np.float64)
+    l = np.array(lower, dtype=np.float64)
+    u = np.array(upper, dtype=np.float64)
+    m, n = A.shape
+    rows = np.ones(m, dtype=bool)
+    cols = np.ones(n, dtype=bool)
+    fixed = {}
+    report = {kind: [] for kind in REDUCTIONS}
+    report['tightened_bounds'] = 0
+    infeasible = "Задача не имеет допустимых решений"
+
+    def pattern():
+        return (A != 0) & rows[:, None] & cols[None, :]
+
+    def fix(j, value, kind):
+        fixed[j] = value
+        b[:] -= A[:, j] * value
+        cols[j] = False
+        report[kind].append(j)
+
+    for _ in range(max_passes):
+        changed = False
+
+        for j in np.flatnonzero(cols & (u - l <= tol)):
+            if u[j] < l[j] - tol:
+                return None, infeasible
+            fix(j, l[j], 'fixed_cols')
+            changed = True
+
+        nz = pattern()
+        for i in np.flatnonzero(rows & (nz.sum(axis=1) == 0)):
+            if b[i] < -tol:
+                return None, infeasible
+            rows[i] = False
+            report['empty_rows'].append(i)
+            changed = True
+
+        nz = pattern()
+        for i in np.flatnonzero(rows & (nz.sum(axis=1) == 1)):
+            j = int(np.flatnonzero(nz[i])[0])
+            bound = b[i] / A[i, j]
+            if A[i, j] > 0:
+                u[j] = min(u[j], bound)
+            else:
+                l[j] = max(l[j], bound)
+            if l[j] > u[j] + tol:
+                return None, infeasible
+            rows[i] = False
+            report['singleton_rows'].append(i)
+            changed = True
+
+        nz = pattern()
+        for j in np.flatnonzero(cols & (nz.sum(axis=0) == 0)):
+            if c[j] > 0:
+                if not np.isfinite(u[j]):
+                    return None, "Задача не ограничена (нет конечного решения)"
+                fix(j, u[j], 'empty_cols')
+            else:
+                fix(j, l[j], 'empty_cols')
+            changed = True
+
+        for j in np.flatnonzero(cols):
+            col = A[rows, j]
+            if c[j] <= 0 and (col >= 0).all():
+                fix(j, l[j], 'dominated_cols')
+                changed = True
+            elif c[j] >= 0 and (col <= 0).all() and np.isfinite(u[j]):
+                fix(j, u[j], 'dominated_cols')
+                changed = True
+
+        # Параллельные строки с положительным множителем: нормируем на первый ненулевой элемент
+        kept = {}
+        col_idx = np.flatnonzero(cols)
+        for i in np.flatnonzero(rows):
+            row = A[i, col_idx]
+            lead = np.flatnonzero(row)
+            if len(lead) < 2:
+                continue
+            scale = abs(row[lead[0]])
+            key = np.round(row / scale, 12).tobytes()
+            if key not in kept:
+                kept[key] = (i, b[i] / scale)
+                continue
+            k, rhs = kept[key]
+            drop = i
+            if b[i] / scale < rhs:
+                kept[key] = (i, b[i] / scale)
+                drop = k
+            rows[drop] = False
+            report['duplicate_rows'].append(drop)
+            changed = True
+
+        # Границы активности строк: лишние ограничения и сужение границ переменных
+        for i in np.flatnonzero(rows):
+            a = A[i, col_idx]
+            lo, hi = l[col_idx], u[col_idx]
+            with np.errstate(invalid='ignore'):
+                act_min = np.where(a > 0, a * lo, np.where(a < 0, a * hi, 0.0))
+                act_max = np.where(a > 0, a * hi, np.where(a < 0, a * lo, 0.0))
+            if act_min.sum() > b[i] + tol:
+                return None, infeasible
+            if act_max.sum() <= b[i] + tol:
+                rows[i] = False
+                report['redundant_rows'].append(i)
+                changed = True
+                continue
+            infinite = ~np.isfinite(act_min)
+            if infinite.sum() > 1:
+                continue
+            finite_sum = act_min[~infinite].sum()
+            for k in np.flatnonzero(a):
+                if infinite.any() and not infinite[k]:
+                    continue
+                rest = finite_sum if infinite[k] else finite_sum - act_min[k]
+                j = col_idx[k]
+                bound = (b[i] - rest) / a[k]
+                step = 1e-7 * (1.0 + abs(bound))
+                if a[k] > 0 and bound < u[j] - step:
+                    u[j] = bound
+                elif a[k] < 0 and bound > l[j] + step:
+                    l[j] = bound
+                else:
+                    continue
+                report['tightened_bounds'] += 1
+                changed = True
+
+        if not changed:
+            break
+
+    ri, ci = np.flatnonzero(rows), np.flatnonzero(cols)
+    report['rows'] = (m, len(ri))
+    report['cols'] = (n, len(ci))
+    report['nonzeros'] = (int(np.count_nonzero(A)), int(np.count_nonzero(A[np.ix_(ri, ci)])))
+    model = {
+        'c': c[ci], 'A': A[np.ix_(ri, ci)], 'b': b[ri], 'lower': l[ci], 'upper': u[ci],
+        'rows': ri, 'cols': ci, 'fixed': fixed,
+        'offset': float(sum(c[j] * v for j, v in fixed.items())),
+        'report': report,
+    }
+    return model, None
+
+
+def postsolve(model, final_z, final_vars, is_min, num_vars, A, b):
+    """
+    Переносит ответ упрощенной задачи на исходную: добавляет значения снятых
+    переменных и их вклад в ЦФ, а также ненулевые балансовые переменные
+    удаленных ограничений. A, b - исходные ограничения в виде <=.
+    """
+    final_z = final_z - model['offset'] if is_min else final_z + model['offset']
+    final_vars = dict(final_vars)
+    for j, v in sorted(model['fixed'].items()):
+        if v != 0.0:
+            final_vars[f'X{j+1}'] = float(v)
+
+    x = np.zeros(num_vars)
+    for name, v in final_vars.items():
+        j = int(name[1:]) - 1
+        if j < num_vars:
+            x[j] = v
+    slack = b - A @ x
+    removed = np.setdiff1d(np.arange(len(b)), model['rows'])
+    for i in removed:
+        if abs(slack[i]) > 1e-9:
+            final_vars[f'X{num_vars + i + 1}'] = float(slack[i])
+    return final_z, final_vars
+
+
+def summary(report):
+    """Краткий текстовый отчет о предварительном упрощении."""
+    (m0, m1), (n0, n1), (z0, z1) = report['rows'], report['cols'], report['nonzeros']
+    names = {
+        'fixed_cols': "фиксированных переменных",
+        'empty_rows': "пустых ограничений",
+        'singleton_rows': "ограничений-границ",
+        'empty_cols': "пустых столбцов",
+        'dominated_cols': "доминируемых столбцов",
+        'duplicate_rows': "дублирующих ограничений",
+        'redundant_rows': "лишних ограничений",
+    }
+    parts = [f"{names[kind]}: {len(report[kind])}" for kind in REDUCTIONS if report[kind]]
+    if report['tightened_bounds']:
+        parts.append(f"сужений границ: {report['tightened_bounds']}")
+    text = f"Строк: {m0} -> {m1}, столбцов: {n0} -> {n1}, ненулевых: {z0} -> {z1}"
+    return text + (". Удалено: " + ", ".join(parts) if parts else "")
+
+
+def _independent_columns(columns, required, m, tol=1e-9):
+    """Жадно выбирает m линейно независимых столбцов: сначала все required, затем остальные по порядку."""
+    Q = np.zeros((m, 0))
+    chosen = []
+    for k, j in enumerate(columns):
+        if len(chosen) == m:
+            break
+        v = columns[j]()
+        norm = np.linalg.norm(v)
+        if norm == 0.0:
+            if k < required:
+                return None
+            continue
+        r = v - Q @ (Q.T @ v)
+        r -= Q @ (Q.T @ r)
+        if np.linalg.norm(r) <= tol * norm:
+            if k < required:
+                return None
+            continue
+        Q = np.column_stack((Q, r / np.linalg.norm(r)))
+        chosen.append(j)
+    return chosen if len(chosen) == m else None
+
+
+def crossover(c, A, b, lower, upper, x, options=None):
+    """
+    Оптимальный базис исходной задачи по восстановленному решению x:
+    переменные строго внутри границ и балансовые переменные неактивных
+    ограничений входят в базис обязательно, базис дополняется столбцами
+    на границах, после чего прямой симплекс доводит его до оптимальности
+    (обычно за 0 итераций). Возвращает (state, err), state - как у
+    simplex_revised.finalize_state.
+    """
+    import simplex_revised
+    opts = simplex_core.solver_options(options)
+    tol = 1e-7
+    A = np.asarray(A, dtype=np.float64)
+    l = np.asarray(lower, dtype=np.float64)
+    m, n = A.shape
+    problem = simplex_revised.RevisedProblem(c, A, b - A @ l if l.any() else b)
+    ub = np.concatenate((np.asarray(upper, dtype=np.float64) - l, np.full(m, np.inf)))
+    values = np.concatenate((x - l, problem.b - A @ (x - l)))
+
+    at_lower = np.abs(values) <= tol * (1.0 + np.abs(values))
+    at_upper = np.isfinite(ub) & (np.abs(values - ub) <= tol * (1.0 + np.abs(ub))) & ~at_lower
+    interior = ~(at_lower | at_upper)
+    # Порядок: обязательные, затем балансовые на границе, затем структурные на границе
+    order = list(np.flatnonzero(interior))
+    required = len(order)
+    order += [j for j in range(n, n + m) if not interior[j]]
+    order += [j for j in range(n) if not interior[j]]
+    columns = {int(j): (lambda j=int(j): problem.column(j)) for j in order}
+    basis = _independent_columns(columns, required, m)
+    if basis is None:
+        return None, "Не удалось восстановить базис исходной задачи"
+
+    basis = np.array(basis, dtype=np.int64)
+    flags = at_upper.copy()
+    flags[basis] = False
+    st = {'basis': basis, 'ub': ub, 'at_upper': flags,
+          'factor': simplex_revised.BasisFactor(problem, basis)}
+    simplex_revised.recompute_primal(problem, st)
+    iterations, err = simplex_revised.primal_simplex(problem, st, options=opts)
+    if err:
+        return None, err
+    st = simplex_revised.finalize_state(problem, st)
+    st['iterations'] = iterations
+    return st, None
+
+
+def sensitivity(raw_matrix, operation, num_vars, final_vars, constr_signs=None, lower=None, upper=None, options=None):
+    """
+    Двойственные оценки и диапазоны устойчивости в терминах исходных
+    переменных и ограничений для ответа calculate_simplex(..., presolve=True).
+    Формат результата тот же, что у perform_sensitivity_analysis.
+    """
+    import simplex_revised
+    try:
+        c, A, b = simplex_core._split_raw_matrix(raw_matrix, constr_signs)
+        l, u, err = simplex_core._prepare_bounds(num_vars, lower, upper)
+        if err:
+            return [], [], err
+        x = np.zeros(num_vars)
+        for name, v in final_vars.items():
+            j = int(name[1:]) - 1
+            if j < num_vars:
+                x[j] = v
+        state, err = crossover(c, A, b, l, u, x, options)
+        if err:
+            return [], [], err
+        rhs = [row[0] for row in raw_matrix[1:]]
+        obj = list(raw_matrix[0][1:])
+        return simplex_revised.perform_sensitivity_from_basis(
+            state, rhs, obj, num_vars, operation == 'Максимизация', options, l
+        )
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        return [], [], ""
@@ -0,0 +1,730 @@
+import functools
+import warnings
+
+import numpy as np
+
+import simplex_core
+from simplex_sparse import CscMatrix, as_constraint_matrix
+
+
+_MAX_CONDITION = 1e12   # оценка числа обусловленности ядра, выше которой базис считается вырожденным
+_BLOCK_ELEMENTS = 1 << 20   # размер плотного блока m x k при ftran/btran по группам столбцов
+_LU_BLOCK = 64   # ширина панели плотного LU-разложения без scipy
+
+
+@functools.lru_cache(maxsize=None)
+def _sparse_lu():
+    """scipy.sparse.linalg.splu, если scipy установлен (необязательная зависимость), иначе None."""
+    try:
+        from scipy.sparse.linalg import splu
+    except ImportError:
+        return None
+    return splu
+
+
+@functools.lru_cache(maxsize=None)
+def _dense_lu():
+    """(scipy.linalg.lu_factor, scipy.linalg.lu_solve), если scipy установлен, иначе None."""
+    try:
+        from scipy.linalg import lu_factor, lu_solve
+    except ImportError:
+        return None
+    return lu_factor, lu_solve
+
+
+def _lu_factor(K):
+    """
+    LU-разложение P K = L U по блокам столбцов (частичный выбор ведущего
+    элемента): панель раскладывается по столбцам, остаток матрицы
+    обновляется одним умножением матриц. L (без единичной диагонали) и U
+    хранятся в одной матрице, perm - переставленные строки K.
+    """
+    LU = np.array(K, dtype=float)
+    n = len(LU)
+    perm = np.arange(n)
+    for start in range(0, n, _LU_BLOCK):
+        stop = min(start + _LU_BLOCK, n)
+        for k in range(start, stop):
+            p = k + int(np.argmax(np.abs(LU[k:, k])))
+            if p != k:
+                LU[[k, p]] = LU[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+            if LU[k, k] != 0.0:
+                LU[k + 1:, k] /= LU[k, k]
+            LU[k + 1:, k + 1:stop] -= np.multiply.outer(LU[k + 1:, k], LU[k, k + 1:stop])
+        if stop < n:
+            LU[start:stop, stop:] = _triangular_inverse(LU[start:stop, start:stop], lower=True) @ LU[start:stop, stop:]
+            LU[stop:, stop:] -= LU[stop:, start:stop] @ LU[start:stop, stop:]
+    return LU, perm
+
+
+def _triangular_inverse(T, lower):
+    """Обратная к диагональному блоку: нижний - с единичной диагональю (L), верхний - U."""
+    n = len(T)
+    X = np.zeros((n, n))
+    identity = np.identity(n)
+    for i in (range(n) if lower else range(n - 1, -1, -1)):
+        if lower:
+            X[i] = identity[i] - T[i, :i] @ X[:i]
+        else:
+            X[i] = (identity[i] - T[i, i + 1:] @ X[i + 1:]) / T[i, i]
+    return X
+
+
+def _forward(T, blocks, inverses, x):
+    """Прямая подстановка по блокам для нижней треугольной T (диагональные блоки - через обратные)."""
+    x = np.array(x, dtype=float)
+    for (s, e), inv in zip(blocks, inverses):
+        x[s:e] = inv @ x[s:e]
+        x[e:] -= T[e:, s:e] @ x[s:e]
+    return x
+
+
+def _backward(T, blocks, inverses, x):
+    """Обратная подстановка по блокам для верхней треугольной T."""
+    x = np.array(x, dtype=float)
+    for (s, e), inv in zip(reversed(blocks), reversed(inverses)):
+        x[s:e] = inv @ x[s:e]
+        x[:s] -= T[:s, s:e] @ x[s:e]
+    return x
+
+
+class _DenseKernel:
+    """
+    Плотное LU-разложение ядра базиса с частичным выбором ведущего элемента:
+    scipy.linalg.lu_factor (LAPACK getrf), если scipy установлен, иначе
+    блочное разложение на NumPy. ftran/btran - прямая и обратная
+    подстановки, обратная матрица не строится. Нулевой или малый
+    относительно остальных ведущий элемент U - LinAlgError.
+    """
+
+    def __init__(self, K, lapack=None):
+        self.lapack = lapack
+        if lapack is not None:
+            with warnings.catch_warnings():
+                # О нулевом ведущем элементе scipy предупреждает, вырожденность проверяется ниже
+                warnings.simplefilter('ignore')
+                self.lu = lapack[0](K, check_finite=False)
+            LU = self.lu[0]
+        else:
+            LU, self.perm = _lu_factor(K)
+        pivots = np.abs(np.diagonal(LU))
+        if not np.isfinite(LU).all() or pivots.min() == 0.0 or pivots.min() * _MAX_CONDITION < pivots.max():
+            raise np.linalg.LinAlgError("Базисная матрица вырождена")
+        if lapack is None:
+            self.LU = LU
+            self.blocks = [(s, min(s + _LU_BLOCK, len(LU))) for s in range(0, len(LU), _LU_BLOCK)]
+            self.L_inv = [_triangular_inverse(LU[s:e, s:e], lower=True) for s, e in self.blocks]
+            self.U_inv = [_triangular_inverse(LU[s:e, s:e], lower=False) for s, e in self.blocks]
+
+    def solve(self, a):
+        if self.lapack is not None:
+            return self.lapack[1](self.lu, a, check_finite=False)
+        x = _forward(self.LU, self.blocks, self.L_inv, a[self.perm])
+        return _backward(self.LU, self.blocks, self.U_inv, x)
+
+    def solve_transposed(self, c):
+        if self.lapack is not None:
+            return self.lapack[1](self.lu, c, trans=1, check_finite=False)
+        # K^T = U^T L^T P: U^T - нижняя треугольная, L^T - верхняя с единичной диагональю
+        x = _forward(self.LU.T, self.blocks, [inv.T for inv in self.U_inv], c)
+        x = _backward(self.LU.T, self.blocks, [inv.T for inv in self.L_inv], x)
+        y = np.empty_like(x)
+        y[self.perm] = x
+        return y
+
+
+class _SparseKernel:
+    """
+    Разреженное LU-разложение ядра базиса (SuperLU с упорядочением COLAMD):
+    плотная матрица ядра не строится. Нулевой или малый относительно
+    остальных ведущий элемент U - LinAlgError, как и у плотного ядра.
+    """
+
+    def __init__(self, K, splu):
+        from scipy.sparse import csc_matrix
+        try:
+            self.lu = splu(csc_matrix((K.data, K.indices, K.indptr), shape=K.shape))
+        except RuntimeError:
+            raise np.linalg.LinAlgError("Базисная матрица вырождена")
+        pivots = np.abs(self.lu.U.diagonal())
+        if not np.isfinite(pivots).all() or pivots.min() * _MAX_CONDITION < pivots.max():
+            raise np.linalg.LinAlgError("Базисная матрица вырождена")
+
+    def solve(self, a):
+        return self.lu.solve(np.ascontiguousarray(a))
+
+    def solve_transposed(self, c):
+        return self.lu.solve(np.ascontiguousarray(c), trans='T')
+
+
+def _factor_kernel(K):
+    """Разложение ядра: разреженное LU для CSC при наличии scipy, иначе плотное LU."""
+    splu = _sparse_lu()
+    if isinstance(K, CscMatrix) and splu is not None:
+        return _SparseKernel(K, splu)
+    return _DenseKernel(K.to_dense(), _dense_lu())
+
+
+class BasisFactor:
+    """
+    Факторизованный базис с неявными балансовыми столбцами.
+
+    Балансовые столбцы базиса - единичные векторы, поэтому обращается
+    только ядро A[T, K]: K - базисные структурные столбцы, T - строки,
+    чьи балансовые переменные небазисные: для CSC-матрицы - разреженным
+    LU (если установлен scipy), иначе плотным LU-разложением.
+    Замены столбцов накапливаются в файле eta-матриц (мультипликативная
+    форма), каждые refactor_every замен ядро раскладывается заново.
+    """
+
+    def __init__(self, problem, basis, refactor_every=50):
+        self.problem = problem
+        self.refactor_every = refactor_every
+        self.refactor(basis)
+
+    def refactor(self, basis):
+        n, m = self.problem.n, self.problem.m
+        is_slack = basis >= n
+        self.slack_pos = np.flatnonzero(is_slack)
+        self.slack_rows = basis[self.slack_pos] - n
+        self.struct_pos = np.flatnonzero(~is_slack)
+        struct_cols = basis[self.struct_pos]
+
+        row_is_slack = np.zeros(m, dtype=bool)
+        row_is_slack[self.slack_rows] = True
+        self.kernel_rows = np.flatnonzero(~row_is_slack)
+
+        self.A_K = self.problem.A.select_columns(struct_cols)
+        if len(struct_cols):
+            self.kernel = _factor_kernel(self.problem.A.submatrix(self.kernel_rows, struct_cols))
+        self.etas = []  # (r, alpha) - позиция замененного столбца и его ftran-образ
+
+    def needs_refactor(self):
+        return len(self.etas) >= self.refactor_every
+
+    def _base_solve(self, a):
+        x = np.empty_like(a, dtype=np.float64)
+        w = np.zeros_like(x)
+        if len(self.struct_pos):
+            x_K = self.kernel.solve(a[self.kernel_rows])
+            x[self.struct_pos] = x_K
+            w = self.A_K.matvec(x_K)
+        x[self.slack_pos] = a[self.slack_rows] - w[self.slack_rows]
+        return x
+
+    def _base_solve_transposed(self, c):
+        y = np.zeros((self.problem.m,) + c.shape[1:])
+        y[self.slack_rows] = c[self.slack_pos]
+        if len(self.struct_pos):
+            rhs = c[self.struct_pos] - self.A_K.rmatvec(y)
+            y[self.kernel_rows] = self.kernel.solve_transposed(rhs)
+        return y
+
+    def ftran(self, a):
+        """Решает B·x = a (a может быть матрицей со столбцами-правыми частями)."""
+        x = self._base_solve(np.asarray(a, dtype=np.float64))
+        for r, alpha in self.etas:
+            x_r = x[r] / alpha[r]
+            x -= np.multiply.outer(alpha, x_r) if x.ndim > 1 else alpha * x_r
+            x[r] = x_r
+        return x
+
+    def btran(self, c):
+        """Решает y·B = c, т.е. B^T·y = c (c может быть матрицей со столбцами-правыми частями)."""
+        w = np.array(c, dtype=np.float64)
+        for r, alpha in reversed(self.etas):
+            w_r = w[r].copy() if w.ndim > 1 else w[r]
+            w[r] = 0.0
+            w[r] = (w_r - alpha @ w) / alpha[r]
+        return self._base_solve_transposed(w)
+
+    def update(self, r, alpha):
+        """Замена r-го базисного столбца на столбец с ftran-образом alpha."""
+        self.etas.append((r, alpha.copy()))
+
+
+class RevisedProblem:
+    """
+    Задача max c·x, A·x <= b в виде, удобном для модифицированного симплекса.
+    A - плотная или разреженная (CSC) матрица, балансовые столбцы не хранятся.
+    """
+
+    def __init__(self, c, A, b):
+        self.c = np.asarray(c, dtype=np.float64)
+        self.A = as_constraint_matrix(A)
+        self.b = np.asarray(b, dtype=np.float64)
+        self.m, self.n = self.A.shape
+        self.cost = np.concatenate((self.c, np.zeros(self.m)))
+
+    def column(self, j):
+        if j < self.n:
+            return self.A.column(j)
+        e = np.zeros(self.m)
+        e[j - self.n] = 1.0
+        return e
+
+    def reduced_costs(self, y):
+        """d_j = c_j - y·a_j для всех столбцов, включая балансовые."""
+        return np.concatenate((self.c - self.A.rmatvec(y), -y))
+
+    def reduced_costs_range(self, y, start, stop):
+        """d_j для столбцов start..stop-1 (частичный выбор не считает остальные)."""
+        n = self.n
+        parts = []
+        if start < n:
+            hi = min(stop, n)
+            parts.append(self.c[start:hi] - self.A.rmatvec_range(y, start, hi))
+        if stop > n:
+            parts.append(-y[max(start, n) - n:stop - n])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def tableau_row(self, rho):
+        """Строка B^-1·[A I] по строке rho обратной матрицы базиса (для матрицы rho - по столбцам)."""
+        return np.concatenate((self.A.rmatvec(rho), rho))
+
+
+def _snapshot_array(problem, st, d, is_min):
+    """
+    Восстанавливает полную симплекс-таблицу текущего базиса для истории решения.
+    Как в табличном методе, столбец небазисной переменной на верхней границе
+    хранится для u - x (со сменой знака), в значение ЦФ входит c·u таких переменных.
+    """
+    m = problem.m
+    factor, basis, x_B = st['factor'], st['basis'], st['x_B']
+    T = np.empty((m + 1, problem.n + m + 1))
+    T[1:, :problem.n] = factor.ftran(problem.A.to_dense())
+    T[1:, problem.n:-1] = factor.ftran(np.identity(m))
+    T[1:, -1] = x_B
+    at_upper = st['at_upper']
+    z = problem.cost[basis] @ x_B + problem.cost[at_upper] @ st['ub'][at_upper]
+    # Z-строка в том же виде, что и в табличном методе
+    if is_min:
+        T[0, :-1] = d
+        T[0, -1] = -z
+    else:
+        T[0, :-1] = -d
+        T[0, -1] = z
+    T[0, basis] = 0.0
+    T[:, np.flatnonzero(at_upper)] *= -1
+    return T
+
+
+def initial_state(problem, upper=None, refactor_every=50):
+    """Стартовое состояние: базис из балансовых переменных, все X на нижней границе."""
+    m, n = problem.m, problem.n
+    basis = np.arange(n, n + m)
+    ub = np.full(n + m, np.inf)
+    if upper is not None:
+        ub[:n] = upper
+    return {
+        'basis': basis,
+        'factor': BasisFactor(problem, basis, refactor_every),
+        'x_B': problem.b.copy(),
+        'ub': ub,
+        'at_upper': np.zeros(n + m, dtype=bool),
+    }
+
+
+def _effective_rhs(problem, ub, at_upper):
+    """b - сумма a_j·u_j по небазисным переменным на верхней границе."""
+    b = problem.b
+    upper_struct = at_upper[:problem.n]
+    if upper_struct.any():
+        b = b - problem.A.matvec(np.where(upper_struct, ub[:problem.n], 0.0))
+    return b
+
+
+def recompute_primal(problem, st):
+    """Пересчитывает x_B по текущему разложению (после изменения b или границ)."""
+    st['x_B'] = st['factor'].ftran(_effective_rhs(problem, st['ub'], st['at_upper']))
+
+
+def reduced_costs(problem, st):
+    """Двойственные оценки y и оценки d (нулевые для базисных столбцов)."""
+    y = st['factor'].btran(problem.cost[st['basis']])
+    d = problem.reduced_costs(y)
+    d[st['basis']] = 0.0
+    return y, d
+
+
+def _column_blocks(count, m):
+    """Границы групп столбцов, для которых плотный блок m x k не больше _BLOCK_ELEMENTS."""
+    step = max(1, _BLOCK_ELEMENTS // max(m, 1))
+    return [(start, min(start + step, count)) for start in range(0, count, step)]
+
+
+def _unit_columns(m, rows):
+    """Столбцы единичной матрицы порядка m с номерами rows."""
+    E = np.zeros((m, len(rows)))
+    E[rows, np.arange(len(rows))] = 1.0
+    return E
+
+
+def _column_norms_sq(problem, st):
+    """
+    ||B^-1·a_j||^2 для всех столбцов (нужны правилу наискорейшего спуска).
+    ftran выполняется группами столбцов: вся матрица A плотной не строится.
+    """
+    n, m = problem.n, problem.m
+    if (st['basis'] >= n).all():
+        # Базис из балансовых переменных: B = I
+        return np.concatenate((problem.A.col_norms_sq(), np.ones(m)))
+    factor = st['factor']
+    norms = np.empty(n + m)
+    for start, stop in _column_blocks(n, m):
+        block = problem.A.select_columns(np.arange(start, stop)).to_dense()
+        norms[start:stop] = (factor.ftran(block) ** 2).sum(axis=0)
+    for start, stop in _column_blocks(m, m):
+        norms[n + start:n + stop] = (factor.ftran(_unit_columns(m, np.arange(start, stop))) ** 2).sum(axis=0)
+    return norms
+
+
+def _replace_basic(problem, st, r, q, alpha):
+    """Заносит столбец q в базис на позицию r и обновляет разложение."""
+    st['basis'][r] = q
+    st['factor'].update(r, alpha)
+    if st['factor'].needs_refactor():
+        st['factor'].refactor(st['basis'])
+        recompute_primal(problem, st)
+
+
+def _perturb_rhs(problem, st, opts, rng):
+    """Сдвигает x_B на случайное delta > 0, заменяя b на b + B·delta (переживает рефакторизацию)."""
+    basis = st['basis']
+    ub_B = st['ub'][basis]
+    delta = simplex_core._perturbation(st['x_B'], ub_B if np.isfinite(ub_B).any() else None, opts, rng)
+    shift = np.zeros(problem.n + problem.m)
+    shift[basis] = delta
+    problem.b = problem.b + problem.A.matvec(shift[:problem.n]) + shift[problem.n:]
+    st['x_B'] += delta
+
+
+def primal_simplex(problem, st, max_iter=None, var_names=None, on_step=None, pricing=None, options=None):
+    """
+    Прямой модифицированный симплекс от допустимого базиса st.
+    on_step(step, ratios) вызывается перед каждым поворотом и в точке оптимума.
+    pricing - правило выбора входящей переменной (simplex_core.make_pricing),
+    options - допуски, тест отношений и борьба с вырожденностью (simplex_core.DEFAULT_OPTIONS).
+    Счетчики вырожденных поворотов записываются в st. Возвращает (iterations, err).
+    """
+    steps = _primal_steps(problem, st, max_iter, var_names, pricing, options, on_step is not None)
+    while True:
+        try:
+            step, ratios = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        on_step(step, ratios)
+
+
+def _primal_steps(problem, st, max_iter, var_names, pricing, options, record):
+    """
+    Генератор прямого симплекса (см. primal_simplex): при record=True
+    выдает (step, ratios) перед каждым поворотом и в точке оптимума,
+    (iterations, err) возвращается через StopIteration.
+    """
+    opts = simplex_core.solver_options(options)
+    m = problem.m
+    num_cols = problem.n + m
+    max_iter = simplex_core.iteration_limit(opts, m, problem.n, max_iter)
+    ub, at_upper = st['ub'], st['at_upper']
+    bounded = bool(np.isfinite(ub).any())
+    rule = simplex_core.make_pricing(pricing)
+    rule.tol = opts['opt_tol']
+    rule.start(num_cols, _column_norms_sq(problem, st) if rule.uses_norms else None)
+    bland_rule = simplex_core.BlandPricing()
+    bland_rule.tol = opts['opt_tol']
+    monitor = simplex_core.StallMonitor(opts)
+    rng = np.random.default_rng(0)
+    original_b = problem.b
+    is_basic = np.zeros(num_cols, dtype=bool)
+    counter = 0
+    err = None
+    optimal = False
+
+    while counter < max_iter:
+        basis, x_B = st['basis'], st['x_B']
+        y = st['factor'].btran(problem.cost[basis])
+        is_basic[:] = False
+        is_basic[basis] = True
+
+        def price(a, b):
+            d = problem.reduced_costs_range(y, a, b)
+            d[is_basic[a:b]] = 0.0
+            # Для переменной на верхней границе выгодно уменьшение, т.е. d_j < 0
+            return np.where(at_upper[a:b], -d, d) if bounded else d
+
+        pivot_col = (bland_rule if monitor.bland else rule).select(price, num_cols) if num_cols else None
+        if pivot_col is None:
+            if monitor.perturbed:
+                # Снимаем возмущение и восстанавливаем допустимость двойственным симплексом
+                problem.b = original_b
+                monitor.perturbed = False
+                recompute_primal(problem, st)
+                k, err = dual_simplex(problem, st, max_iter - counter, opts)
+                counter += k
+                if err:
+                    break
+                rule.start(num_cols, _column_norms_sq(problem, st) if rule.uses_norms else None)
+                continue
+            if record:
+                yield {'pivot_col': None, 'pivot_row': None, 'ratios': []}, None
+            optimal = True
+            break
+
+        direction = -1.0 if at_upper[pivot_col] else 1.0
+        alpha = st['factor'].ftran(problem.column(pivot_col))
+        alpha_eff = alpha * direction if bounded else alpha
+
+        ratios, r, limit = simplex_core._ratio_test(
+            x_B, alpha_eff, ub[basis] if bounded else None,
+            monitor.bland_opts if monitor.bland else opts, basis
+        )
+
+        if ub[pivot_col] < np.inf and ub[pivot_col] <= limit:
+            # Смена границы входящей переменной без смены базиса
+            if record:
+                yield {
+                    'pivot_col': pivot_col,
+                    'pivot_row': None,
+                    'entering': var_names[pivot_col],
+                    'leaving': var_names[pivot_col],
+                    'bound_flip': True,
+                    'theta': float(ub[pivot_col])
+                }, ratios
+            x_B -= ub[pivot_col] * alpha_eff
+            at_upper[pivot_col] = not at_upper[pivot_col]
+            monitor.step(ub[pivot_col])
+            counter += 1
+            continue
+
+        if r < 0:
+            err = "Задача не ограничена (нет конечного решения)"
+            break
+
+        leaving = basis[r]
+        if record:
+            yield {
+                'pivot_col': pivot_col,
+                'pivot_row': r + 1,
+                'entering': var_names[pivot_col],
+                'leaving': var_names[leaving],
+                'theta': float(ratios[r])
+            }, ratios
+
+        def pivot_row():
+            e = np.zeros(m)
+            e[r] = 1.0
+            return problem.tableau_row(st['factor'].btran(e))
+
+        # Веса обновляются по старому базису, до замены столбца
+        rule.update(pivot_col, leaving, alpha[r], pivot_row,
+                    lambda: problem.tableau_row(st['factor'].btran(alpha)))
+        theta = ratios[r]
+        if opts['ratio_test'] == 'harris':
+            # Отношение может быть слегка отрицательным в пределах feas_tol - шаг назад не делается
+            theta = max(theta, 0.0)
+        x_B -= theta * alpha_eff
+        x_B[r] = theta if direction > 0 else ub[pivot_col] - theta
+        at_upper[leaving] = bounded and alpha_eff[r] < 0
+        at_upper[pivot_col] = False
+        _replace_basic(problem, st, r, pivot_col, alpha)
+        counter += 1
+
+        if monitor.step(theta):
+            _perturb_rhs(problem, st, opts, rng)
+
+    if not optimal and err is None:
+        err = f"Превышено число итераций ({max_iter})"
+
+    if monitor.perturbed:
+        problem.b = original_b
+        recompute_primal(problem, st)
+    st.update(monitor.report())
+    return counter, err
+
+
+def dual_simplex(problem, st, max_iter=None, options=None):
+    """
+    Двойственный модифицированный симплекс от двойственно допустимого базиса
+    (все оценки d_j неположительны с учетом границ), восстанавливающий
+    допустимость x_B. При options['ratio_test'] == 'harris' двойственный
+    тест отношений тоже двухпроходный. Возвращает (iterations, err).
+    """
+    opts = simplex_core.solver_options(options)
+    max_iter = simplex_core.iteration_limit(opts, problem.m, problem.n, max_iter)
+    tol = opts['pivot_tol']
+    ub, at_upper = st['ub'], st['at_upper']
+    counter = 0
+
+    while counter < max_iter:
+        basis, x_B = st['basis'], st['x_B']
+        ub_B = ub[basis]
+        below = -x_B
+        above = np.where(np.isfinite(ub_B), x_B - ub_B, -np.inf)
+        violation = np.maximum(below, above)
+        r = int(np.argmax(violation))
+        if violation[r] <= opts['feas_tol']:
+            return counter, None
+        to_upper = above[r] > below[r]
+
+        _, d = reduced_costs(problem, st)
+        e = np.zeros(problem.m)
+        e[r] = 1.0
+        alpha_r = problem.tableau_row(st['factor'].btran(e))
+        sigma = np.where(at_upper, -1.0, 1.0)
+        s_alpha = sigma * alpha_r
+        s_alpha[basis] = 0.0
+        # Уходящая вниз переменная растет за счет столбцов с sigma·alpha < 0, уходящая вверх - наоборот
+        eligible = s_alpha > tol if to_upper else s_alpha < -tol
+        if not eligible.any():
+            return counter, "Задача не имеет допустимых решений"
+
+        ratios = np.full(len(d), np.inf)
+        np.divide(np.abs(d), np.abs(alpha_r), out=ratios, where=eligible)
+        if opts['ratio_test'] == 'harris':
+            relaxed = np.full(len(d), np.inf)
+            np.divide(np.abs(d) + opts['opt_tol'], np.abs(alpha_r), out=relaxed, where=eligible)
+            q = int(np.argmax(np.where(ratios <= relaxed.min(), np.abs(alpha_r), -1.0)))
+        else:
+            q = int(np.argmin(ratios))
+
+        alpha_q = st['factor'].ftran(problem.column(q))
+        target = ub_B[r] if to_upper else 0.0
+        delta = (x_B[r] - target) / alpha_q[r]
+        x_q = (ub[q] if at_upper[q] else 0.0) + delta
+        x_B -= delta * alpha_q
+        x_B[r] = x_q
+
+        leaving = basis[r]
+        at_upper[leaving] = bool(to_upper)
+        at_upper[q] = False
+        _replace_basic(problem, st, r, q, alpha_q)
+        counter += 1
+
+    return counter, f"Превышено число итераций ({max_iter})"
+
+
+def phase_one(problem, st, max_iter=None, options=None):
+    """
+    Первая фаза для недопустимого стартового базиса (x_B < 0 из-за
+    ограничений >= или сдвига на нижние границы): двойственный симплекс
+    для задачи с нулевой ЦФ, где любой базис двойственно допустим. При
+    нулевых оценках тест Харриса выбирает наибольший ведущий элемент.
+    Возвращает (iterations, err); err - если допустимых решений нет.
+    """
+    cost, c = problem.cost, problem.c
+    problem.cost, problem.c = np.zeros_like(cost), np.zeros_like(c)
+    try:
+        return dual_simplex(problem, st, max_iter, dict(simplex_core.solver_options(options), ratio_test='harris'))
+    finally:
+        problem.cost, problem.c = cost, c
+
+
+def finalize_state(problem, st):
+    """Дополняет состояние оценками, значениями всех переменных и значением ЦФ (в смысле max c·x)."""
+    y, d = reduced_costs(problem, st)
+    values = np.where(st['at_upper'], st['ub'], 0.0)
+    values[st['basis']] = st['x_B']
+    st.update({'problem': problem, 'y': y, 'd': d, 'values': values, 'z': float(problem.cost @ values)})
+    return st
+
+
+def revised_engine(c, A, b, is_min, var_names, max_iter=None, refactor_every=50, record_tables=True, upper=None, pricing=None, options=None, history='full'):
+    """
+    Модифицированный симплекс-метод. На каждой итерации вычисляются только
+    двойственные оценки (btran) и ведущий столбец (ftran), таблица целиком
+    не пересчитывается. Правила выбора (pricing) те же, что у табличного метода.
+    upper - верхние границы X1..Xn: небазисная переменная может стоять
+    на нижней (0) или верхней границе.
+    history - режим истории (simplex_history.RevisedHistory); при
+    record_tables=False в историю пишутся только сведения о поворотах.
+    Возвращает (history_steps, state, err); state - финальный базис и его разложение.
+    """
+    return simplex_core._drain(revised_steps(c, A, b, is_min, var_names, max_iter, refactor_every, record_tables, upper, pricing, options, history))
+
+
+def revised_steps(c, A, b, is_min, var_names, max_iter=None, refactor_every=50, record_tables=True, upper=None, pricing=None, options=None, history='full'):
+    """
+    Генератор модифицированного метода (см. revised_engine): после каждой
+    записи истории выдает history_steps, результат (history_steps, state, err)
+    возвращается через StopIteration.
+    """
+    import simplex_history
+    import simplex_storage
+    problem = RevisedProblem(c, A, b)
+    st = initial_state(problem, upper, refactor_every)
+    # Снимки таблиц в режиме 'full' - в оперативной памяти или на диске (options['storage'])
+    storage = simplex_storage.make_storage(simplex_core.solver_options(options))
+    history_steps = simplex_history.RevisedHistory(history, problem, var_names, is_min, st['ub'], record_tables, storage)
+
+    start_iterations = 0
+    if (st['x_B'] < -simplex_core.solver_options(options)['feas_tol']).any():
+        start_iterations, err = phase_one(problem, st, max_iter, options)
+        if err:
+            return None, None, err
+    steps = _primal_steps(problem, st, max_iter, var_names, pricing, options, True)
+    while True:
+        try:
+            step, ratios = next(steps)
+        except StopIteration as stop:
+            iterations, err = stop.value
+            break
+        history_steps.record(step, st, ratios)
+        yield history_steps
+    if err:
+        return None, None, err
+    state = finalize_state(problem, st)
+    state['iterations'] = start_iterations + iterations
+    return history_steps, state, None
+
+
+def perform_sensitivity_from_basis(state, original_rhs, original_obj_coeffs, num_dec_vars, is_max, options=None, lower=None):
+    """
+    Анализ чувствительности по факторизованному базису (без построения
+    таблицы и без densify матрицы A): столбцы B^-1 - ftran, строки таблицы
+    для базисных X - btran, и то и другое блоками (simplex_core.sensitivity_arrays).
+    lower - нижние границы X1..Xn, на которые сдвинута задача движка.
+    Формат результата тот же, что у simplex_core.perform_sensitivity_analysis.
+    """
+    ranges = sensitivity_from_basis(state, num_dec_vars, is_max, options, lower)
+    var_analysis, constr_analysis = simplex_core.sensitivity_reports(ranges, original_rhs, original_obj_coeffs)
+    return var_analysis, constr_analysis, ""
+
+
+def sensitivity_from_basis(state, num_dec_vars, is_max, options=None, lower=None):
+    """
+    Массивы анализа чувствительности (simplex_core.sensitivity_arrays) по
+    финальному состоянию движка. Переменные на верхней границе передаются
+    как замененные на u - x (столбцы и оценки со сменой знака), границы
+    в единицах пользователя - lower и state['ub'] + lower.
+    """
+    problem, factor, basis = state['problem'], state['factor'], state['basis']
+    n, m = num_dec_vars, problem.m
+    at_upper = state.get('at_upper', np.zeros(problem.n + problem.m, dtype=bool))
+    sign = np.where(at_upper, -1.0, 1.0)
+    z_row = sign * (-state['d'] if is_max else state['d'])
+    l = np.zeros(n) if lower is None else np.asarray(lower, dtype=np.float64)
+    upper = state['ub'][:n] + l if 'ub' in state else None
+
+    # Позиция в базисе балансовой переменной каждой строки (-1 - небазисная)
+    slack_pos = np.full(m, -1)
+    is_slack = basis >= problem.n
+    slack_pos[basis[is_slack] - problem.n] = np.flatnonzero(is_slack)
+
+    def binv_columns(cols):
+        # Для базисной балансовой переменной B^-1·e_i - единичный вектор ее позиции, ftran не нужен
+        block = np.zeros((m, len(cols)))
+        basic = slack_pos[cols] >= 0
+        block[slack_pos[cols[basic]], np.flatnonzero(basic)] = 1.0
+        other = np.flatnonzero(~basic)
+        if len(other):
+            block[:, other] = factor.ftran(_unit_columns(m, cols[other]))
+        return block
+
+    def basic_rows(rows):
+        return problem.tableau_row(factor.btran(_unit_columns(m, rows))).T * sign
+
+    return simplex_core.sensitivity_arrays(
+        z_row, binv_columns, state['x_B'], basis, basic_rows, n, is_max, options, l, upper, at_upper
+    )
@@ -0,0 +1,169 @@
+import numpy as np
+
+
+def _pow2(x):
+    """Ближайшая степень двойки: умножение на нее не вносит ошибок округления."""
+    return np.exp2(np.round(np.log2(x)))
+
+
+def _spread(A):
+    """max|a_ij| / min|a_ij| по ненулевым элементам (1 для пустой матрицы)."""
+    nz = np.abs(A[A != 0])
+    return float(nz.max() / nz.min()) if nz.size else 1.0
+
+
+def _geometric_factors(M, axis):
+    """1 / sqrt(max·min) модулей ненулевых элементов по строкам (axis=1) или столбцам (axis=0)."""
+    nz = M != 0
+    big = np.where(nz, M, 0.0).max(axis=axis)
+    small = np.where(nz, M, np.inf).min(axis=axis)
+    f = np.ones(M.shape[1 - axis])
+    has = np.isfinite(small)
+    f[has] = 1.0 / np.sqrt(big[has] * small[has])
+    return f
+
+
+def scale_problem(c, A, b, lower, upper, passes=20, improvement=0.9):
+    """
+    Масштабирование задачи A·x <= b, lower <= x <= upper перед решением:
+    итерационное среднегеометрическое масштабирование строк и столбцов
+    (пока разброс коэффициентов уменьшается хотя бы в 1/improvement раз),
+    затем выравнивание - наибольший модуль в каждой строке, а затем в каждом
+    столбце становится 1. Множители округляются до степеней двойки.
+
+    Масштабированная задача: A' = R·A·S, b' = R·b, c' = S·c,
+    x = S·x', балансовые переменные s = s' / R. Строка ЦФ не нормируется:
+    оценка d'_j = d_j·sigma_j (sigma - множитель переменной, см. _sigma),
+    поэтому допуск оптимальности умножается на 'tol' = min(1, min sigma),
+    иначе малые в масштабе, но существенные в единицах пользователя
+    оценки принимаются за нулевые и решение останавливается в неоптимальной
+    вершине.
+    Возвращает словарь: 'c', 'A', 'b', 'lower', 'upper' (масштабированные),
+    'row', 'col' (множители), 'tol' - множитель допуска оптимальности,
+    'spread' - разброс коэффициентов до и после.
+    """
+    A = np.asarray(A, dtype=np.float64)
+    m, n = A.shape
+    M = np.abs(A)
+    row, col = np.ones(m), np.ones(n)
+    spread = _spread(A)
+
+    for _ in range(passes):
+        r = _geometric_factors(M * col, axis=1)
+        s = _geometric_factors(M * r[:, None] * col, axis=0)
+        new_row, new_col = row * r, col * s
+        new_spread = _spread(M * new_row[:, None] * new_col)
+        if new_spread > improvement * spread:
+            break
+        row, col, spread = new_row, new_col, new_spread
+
+    # Выравнивание: сначала строки, затем столбцы
+    S = M * row[:, None] * col
+    big = S.max(axis=1) if n else np.zeros(m)
+    row = np.where(big > 0, row / np.where(big > 0, big, 1.0), row)
+    S = M * row[:, None] * col
+    big = S.max(axis=0) if m else np.zeros(n)
+    col = np.where(big > 0, col / np.where(big > 0, big, 1.0), col)
+
+    row, col = _pow2(row), _pow2(col)
+    A_scaled = A * row[:, None] * col
+    sigma = np.concatenate((col, 1.0 / row))
+    return {
+        'c': np.asarray(c, dtype=np.float64) * col,
+        'A': A_scaled,
+        'b': np.asarray(b, dtype=np.float64) * row,
+        'lower': np.asarray(lower, dtype=np.float64) / col,
+        'upper': np.asarray(upper, dtype=np.float64) / col,
+        'row': row, 'col': col,
+        'tol': float(min(1.0, sigma.min())) if sigma.size else 1.0,
+        'spread': (_spread(A), _spread(A_scaled)),
+    }
+
+
+def _sigma(scaling):
+    """Множители перехода от масштабированных переменных к исходным: X = col·X', s = s' / row."""
+    return np.concatenate((scaling['col'], 1.0 / scaling['row']))
+
+
+def unscale_table(table, scaling, var_names):
+    """
+    Таблица масштабированной задачи в исходных единицах (пересчитываются
+    сами коэффициенты, базис тот же): строка переменной v умножается на
+    ее множитель, столбец переменной w делится на множитель w (строка E
+    ЦФ не масштабировалась). Поэтому анализ чувствительности по такой таблице
+    сразу дает значения в единицах пользователя.
+    """
+    sigma = _sigma(scaling)
+    position = {name: j for j, name in enumerate(var_names)}
+    divisor = np.append(sigma, 1.0)
+    result = {}
+    for key, row in table.items():
+        factor = 1.0 if key == 'E' else sigma[position[key]]
+        result[key] = (np.asarray(row) * factor / divisor).tolist()
+    return result
+
+
+def unscale_result(scaling, final_z, final_vars, var_names):
+    """final_z и final_vars масштабированной задачи в исходных единицах."""
+    sigma = _sigma(scaling)
+    position = {name: j for j, name in enumerate(var_names)}
+    return final_z, {name: float(v * sigma[position[name]]) for name, v in final_vars.items()}
+
+
+class ScaledHistory:
+    """История решения масштабированной задачи, записи которой выдаются в исходных единицах."""
+
+    def __init__(self, history, scaling, var_names):
+        self.history = history
+        self.scaling = scaling
+        self.var_names = var_names
+        self.sigma = _sigma(scaling)
+
+    def __len__(self):
+        return len(self.history)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._unscale(step) for step in self.history[i]]
+        return self._unscale(self.history[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def current(self):
+        return self._unscale(self.history.current())
+
+    def __getattr__(self, name):
+        # steps, mode, nbytes и т.п. - как у исходной истории
+        return getattr(self.history, name)
+
+    def _unscale(self, step):
+        if 'table' in step:
+            step['table'] = unscale_table(step['table'], self.scaling, self.var_names)
+        col = step['pivot_col']
+        # Отношение - шаг входящей переменной, он измеряется в ее единицах
+        if col is not None and step.get('ratios'):
+            step['ratios'] = (np.asarray(step['ratios']) * self.sigma[col]).tolist()
+        if 'theta' in step:
+            step['theta'] = step['theta'] * self.sigma[col]
+        return step
+
+
+def compare_iterations(raw_matrix, operation, num_vars, **kwargs):
+    """
+    Решает задачу без масштабирования и с ним и возвращает словарь
+    {'unscaled': (iterations, final_z, err), 'scaled': (...), 'spread': (до, после)}
+    для проверки выигрыша на конкретной модели.
+    """
+    import simplex_core
+    result = {}
+    for key, scaling in (('unscaled', False), ('scaled', True)):
+        stats = {}
+        final_z, _, _, err, _ = simplex_core.calculate_simplex(
+            raw_matrix, operation, num_vars, stats=stats, scaling=scaling, history='none', **kwargs
+        )
+        result[key] = (stats.get('iterations'), final_z, err)
+        if scaling and 'scaling' in stats:
+            result['spread'] = stats['scaling']['spread']
+    return result
@@ -0,0 +1,385 @@
+import numpy as np
+
+import simplex_core
+import simplex_revised
+
+
+class SimplexSession:
+    """
+    Сеанс повторной оптимизации одной задачи.
+
+    Хранит оптимальный базис и его LU-разложение между вызовами и принимает
+    изменения: правые части, коэффициенты ЦФ, добавление и удаление
+    ограничений и переменных. reoptimize() продолжает с прежнего базиса:
+    после изменения b или строк базис остается двойственно допустимым и
+    дорешивается двойственным симплексом, после изменения c или столбцов -
+    прямым. Если базис потерял оба вида допустимости, задача решается заново.
+
+    Изменение одной правой части или одного коэффициента ЦФ в пределах
+    допустимого диапазона (как в анализе чувствительности) базис не меняет:
+    set_rhs и set_cost сразу пересчитывают x_B линейно, а reoptimize()
+    возвращает решение без проверки оптимальности и поворотов.
+    """
+
+    def __init__(self, raw_matrix, operation, num_vars, constr_signs=None, lower=None, upper=None, max_iter=None, options=None):
+        self.c, self.A, self.b = simplex_core._split_raw_matrix(raw_matrix, constr_signs)
+        num_constrs = self.A.shape[0]
+        # Знак строки: ограничения >= хранятся умноженными на -1
+        self.row_signs = np.ones(num_constrs)
+        if constr_signs:
+            self.row_signs[[i for i, sign in enumerate(constr_signs) if sign == u"\u2265"]] = -1.0
+
+        self.lower, self.upper, self.error = simplex_core._prepare_bounds(num_vars, lower, upper)
+        self.is_min = (operation == 'Минимизация')
+        self.max_iter = max_iter
+        try:
+            self.options = simplex_core.solver_options(options)
+        except ValueError as e:
+            self.options, self.error = simplex_core.solver_options(), self.error or str(e)
+
+        self.state = None
+        self._changed_rhs = False
+        self._changed_cost = False
+        self._changed_structure = False
+
+        self._optimal = False         # текущий базис оптимален, изменений после reoptimize() нет
+        self._ranges = {}             # ('rhs', i) / ('cost', j) -> допустимый диапазон при текущем базисе
+
+        self.last_method = None       # 'cold', 'primal', 'dual', 'none' или 'range'
+        self.last_iterations = 0
+        self.total_iterations = 0
+
+    # --- Изменения задачи ---
+    def set_operation(self, operation):
+        # Направление оптимизации влияет только на знак итогового E (как в calculate_simplex)
+        self.is_min = (operation == 'Минимизация')
+
+    def set_rhs(self, i, value):
+        """Новая правая часть ограничения i. Возвращает True, если базис остался оптимальным."""
+        value = self.row_signs[i] * value
+        if self._fast_ready():
+            low, high, col = self._rhs_range(i)
+            if low <= value <= high:
+                delta = value - self.b[i]
+                self.b[i] = value
+                if self.problem.b is not self.b:
+                    self.problem.b[i] += delta
+                self.state['x_B'] += delta * col
+                # Диапазоны других b зависят от x_B, диапазоны c - нет
+                self._ranges = {k: v for k, v in self._ranges.items() if k[0] == 'cost' or k == ('rhs', i)}
+                return True
+        self.b[i] = value
+        self._changed_rhs = True
+        return False
+
+    def set_cost(self, j, value):
+        """Новый коэффициент ЦФ при X(j+1). Возвращает True, если базис остался оптимальным."""
+        if self._fast_ready():
+            low, high = self._cost_range(j)
+            if low <= value <= high:
+                self.c[j] = value
+                if self.problem.c is not self.c:
+                    self.problem.c[j] = value
+                self.problem.cost[j] = value
+                self._ranges = {k: v for k, v in self._ranges.items() if k[0] == 'rhs' or k == ('cost', j)}
+                return True
+        self.c[j] = value
+        self._changed_cost = True
+        return False
+
+    def set_rhs_vector(self, values):
+        """
+        Новые правые части всех ограничений (в записи пользователя): x_B
+        пересчитывается один раз по текущему разложению, без поворотов.
+        Базис сохраняется, его оптимальность проверит reoptimize().
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != self.b.shape:
+            raise ValueError("Размер вектора правых частей не совпадает с числом ограничений")
+        self.b = self.row_signs * values
+        self._changed_rhs = True
+        self._apply_changes()
+
+    def set_cost_vector(self, values):
+        """Новые коэффициенты ЦФ при всех переменных (как set_rhs_vector для правых частей)."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != self.c.shape:
+            raise ValueError("Размер вектора коэффициентов ЦФ не совпадает с числом переменных")
+        self.c = values.copy()
+        self._changed_cost = True
+        self._apply_changes()
+
+    def _apply_changes(self):
+        if self.state is not None:
+            self._sync()
+        self._optimal = False
+
+    def rhs_range(self, i):
+        """Допустимый диапазон правой части i (в записи пользователя), при котором базис не меняется."""
+        if not self._fast_ready():
+            return None
+        low, high, _ = self._rhs_range(i)
+        return (low, high) if self.row_signs[i] > 0 else (-high, -low)
+
+    def cost_range(self, j):
+        """Допустимый диапазон коэффициента ЦФ при X(j+1), при котором базис не меняется."""
+        if not self._fast_ready():
+            return None
+        return self._cost_range(j)
+
+    def add_constraint(self, coeffs, rhs, sign=u"\u2264"):
+        """Добавляет ограничение; его балансовая переменная сразу входит в базис."""
+        s = -1.0 if sign == u"\u2265" else 1.0
+        n, m = self.A.shape[1], self.A.shape[0]
+        self.A = np.vstack((self.A, s * np.asarray(coeffs, dtype=np.float64)))
+        self.b = np.append(self.b, s * rhs)
+        self.row_signs = np.append(self.row_signs, s)
+        if self.state is not None:
+            st = self.state
+            st['basis'] = np.append(st['basis'], n + m)
+            st['at_upper'] = np.append(st['at_upper'], False)
+            st['ub'] = np.append(st['ub'], np.inf)
+        self._changed_structure = True
+
+    def remove_constraint(self, i):
+        """Удаляет ограничение i; если его балансовая переменная небазисная, она сначала вводится в базис."""
+        n = self.A.shape[1]
+        if self.state is not None:
+            self._sync()
+            st = self.state
+            slack = n + i
+            if slack not in st['basis']:
+                e = np.zeros(self.A.shape[0])
+                e[i] = 1.0
+                alpha = st['factor'].ftran(e)
+                r = int(np.argmax(np.abs(alpha)))
+                st['at_upper'][st['basis'][r]] = False
+                st['basis'][r] = slack
+            keep = st['basis'] != slack
+            basis = st['basis'][keep]
+            st['basis'] = np.where(basis > slack, basis - 1, basis)
+            st['at_upper'] = np.delete(st['at_upper'], slack)
+            st['ub'] = np.delete(st['ub'], slack)
+        self.A = np.delete(self.A, i, axis=0)
+        self.b = np.delete(self.b, i)
+        self.row_signs = np.delete(self.row_signs, i)
+        self._changed_structure = True
+
+    def add_variable(self, obj_coeff, column, lower=0.0, upper=np.inf):
+        """Добавляет переменную; она входит в задачу небазисной на нижней границе."""
+        n = self.A.shape[1]
+        column = self.row_signs * np.asarray(column, dtype=np.float64)
+        self.A = np.column_stack((self.A, column))
+        self.c = np.append(self.c, obj_coeff)
+        self.lower = np.append(self.lower, lower)
+        self.upper = np.append(self.upper, upper)
+        if self.state is not None:
+            st = self.state
+            st['basis'] = np.where(st['basis'] >= n, st['basis'] + 1, st['basis'])
+            st['at_upper'] = np.insert(st['at_upper'], n, False)
+            st['ub'] = np.insert(st['ub'], n, upper - lower)
+        self._changed_structure = True
+
+    def remove_variable(self, j):
+        """Удаляет переменную j; базисная переменная сначала заменяется балансовой."""
+        n = self.A.shape[1]
+        if self.state is not None:
+            self._sync()
+            st = self.state
+            pos = np.flatnonzero(st['basis'] == j)
+            if len(pos):
+                r = int(pos[0])
+                e = np.zeros(self.A.shape[0])
+                e[r] = 1.0
+                rho = st['factor'].btran(e)
+                # У базисных балансовых переменных rho_i = 0, поэтому выбирается небазисная
+                st['basis'][r] = n + int(np.argmax(np.abs(rho)))
+            st['basis'] = np.where(st['basis'] > j, st['basis'] - 1, st['basis'])
+            st['at_upper'] = np.delete(st['at_upper'], j)
+            st['ub'] = np.delete(st['ub'], j)
+        self.A = np.delete(self.A, j, axis=1)
+        self.c = np.delete(self.c, j)
+        self.lower = np.delete(self.lower, j)
+        self.upper = np.delete(self.upper, j)
+        self._changed_structure = True
+
+    def warm_start(self, basis, at_upper=None):
+        """
+        Начальный базис (например, от задачи той же структуры с другими
+        числами): reoptimize() продолжит с него прямым или двойственным
+        симплексом. Возвращает False, если базис не подходит (неверный
+        размер, повторы, вырожденная матрица) - тогда задача решается с нуля.
+        """
+        n, m = self.A.shape[1], self.A.shape[0]
+        basis = np.asarray(basis, dtype=np.int64)
+        if basis.shape != (m,) or len(np.unique(basis)) != m or (m and (basis.min() < 0 or basis.max() >= n + m)):
+            return False
+        problem = self._problem()
+        st = simplex_revised.initial_state(problem, self._upper_shifted())
+        if at_upper is not None:
+            at_upper = np.asarray(at_upper, dtype=bool)
+            if at_upper.shape != (n + m,):
+                return False
+            st['at_upper'] = at_upper & np.isfinite(st['ub'])
+            st['at_upper'][basis] = False
+        try:
+            st['factor'] = simplex_revised.BasisFactor(problem, basis)
+        except np.linalg.LinAlgError:
+            return False
+        st['basis'] = basis.copy()
+        simplex_revised.recompute_primal(problem, st)
+        self.problem, self.state = problem, st
+        self._changed_structure = self._changed_rhs = self._changed_cost = False
+        self._optimal = False
+        self._ranges = {}
+        return True
+
+    # --- Допустимые диапазоны ---
+    def _fast_ready(self):
+        return self.state is not None and self._optimal and not (
+            self._changed_rhs or self._changed_cost or self._changed_structure)
+
+    def _rhs_range(self, i):
+        """
+        Диапазон b_i (во внутренней записи) и столбец B^-1·e_i: при b_i + t
+        x_B + t·B^-1·e_i остается в границах, базис допустим и оптимален.
+        """
+        key = ('rhs', i)
+        if key not in self._ranges:
+            st, tol = self.state, self.options['pivot_tol']
+            e = np.zeros(len(self.b))
+            e[i] = 1.0
+            col = st['factor'].ftran(e)
+            x_B, ub_B = np.maximum(st['x_B'], 0.0), st['ub'][st['basis']]
+            room = np.maximum(ub_B - x_B, 0.0)
+            up, down = col > tol, col < -tol
+            high = min(np.min(room[up] / col[up], initial=np.inf), np.min(x_B[down] / -col[down], initial=np.inf))
+            low = min(np.min(x_B[up] / col[up], initial=np.inf), np.min(room[down] / -col[down], initial=np.inf))
+            self._ranges[key] = (self.b[i] - low, self.b[i] + high, col)
+        return self._ranges[key]
+
+    def _cost_range(self, j):
+        """
+        Диапазон c_j: оценки d(t) небазисных столбцов сохраняют знак
+        оптимальности. Для небазисной X(j+1) меняется только d_j, для базисной
+        в строке r - все d_k на -t·alpha_rk.
+        """
+        key = ('cost', j)
+        if key not in self._ranges:
+            problem, st = self.problem, self.state
+            _, d = simplex_revised.reduced_costs(problem, st)
+            sigma = np.where(st['at_upper'], -1.0, 1.0)
+            # slack_k = -sigma_k·d_k >= 0 - запас оптимальности столбца k
+            slack = np.maximum(-sigma * d, 0.0)
+            pos = np.flatnonzero(st['basis'] == j)
+            if not len(pos):
+                low, high = (-np.inf, slack[j]) if sigma[j] > 0 else (-slack[j], np.inf)
+            else:
+                e = np.zeros(problem.m)
+                e[pos[0]] = 1.0
+                g = sigma * problem.tableau_row(st['factor'].btran(e))
+                g[st['basis']] = 0.0
+                tol = self.options['pivot_tol']
+                grow, fall = g > tol, g < -tol
+                low = -np.min(slack[grow] / g[grow], initial=np.inf)
+                high = np.min(slack[fall] / -g[fall], initial=np.inf)
+            self._ranges[key] = (self.c[j] + low, self.c[j] + high)
+        return self._ranges[key]
+
+    # --- Решение ---
+    def _problem(self):
+        b = self.b - self.A @ self.lower if self.lower.any() else self.b
+        return simplex_revised.RevisedProblem(self.c, self.A, b)
+
+    def _upper_shifted(self):
+        return self.upper - self.lower if np.isfinite(self.upper).any() else None
+
+    def _sync(self):
+        """Приводит разложение и x_B в соответствие с накопленными изменениями."""
+        st = self.state
+        self._ranges = {}
+        if not (self._changed_structure or self._changed_rhs or self._changed_cost):
+            return
+        problem = self._problem()
+        if self._changed_structure:
+            st['factor'] = simplex_revised.BasisFactor(problem, st['basis'])
+        else:
+            st['factor'].problem = problem
+        if self._changed_structure or self._changed_rhs:
+            simplex_revised.recompute_primal(problem, st)
+        self.problem = problem
+        self._changed_structure = self._changed_rhs = self._changed_cost = False
+
+    def _cold_start(self):
+        self.problem = self._problem()
+        self.state = simplex_revised.initial_state(self.problem, self._upper_shifted())
+        self._changed_structure = self._changed_rhs = self._changed_cost = False
+        start = 0
+        if (self.state['x_B'] < -self.options['feas_tol']).any():
+            start, err = simplex_revised.phase_one(self.problem, self.state, self.max_iter, self.options)
+            if err:
+                return start, err
+        iterations, err = simplex_revised.primal_simplex(self.problem, self.state, self.max_iter, options=self.options)
+        return start + iterations, err
+
+    def reoptimize(self):
+        """Доводит текущий базис до оптимума. Возвращает (final_z, final_vars, err)."""
+        if self.error:
+            return None, None, self.error
+
+        if self._fast_ready():
+            # После изменений в пределах диапазонов базис оптимален, x_B уже пересчитан
+            self.last_method, self.last_iterations = 'range', 0
+            final_z, final_vars = self._current_solution()
+            return final_z, final_vars, None
+
+        self._optimal = False
+        self._ranges = {}
+        if self.state is None:
+            self.last_method = 'cold'
+            iterations, err = self._cold_start()
+        else:
+            self._sync()
+            problem, st = self.problem, self.state
+            x_B, ub_B = st['x_B'], st['ub'][st['basis']]
+            feas, opt = self.options['feas_tol'], self.options['opt_tol']
+            primal_ok = (x_B >= -feas).all() and (x_B <= ub_B + feas).all()
+            _, d = simplex_revised.reduced_costs(problem, st)
+            dual_ok = np.where(st['at_upper'], -d, d).max() <= opt
+
+            if primal_ok and dual_ok:
+                self.last_method, iterations, err = 'none', 0, None
+            elif primal_ok:
+                self.last_method = 'primal'
+                iterations, err = simplex_revised.primal_simplex(problem, st, self.max_iter, options=self.options)
+            elif dual_ok:
+                self.last_method = 'dual'
+                iterations, err = simplex_revised.dual_simplex(problem, st, self.max_iter, self.options)
+            else:
+                self.last_method = 'cold'
+                iterations, err = self._cold_start()
+
+        self.last_iterations = iterations
+        self.total_iterations += iterations
+        if err:
+            return None, None, err
+        self._optimal = True
+        final_z, final_vars = self.solution()
+        return final_z, final_vars, None
+
+    def solution(self):
+        """(final_z, final_vars) по текущему базису (после reoptimize)."""
+        st = simplex_revised.finalize_state(self.problem, self.state)
+        n, m = self.A.shape[1], self.A.shape[0]
+        names = [f'X{i+1}' for i in range(n + m)]
+        return simplex_core._final_result(st, self.lower, self.c, self.is_min, names)
+
+    def _current_solution(self):
+        """(final_z, final_vars) по x_B без пересчета оценок (они не меняются в пределах диапазонов)."""
+        problem, st = self.problem, self.state
+        values = np.where(st['at_upper'], st['ub'], 0.0)
+        values[st['basis']] = st['x_B']
+        st.update({'values': values, 'z': float(problem.cost @ values)})
+        n, m = self.A.shape[1], self.A.shape[0]
+        names = [f'X{i+1}' for i in range(n + m)]
+        return simplex_core._final_result(st, self.lower, self.c, self.is_min, names)
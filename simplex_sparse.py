@@ -0,0 +1,161 @@
+import numpy as np
+
+
+class DenseMatrix:
+    """Плотная матрица ограничений с тем же интерфейсом, что и CscMatrix."""
+
+    def __init__(self, A):
+        self.A = np.asarray(A, dtype=np.float64)
+        self.shape = self.A.shape
+
+    @property
+    def nnz(self):
+        return int(np.count_nonzero(self.A))
+
+    def column(self, j):
+        return self.A[:, j]
+
+    def select_columns(self, cols):
+        return DenseMatrix(self.A[:, cols])
+
+    def submatrix(self, rows, cols):
+        return DenseMatrix(self.A[np.ix_(rows, cols)])
+
+    def matvec(self, x):
+        return self.A @ x
+
+    def rmatvec(self, y):
+        return self.A.T @ y
+
+    def rmatvec_range(self, y, start, stop):
+        """A[:, start:stop]^T · y."""
+        return self.A[:, start:stop].T @ y
+
+    def col_norms_sq(self):
+        return (self.A * self.A).sum(axis=0)
+
+    def scale_rows(self, s):
+        return DenseMatrix(self.A * s[:, None])
+
+    def to_dense(self):
+        return self.A
+
+
+class CscMatrix:
+    """
+    Разреженная матрица в формате CSC (по столбцам): столбец j хранится
+    в indices/data[indptr[j]:indptr[j+1]]. Операции не строят плотную матрицу.
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        # Номер столбца для каждого ненулевого элемента (для векторных произведений)
+        self._col_of_nz = np.repeat(np.arange(self.shape[1]), np.diff(self.indptr))
+
+    @classmethod
+    def from_coo(cls, rows, cols, vals, shape):
+        """Строит CSC из троек (строка, столбец, значение); повторы суммируются."""
+        m, n = int(shape[0]), int(shape[1])
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=np.float64)
+        keys = cols * m + rows
+        order = np.argsort(keys, kind='stable')
+        uniq, starts = np.unique(keys[order], return_index=True)
+        data = np.add.reduceat(vals[order], starts) if len(uniq) else vals[:0]
+        indices = uniq % m
+        col_idx = uniq // m
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(col_idx, minlength=n))))
+        return cls(indptr, indices, data, (m, n))
+
+    @classmethod
+    def from_csr(cls, indptr, indices, data, shape):
+        """Строит CSC из CSR-массивов (indptr, indices, data)."""
+        rows = np.repeat(np.arange(shape[0]), np.diff(indptr))
+        return cls.from_coo(rows, indices, data, shape)
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.asarray(A, dtype=np.float64)
+        rows, cols = np.nonzero(A)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def _gather(self, cols):
+        """Ненулевые элементы подмножества столбцов: (строки, позиции столбцов, значения)."""
+        cols = np.asarray(cols, dtype=np.int64)
+        starts = self.indptr[cols]
+        counts = self.indptr[cols + 1] - starts
+        total = int(counts.sum())
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        nz = offsets + np.arange(total)
+        col_pos = np.repeat(np.arange(len(cols)), counts)
+        return self.indices[nz], col_pos, self.data[nz]
+
+    def column(self, j):
+        e = np.zeros(self.shape[0])
+        s = slice(self.indptr[j], self.indptr[j + 1])
+        e[self.indices[s]] = self.data[s]
+        return e
+
+    def select_columns(self, cols):
+        rows, col_pos, vals = self._gather(cols)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(col_pos, minlength=len(cols)))))
+        return CscMatrix(indptr, rows, vals, (self.shape[0], len(cols)))
+
+    def submatrix(self, rows, cols):
+        """Разреженный блок A[rows, cols] (используется для ядра базиса)."""
+        row_map = np.full(self.shape[0], -1)
+        row_map[rows] = np.arange(len(rows))
+        r, col_pos, vals = self._gather(cols)
+        keep = row_map[r] >= 0
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(col_pos[keep], minlength=len(cols)))))
+        return CscMatrix(indptr, row_map[r[keep]], vals[keep], (len(rows), len(cols)))
+
+    def matvec(self, x):
+        if x.ndim == 2:
+            # Все столбцы x за один проход по ненулевым элементам
+            out = np.zeros((self.shape[0], x.shape[1]))
+            np.add.at(out, self.indices, self.data[:, None] * x[self._col_of_nz])
+            return out
+        return np.bincount(self.indices, weights=self.data * x[self._col_of_nz], minlength=self.shape[0])
+
+    def rmatvec(self, y):
+        if y.ndim == 2:
+            out = np.zeros((self.shape[1], y.shape[1]))
+            np.add.at(out, self._col_of_nz, self.data[:, None] * y[self.indices])
+            return out
+        return np.bincount(self._col_of_nz, weights=self.data * y[self.indices], minlength=self.shape[1])
+
+    def rmatvec_range(self, y, start, stop):
+        """A[:, start:stop]^T · y по ненулевым элементам только этих столбцов."""
+        s = slice(self.indptr[start], self.indptr[stop])
+        return np.bincount(self._col_of_nz[s] - start, weights=self.data[s] * y[self.indices[s]], minlength=stop - start)
+
+    def col_norms_sq(self):
+        return np.bincount(self._col_of_nz, weights=self.data * self.data, minlength=self.shape[1])
+
+    def scale_rows(self, s):
+        return CscMatrix(self.indptr, self.indices, self.data * s[self.indices], self.shape)
+
+    def to_dense(self):
+        A = np.zeros(self.shape)
+        A[self.indices, self._col_of_nz] = self.data
+        return A
+
+
+def as_constraint_matrix(A):
+    """Приводит матрицу ограничений к DenseMatrix или CscMatrix (scipy.sparse принимается без densify)."""
+    if isinstance(A, (DenseMatrix, CscMatrix)):
+        return A
+    if hasattr(A, 'tocsc'):
+        csc = A.tocsc()
+        csc.sum_duplicates()
+        return CscMatrix(csc.indptr, csc.indices, csc.data, csc.shape)
+    return DenseMatrix(A)
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+BLOCK_BYTES = 1 << 26   # объем блока строк, который одновременно обрабатывается в памяти при хранении на диске
+
+
+def make_storage(opts):
+    """Хранилище таблиц по параметрам решателя: options['storage'] и options['scratch_dir']."""
+    if opts['storage'] == 'disk':
+        return DiskStorage(opts['scratch_dir'])
+    return MemoryStorage()
+
+
+def row_blocks(T, block_rows):
+    """Границы (a, b) блоков строк T по порядку - так memmap читается и пишется последовательно."""
+    for a in range(0, T.shape[0], block_rows):
+        yield a, min(a + block_rows, T.shape[0])
+
+
+class MemoryStorage:
+    """Таблицы и история в оперативной памяти (по умолчанию)."""
+    disk = False
+
+    def zeros(self, shape, dtype=np.float64):
+        return np.zeros(shape, dtype=dtype)
+
+    def copy(self, T):
+        return T.copy()
+
+    def work(self, T):
+        """Рабочий массив поворота - во всю таблицу."""
+        return np.empty_like(T)
+
+    def log(self, shape, dtype=np.float64):
+        import simplex_history
+        return simplex_history._ArrayLog(shape, dtype)
+
+
+class DiskStorage:
+    """
+    Таблицы - numpy.memmap в отдельном каталоге внутри scratch_dir (None -
+    системный каталог временных файлов), история таблиц дописывается в файл.
+    Рабочий массив поворота - блок строк объемом до BLOCK_BYTES, поэтому
+    в памяти одновременно находится только он. Каталог удаляется, когда
+    хранилище (и использующая его история) больше не нужно.
+    """
+    disk = True
+
+    def __init__(self, scratch_dir=None):
+        self.path = tempfile.mkdtemp(prefix='simplex-', dir=scratch_dir)
+        self.files = 0
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.path, True)
+
+    def _file(self):
+        self.files += 1
+        return os.path.join(self.path, f'{self.files}.dat')
+
+    def block_rows(self, T):
+        return max(1, BLOCK_BYTES // max(1, T.shape[1] * T.itemsize))
+
+    def zeros(self, shape, dtype=np.float64):
+        # Новый файл memmap заполнен нулями
+        return np.memmap(self._file(), dtype=dtype, mode='w+', shape=shape)
+
+    def copy(self, T):
+        out = self.zeros(T.shape, T.dtype)
+        for a, b in row_blocks(T, self.block_rows(T)):
+            out[a:b] = T[a:b]
+        return out
+
+    def work(self, T):
+        return np.empty((min(self.block_rows(T), T.shape[0]), T.shape[1]), dtype=T.dtype)
+
+    def log(self, shape, dtype=np.float64):
+        return _DiskLog(self._file(), shape, dtype)
+
+
+class _DiskLog:
+    """Аналог simplex_history._ArrayLog в файле: записи дописываются по блокам строк, читаются через memmap."""
+
+    def __init__(self, path, shape, dtype):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.item_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.size = 0
+        open(path, 'wb').close()
+
+    def append(self, item):
+        rows = max(1, BLOCK_BYTES // max(1, self.item_bytes // max(1, self.shape[0])))
+        with open(self.path, 'ab') as f:
+            for a, b in row_blocks(item, rows):
+                f.write(np.ascontiguousarray(item[a:b], dtype=self.dtype).tobytes())
+        self.size += 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        return np.memmap(self.path, dtype=self.dtype, mode='r', offset=i * self.item_bytes, shape=self.shape)
+
+    @property
+    def nbytes(self):
+        return self.size * self.item_bytes
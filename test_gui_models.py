@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PyQt5')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+import gui_models
+import simplex_core
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def _problem():
+    problem = gui_models.ProblemData(3, 2)
+    problem.raw[:] = [[0.0, 3.0, 5.0], [4.0, 1.0, 0.0], [12.0, 0.0, 2.0], [18.0, 3.0, 2.0]]
+    return problem
+
+
+def test_parse_number():
+    assert gui_models.parse_number(' 2,5 ') == 2.5
+    assert gui_models.parse_number('') == 0.0
+    assert gui_models.parse_number('-1e3') == -1000.0
+    assert gui_models.parse_number('x') is None
+
+
+def test_problem_data_shape_changes():
+    problem = _problem()
+    problem.add_constraint()
+    problem.add_variable()
+    assert problem.raw.shape == (5, 4) and problem.signs[-1] == gui_models.SIGNS[0]
+    problem.remove_variable()
+    problem.remove_variable()
+    assert problem.num_vars == 2
+    for _ in range(5):
+        problem.remove_constraint()
+    assert problem.num_constrs == 1 and len(problem.signs) == 1
+
+
+def test_simplex_data_is_the_array_itself():
+    problem = _problem()
+    raw, rhs, obj = problem.simplex_data()
+    assert raw is problem.raw
+    assert rhs == [4.0, 12.0, 18.0] and obj == [3.0, 5.0]
+    assert simplex_core.calculate_simplex(raw, 'Максимизация', 2, history='none')[0] == pytest.approx(36.0)
+
+
+def test_constraint_model_reads_and_writes_raw():
+    problem = _problem()
+    model = gui_models.ProblemTableModel(problem)
+    assert (model.rowCount(), model.columnCount()) == (3, 4)
+    assert model.headerData(0, Qt.Horizontal) == 'X1' and model.headerData(3, Qt.Horizontal) == 'Значение'
+    assert model.data(model.index(2, 0)) == '3' and model.data(model.index(2, 3)) == '18'
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append((first.row(), first.column())))
+
+    assert model.setData(model.index(1, 1), '2,5')
+    assert problem.raw[2, 2] == 2.5 and changed[-1] == (1, 1)
+    assert model.setData(model.index(0, 3), '7')
+    assert problem.raw[1, 0] == 7.0
+    assert not model.setData(model.index(0, 0), 'abc')
+    assert problem.raw[1, 1] == 1.0
+
+    assert model.setData(model.index(0, 2), gui_models.SIGNS[1])
+    assert problem.signs[0] == gui_models.SIGNS[1] and model.data(model.index(0, 2)) == gui_models.SIGNS[1]
+    assert not model.setData(model.index(0, 2), '<')
+
+
+def test_objective_model_and_set_value():
+    problem = _problem()
+    objective = gui_models.ProblemTableModel(problem, objective=True)
+    constraints = gui_models.ProblemTableModel(problem)
+    assert objective.rowCount() == 1
+    assert objective.data(objective.index(0, 2)) == '=' and objective.data(objective.index(0, 3)) == 'E'
+    assert not objective.flags(objective.index(0, 2)) & Qt.ItemIsEditable
+    assert not objective.setData(objective.index(0, 2), gui_models.SIGNS[0])
+    assert objective.setData(objective.index(0, 1), '6')
+    assert problem.raw[0, 2] == 6.0
+
+    seen = {'objective': [], 'constraints': []}
+    objective.dataChanged.connect(lambda first, last, roles: seen['objective'].append((first.row(), first.column())))
+    constraints.dataChanged.connect(lambda first, last, roles: seen['constraints'].append((first.row(), first.column())))
+    problem.set_value(3, 0, 20.0)
+    assert seen == {'objective': [], 'constraints': [(2, 3)]}
+    problem.set_value(0, 1, 4.0)
+    assert seen['objective'] == [(0, 0)]
+    assert constraints.data(constraints.index(2, 3)) == '20'
+
+
+def test_shape_change_resets_models():
+    problem = _problem()
+    model = gui_models.ProblemTableModel(problem)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(model.rowCount()))
+    problem.add_constraint()
+    problem.add_variable()
+    assert resets == [4, 4] and model.columnCount() == 5
+
+
+def test_get_bounds_data(app):
+    table = QTableWidget(2, 3)
+    for row, col, text in ((0, 0, '1,5'), (1, 0, '4'), (1, 1, '∞'), (0, 2, ' '), (1, 2, '+inf')):
+        table.setItem(row, col, QTableWidgetItem(text))
+    lower, upper = gui_models.get_bounds_data(table)
+    assert lower == [1.5, 0.0, 0.0]
+    assert upper[0] == 4.0 and np.isinf(upper[1:]).all()
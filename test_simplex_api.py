@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import simplex_api
+import simplex_core
+
+C, A, B = [3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], [4.0, 12.0, 18.0]
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({'sense': 'maximize'}, "Неизвестное направление оптимизации: maximize"),
+    ({'A': [[1.0, 0.0], [0.0, 2.0]]}, "Размеры c, A и b не согласованы"),
+    ({'signs': ['<=']}, "Число знаков не совпадает с числом ограничений"),
+    ({'signs': ['<=', '=', '<=']}, "Неподдерживаемый знак ограничения: ="),
+])
+def test_invalid_problem_is_reported(kwargs, message):
+    problem = simplex_api.Problem(**dict({'c': C, 'A': A, 'b': B}, **kwargs))
+    assert problem.check() == message
+    result = simplex_api.solve(problem)
+    assert not result.ok and result.err == message and result.objective is None
+
+
+def test_raw_matrix_round_trip():
+    problem = simplex_api.Problem(C, A, B, 'min', signs=['>=', '<=', '≥'])
+    raw = problem.raw_matrix()
+    again = simplex_api.Problem.from_raw(raw, 'Минимизация', 2, problem.signs)
+    assert again.sense == 'min' and again.check() is None
+    assert np.array_equal(again.raw_matrix(), raw)
+    assert problem.constr_signs() == ['≥', '≤', '≥']
+
+
+@pytest.mark.parametrize('engine', ['tableau', 'revised', 'exact'])
+def test_solve_matches_calculate_simplex(engine):
+    # Точный метод не поддерживает верхние границы
+    upper = None if engine == 'exact' else [3.0, None]
+    problem = simplex_api.Problem(C, A, B, upper=upper)
+    result = simplex_api.solve(problem, engine=engine)
+    expected = simplex_core.calculate_simplex(problem.raw_matrix(), 'Максимизация', 2, engine=engine, upper=upper, history='none')
+    assert result.ok
+    assert float(result.objective) == pytest.approx(float(expected[0]))
+    assert result.values == pytest.approx({k: float(v) for k, v in expected[2].items()})
+    assert len(result.history) == 1 and result.headers == expected[4]
+    assert result.stats['iterations'] > 0
+
+
+def test_solve_reports_solver_errors():
+    result = simplex_api.solve(simplex_api.Problem([1.0, 1.0], [[1.0, -1.0]], [4.0]))
+    assert not result.ok and result.err == "Задача не ограничена (нет конечного решения)"
+
+
+@pytest.mark.parametrize('presolve', [False, True])
+def test_sensitivity(presolve):
+    problem = simplex_api.Problem(C, A, B)
+    result = simplex_api.solve(problem, presolve=presolve, sensitivity=True)
+    constraints = result.sensitivity['constraints']
+    assert [c['shadow_price'] for c in constraints] == pytest.approx([0.0, 1.5, 1.0])
+    assert [v['final_value'] for v in result.sensitivity['variables']] == pytest.approx([2.0, 6.0])
+    assert simplex_api.sensitivity_analysis(problem, result)[1][1]['allow_increase'] == pytest.approx(constraints[1]['allow_increase'])
+
+
+def test_import_is_headless():
+    # Импорт и решение без Qt и matplotlib (рабочие процессы, серверы)
+    code = (
+        "import sys, simplex_api\n"
+        "problem = simplex_api.Problem([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], [4.0, 12.0, 18.0])\n"
+        "assert simplex_api.solve(problem, presolve=True, sensitivity=True).ok\n"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('PyQt5', 'matplotlib')))\n"
+    )
+    out = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import simplex_batch
+import simplex_core
+
+
+def _raw(c, A, b):
+    return [[0.0] + list(c)] + [[b[i]] + list(A[i]) for i in range(len(b))]
+
+
+@pytest.mark.parametrize('operation', ['Максимизация', 'Минимизация'])
+@pytest.mark.parametrize('seed', range(5))
+def test_batch_matches_single_solves(operation, seed):
+    rng = np.random.default_rng(seed)
+    size, m, n = 40, rng.integers(2, 6), rng.integers(2, 7)
+    A = rng.integers(0, 8, (m, n)).astype(float)
+    b = rng.integers(0, 30, (size, m)).astype(float)
+    c = rng.integers(-3, 9, (size, n)).astype(float)
+    signs = ['≥' if rng.random() < 0.25 else '≤' for _ in range(m)]
+    final_z, values, basis, status, iterations, err = simplex_batch.solve_batch(c, A, b, operation, signs)
+    assert err is None and basis.shape == (size, m)
+    codes = {name: code for code, name in simplex_batch.STATUS_NAMES.items()}
+    for k in range(size):
+        single = simplex_core.calculate_simplex(_raw(c[k], A, b[k]), operation, n, signs, history='none')
+        if single[3] is None:
+            assert status[k] == simplex_batch.OPTIMAL
+            assert final_z[k] == pytest.approx(single[0], abs=1e-9)
+            for j in range(n + m):
+                assert values[k, j] == pytest.approx(single[2].get(f'X{j + 1}', 0.0), abs=1e-9)
+        else:
+            assert status[k] == codes.get(single[3], simplex_batch.ITERATION_LIMIT)
+            assert np.isnan(final_z[k]) and np.isnan(values[k]).all()
+    assert (iterations[status == simplex_batch.OPTIMAL] >= 0).all()
+
+
+def test_batch_broadcasts_shared_parts():
+    A = np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]])
+    b = np.array([[4.0, 12.0, 18.0], [4.0, 12.0, 24.0]])
+    final_z, values, _, status, _, err = simplex_batch.solve_batch([3.0, 5.0], A, b, 'Максимизация')
+    assert err is None and (status == simplex_batch.OPTIMAL).all()
+    assert final_z == pytest.approx([36.0, 42.0])
+    assert values[0, :2] == pytest.approx([2.0, 6.0])
+
+
+def test_batch_statuses():
+    # Неограниченная, недопустимая (x1 >= 5 при x1 <= 2) и обычная задачи в одном пакете
+    A = np.array([[[1.0, -1.0], [0.0, 0.0]], [[1.0, 0.0], [1.0, 0.0]], [[1.0, 1.0], [1.0, 0.0]]])
+    b = np.array([[4.0, 0.0], [2.0, 5.0], [4.0, 1.0]])
+    _, _, _, status, _, err = simplex_batch.solve_batch([1.0, 1.0], A, b, 'Максимизация', ['≤', '≥'])
+    assert err is None
+    assert status.tolist() == [simplex_batch.UNBOUNDED, simplex_batch.INFEASIBLE, simplex_batch.OPTIMAL]
+    _, _, _, status, _, _ = simplex_batch.solve_batch([1.0, 1.0], A[2], b[2], 'Максимизация', max_iter=0)
+    assert status.tolist() == [simplex_batch.ITERATION_LIMIT]
+
+
+def test_batch_rejects_mismatched_shapes():
+    err = simplex_batch.solve_batch(np.ones((3, 2)), np.ones((2, 2)), np.ones((2, 2)), 'Максимизация')[-1]
+    assert err == "Длина пакета b (2) не совпадает с 3"
+    assert simplex_batch.solve_batch([1.0], np.ones((2, 2)), [1.0, 1.0], 'Максимизация')[-1] == "Размеры c, A и b не согласованы"
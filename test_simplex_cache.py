@@ -0,0 +1,166 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+import simplex_api
+import simplex_cache
+import simplex_core
+
+MAX = 'Максимизация'
+RAW = [[0.0, 3.0, 5.0], [4.0, 1.0, 0.0], [12.0, 0.0, 2.0], [18.0, 3.0, 2.0]]
+
+
+def test_fingerprint_ignores_execution_options():
+    key = simplex_cache.fingerprint(RAW, MAX, 2)
+    assert key == simplex_cache.fingerprint(np.array(RAW), MAX, 2, options={'threads': 4})
+    assert key != simplex_cache.fingerprint(RAW, 'Минимизация', 2)
+    assert key != simplex_cache.fingerprint(RAW, MAX, 2, engine='revised')
+
+
+def test_solve_cache_hit_returns_same_answer():
+    cache = simplex_cache.SolveCache()
+    stats = {}
+    first = cache.calculate_simplex(RAW, MAX, 2, stats=stats)
+    second = cache.calculate_simplex(RAW, MAX, 2, stats=stats)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second[0] == first[0] == pytest.approx(36.0)
+    assert second[2] == first[2]
+    assert second[1][-1]['table'] == first[1][-1]['table']
+    assert stats['iterations'] > 0
+
+
+def test_solve_cache_results_are_copies():
+    cache = simplex_cache.SolveCache()
+    problem = simplex_api.Problem([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], [4.0, 12.0, 18.0])
+    first = simplex_api.solve(problem, cache=cache, history='full', presolve=True)
+    first.values['X1'] = -1.0
+    first.history[-1]['table']['E'][0] = 123.0
+    first.headers.append('Лишний')
+    first.stats['presolve']['rows'] = None
+    second = simplex_api.solve(problem, cache=cache, history='full', presolve=True)
+    assert cache.hits == 1
+    assert second.values['X1'] == pytest.approx(2.0)
+    assert second.history[-1]['table']['E'][0] != 123.0
+    assert 'Лишний' not in second.headers
+    assert second.stats['presolve']['rows'] is not None
+
+
+@pytest.mark.parametrize('engine, history', [('tableau', 'pivots'), ('revised', 'pivots'), ('revised', 'full'), ('exact', 'pivots')])
+def test_solve_cache_entry_does_not_grow(engine, history):
+    cache = simplex_cache.SolveCache()
+    key = simplex_cache.fingerprint(RAW, MAX, 2, engine=engine, history=history)
+    first = cache.calculate_simplex(RAW, MAX, 2, engine=engine, history=history)
+    stored = cache._entries[key][0]
+    size = simplex_cache.result_nbytes(stored)
+    second = cache.calculate_simplex(RAW, MAX, 2, engine=engine, history=history)
+    # Просмотр выданных историй восстанавливает таблицы в копиях, а не в записи кэша
+    assert [step['table'] for step in first[1]] == [step['table'] for step in second[1]]
+    assert simplex_cache.result_nbytes(stored) <= size
+
+
+def test_solve_cache_evicts_least_recently_used():
+    raws = [[[0.0, 3.0, k], [4.0, 1.0, 0.0], [12.0, 0.0, 2.0]] for k in (1.0, 2.0, 3.0)]
+    size = simplex_cache.result_nbytes(simplex_core.calculate_simplex(raws[0], MAX, 2))
+    cache = simplex_cache.SolveCache(max_bytes=int(2.5 * size))
+    for raw in raws[:2]:
+        cache.calculate_simplex(raw, MAX, 2)
+    cache.calculate_simplex(raws[0], MAX, 2)
+    cache.calculate_simplex(raws[2], MAX, 2)
+    assert cache.evictions == 1 and len(cache) == 2
+    assert simplex_cache.fingerprint(raws[0], MAX, 2) in cache
+    assert simplex_cache.fingerprint(raws[1], MAX, 2) not in cache
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_disk_cache_hit_warm_and_persistence(tmp_path):
+    path = str(tmp_path / 'solutions.db')
+    cache = simplex_cache.DiskCache(path)
+    stats = {}
+    final_z, final_vars, solution, err = cache.solve(RAW, MAX, 2, stats=stats)
+    assert err is None and stats['cache'] == 'miss'
+    assert final_z == pytest.approx(36.0)
+    assert set(solution) == {'basis', 'at_upper', 'duals', 'sensitivity'}
+
+    # Та же структура с другими числами - решение от сохраненного базиса
+    other = [row[:] for row in RAW]
+    other[3][0] = 20.0
+    warm_z, _, _, err = cache.solve(other, MAX, 2, stats=stats)
+    assert err is None and stats['cache'] == 'warm'
+    assert warm_z == pytest.approx(simplex_core.calculate_simplex(other, MAX, 2)[0])
+    cache.close()
+
+    reopened = simplex_cache.DiskCache(path)
+    again = reopened.solve(RAW, MAX, 2, stats=stats)
+    assert stats['cache'] == 'hit' and stats['iterations'] == 0
+    assert again[0] == final_z and again[1] == final_vars
+    assert np.array_equal(again[2]['basis'], solution['basis'])
+    assert reopened.info()['entries'] == 2
+    reopened.close()
+
+
+def test_disk_cache_sensitivity_matches_tableau(tmp_path):
+    cache = simplex_cache.DiskCache(str(tmp_path / 'solutions.db'))
+    _, _, solution, _ = cache.solve(RAW, MAX, 2)
+    full = simplex_core.calculate_simplex(RAW, MAX, 2)
+    var_an, constr_an, _ = simplex_core.perform_sensitivity_analysis(full[1][-1]['table'], [4.0, 12.0, 18.0], [3.0, 5.0], 2, 3, True)
+    ranges = solution['sensitivity']
+    assert np.allclose(ranges['shadow_price'], [c['shadow_price'] for c in constr_an])
+    assert np.allclose(ranges['cost_increase'], [v['allow_increase'] for v in var_an])
+    assert np.allclose(ranges['cost_decrease'], [v['allow_decrease'] for v in var_an])
+    cache.close()
+
+
+def _other(k):
+    other = [row[:] for row in RAW]
+    other[3][0] = 18.0 + k
+    return other
+
+
+def test_disk_cache_evicts_old_and_excess_entries(tmp_path):
+    cache = simplex_cache.DiskCache(str(tmp_path / 'solutions.db'), max_age=3600)
+    for k in range(3):
+        cache.solve(_other(k), MAX, 2)
+    # Запись, к которой давно не обращались, удаляется при следующей записи
+    stale = simplex_cache.fingerprint(_other(0), MAX, 2, engine='revised', history='none')
+    cache._connect().execute("UPDATE solutions SET accessed = accessed - 7200 WHERE key = ?", (stale,))
+    cache.evict()
+    assert cache.info()['entries'] == 2 and cache.get(stale) is None
+
+    size = cache.info()['nbytes'] // 2
+    cache.max_bytes = int(2.5 * size)
+    cache.get(simplex_cache.fingerprint(_other(1), MAX, 2, engine='revised', history='none'))
+    cache.solve(_other(3), MAX, 2)
+    info = cache.info()
+    assert info['entries'] == 2 and info['nbytes'] <= cache.max_bytes
+    # Вытеснена запись, к которой обращались раньше всех
+    assert cache.get(simplex_cache.fingerprint(_other(2), MAX, 2, engine='revised', history='none')) is None
+    cache.close()
+
+
+def test_disk_cache_stores_errors(tmp_path):
+    cache = simplex_cache.DiskCache(str(tmp_path / 'solutions.db'))
+    unbounded = [[0.0, 1.0, 1.0], [4.0, 1.0, -1.0]]
+    stats = {}
+    first = cache.solve(unbounded, MAX, 2, stats=stats)
+    assert first[3] and first[2] is None
+    assert cache.solve(unbounded, MAX, 2, stats=stats) == first and stats['cache'] == 'hit'
+    # Неудачное решение не служит стартовым базисом
+    cache.solve([[0.0, 1.0, 1.0], [5.0, 1.0, -1.0]], MAX, 2, stats=stats)
+    assert stats['cache'] == 'miss'
+    cache.close()
+
+
+def _solve_in_worker(args):
+    cache, k = args
+    return k, cache.solve(_other(k % 4), MAX, 2)[0]
+
+
+def test_disk_cache_shared_by_processes(tmp_path):
+    cache = simplex_cache.DiskCache(str(tmp_path / 'solutions.db'))
+    with multiprocessing.Pool(4) as pool:
+        results = pool.map(_solve_in_worker, [(cache, k) for k in range(16)])
+    for k, final_z in results:
+        assert final_z == pytest.approx(simplex_core.calculate_simplex(_other(k % 4), MAX, 2, history='none')[0])
+    assert cache.info()['entries'] == 4
+    cache.close()
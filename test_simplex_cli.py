@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+
+import simplex_cli
+
+MODEL = {"sense": "max", "c": [3, 5], "A": [[1, 0], [0, 2], [3, 2]], "b": [4, 12, 18]}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def _run(argv):
+    out = io.StringIO()
+    code = simplex_cli.solve_command(simplex_cli.build_parser().parse_args(['solve'] + argv), out)
+    return code, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_one_json_line_per_model(tmp_path):
+    models = tmp_path / 'models'
+    models.mkdir()
+    _write(models / 'a.json', MODEL)
+    _write(models / 'b.json', dict(MODEL, upper=[2, None]))
+    (models / 'notes.txt').write_text('не задача')
+    code, records = _run([str(models), '--engine', 'revised'])
+    assert code == 0
+    assert [r['model'].rsplit('/', 1)[-1] for r in records] == ['a.json', 'b.json']
+    first, second = records
+    assert first['status'] == 'optimal' and first['error'] is None
+    assert first['objective'] == pytest.approx(36.0)
+    assert first['solution'] == pytest.approx({'X1': 2.0, 'X2': 6.0, 'X3': 2.0, 'X4': 0.0, 'X5': 0.0})
+    assert first['engine'] == 'revised' and first['iterations'] > 0
+    assert set(first['time']) == {'load', 'solve'}
+    assert second['solution']['X1'] == pytest.approx(2.0)
+    assert 'sensitivity' not in first and 'history' not in first
+
+
+def test_sensitivity_and_history(tmp_path):
+    code, (record,) = _run([_write(tmp_path / 'm.json', MODEL), '--sensitivity', '--history', 'pivots'])
+    assert code == 0
+    constraints = record['sensitivity']['constraints']
+    assert [c['shadow_price'] for c in constraints] == pytest.approx([0.0, 1.5, 1.0])
+    # Бесконечные диапазоны выводятся как null
+    assert constraints[0]['allow_increase'] is None
+    assert record['history'] and all('table' not in step for step in record['history'])
+    assert record['history'][-1]['pivot_col'] is None
+
+
+def test_errors_are_reported_per_model(tmp_path):
+    good = _write(tmp_path / 'good.json', MODEL)
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{', encoding='utf-8')
+    missing = _write(tmp_path / 'missing.json', {"c": [1], "A": [[1]]})
+    code, records = _run([str(broken), good, missing])
+    assert code == 1
+    by_name = {r['model'].rsplit('/', 1)[-1]: r for r in records}
+    assert by_name['broken.json']['status'] == 'error'
+    assert by_name['missing.json']['error'] == "В задаче нет поля b"
+    assert by_name['good.json']['status'] == 'optimal'
+
+
+def test_parallel_output_matches_serial(tmp_path):
+    paths = [_write(tmp_path / f'{k}.json', dict(MODEL, b=[4, 12, 18 + k])) for k in range(3)]
+    _, serial = _run(paths)
+    code, parallel = _run(paths + ['--jobs', '2'])
+    assert code == 0
+    key = lambda r: r['model']
+    for got, want in zip(sorted(parallel, key=key), sorted(serial, key=key)):
+        assert got['objective'] == pytest.approx(want['objective'])
+        assert got['solution'] == pytest.approx(want['solution'])
+
+
+def test_main_rejects_negative_jobs(tmp_path):
+    with pytest.raises(SystemExit):
+        simplex_cli.main(['solve', _write(tmp_path / 'm.json', MODEL), '--jobs', '-1'])
@@ -0,0 +1,361 @@
+import math
+
+import numpy as np
+import pytest
+
+import simplex_api
+import simplex_core
+import simplex_session
+
+MAX = 'Максимизация'
+
+
+def _bounded_problem(c=(3.0, 5.0)):
+    # max 3·X1 + 5·X2, X1 + X2 <= 6, X1 >= 1, X2 <= 2: X1 = 4 в базисе, X2 на верхней границе
+    return simplex_api.Problem(list(c), [[1.0, 1.0]], [6.0], lower=[1.0, 0.0], upper=[math.inf, 2.0])
+
+
+@pytest.mark.parametrize('engine', ['tableau', 'revised'])
+def test_sensitivity_with_bounds(engine):
+    result = simplex_api.solve(_bounded_problem(), engine=engine, history='full', sensitivity=True)
+    assert result.ok and result.objective == pytest.approx(22.0)
+    x1, x2 = result.sensitivity['variables']
+    assert x1['final_value'] == pytest.approx(4.0)
+    assert x2['final_value'] == pytest.approx(2.0)
+    assert (x1['allow_increase'], x1['allow_decrease']) == pytest.approx((2.0, 3.0))
+    # X2 на верхней границе: рост коэффициента ее не меняет
+    assert x2['allow_increase'] == math.inf
+    assert x2['allow_decrease'] == pytest.approx(2.0)
+    (constr,) = result.sensitivity['constraints']
+    assert constr['shadow_price'] == pytest.approx(3.0)
+    assert constr['allow_decrease'] == pytest.approx(3.0)
+
+
+def test_bounded_sensitivity_paths_agree():
+    problem = _bounded_problem()
+    expected = simplex_api.solve(problem, history='full', sensitivity=True).sensitivity
+    presolved = simplex_api.solve(problem, presolve=True, sensitivity=True).sensitivity
+    _, history, _, err, _ = simplex_core.calculate_simplex_sparse(
+        problem.c, problem.A, problem.b, MAX, lower=problem.lower, upper=problem.upper, history='none'
+    )
+    assert err is None
+    sparse_vars, sparse_constrs, _ = simplex_core.perform_sparse_sensitivity(
+        problem.c, problem.A, problem.b, history[-1]['basis'], True,
+        lower=problem.lower, upper=problem.upper, flipped=history[-1].get('flipped'),
+    )
+    for other in (presolved, {'variables': sparse_vars, 'constraints': sparse_constrs}):
+        for key in ('variables', 'constraints'):
+            for got, want in zip(other[key], expected[key]):
+                for field, value in want.items():
+                    if field != 'name':
+                        assert got[field] == pytest.approx(value)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_bounded_cost_ranges_keep_solution(seed):
+    rng = np.random.default_rng(seed)
+    m, n = 3, 4
+    A = rng.integers(1, 6, (m, n)).astype(float)
+    b = rng.integers(10, 30, m).astype(float)
+    c = rng.integers(1, 9, n).astype(float)
+    upper = np.where(rng.random(n) < 0.5, rng.integers(1, 4, n), np.inf)
+    result = simplex_api.solve(simplex_api.Problem(c, A, b, upper=upper.tolist()), history='full', sensitivity=True)
+    assert result.ok
+    table = result.history[-1]['table']
+    nonbasic = [j for j in range(len(table['E']) - 1) if f'X{j+1}' not in table]
+    if any(abs(table['E'][j]) < 1e-9 for j in nonbasic):
+        pytest.skip("альтернативный оптимум: диапазоны по нулевым оценкам не ограничиваются")
+    x = np.array([result.values.get(f'X{j+1}', 0.0) for j in range(n)])
+    for j, var in enumerate(result.sensitivity['variables']):
+        assert var['final_value'] == pytest.approx(x[j])
+        for key, sign in (('allow_increase', 1.0), ('allow_decrease', -1.0)):
+            step = min(var[key], 4.0) / 2
+            if step <= 1e-9:
+                continue
+            moved = c.copy()
+            moved[j] += sign * step
+            other = simplex_api.solve(simplex_api.Problem(moved, A, b, upper=upper.tolist()))
+            assert other.objective == pytest.approx(moved @ x)
+
+
+def _random_raw(rng, m, n, signs=False):
+    # b >= 0 и (при signs) ограничения >= с нулевой правой частью: стартовый базис допустим без первой фазы
+    A = rng.integers(-2, 8, (m, n)).astype(float)
+    A[rng.random((m, n)) < 0.3] = 0.0
+    b = rng.integers(1, 30, m).astype(float)
+    c = rng.integers(-3, 9, n).astype(float)
+    constr_signs = None
+    if signs:
+        constr_signs = ['≥' if rng.random() < 0.3 else '≤' for _ in range(m)]
+        b[[i for i, s in enumerate(constr_signs) if s == '≥']] = 0.0
+    raw = np.zeros((m + 1, n + 1))
+    raw[0, 1:] = c
+    raw[1:, 0] = b
+    raw[1:, 1:] = A
+    return raw, constr_signs
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_engines_agree(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(1, 7), rng.integers(1, 8)
+    raw, signs = _random_raw(rng, m, n, signs=seed % 2 == 1)
+    upper = np.where(rng.random(n) < 0.4, rng.integers(1, 5, n), np.inf).tolist()
+    reference = simplex_core.calculate_simplex(raw, MAX, n, signs, upper=upper)
+    for engine, pricing in (('revised', 'dantzig'), ('revised', 'steepest'), ('tableau', 'devex'), ('tableau', 'bland')):
+        other = simplex_core.calculate_simplex(raw, MAX, n, signs, engine=engine, upper=upper, pricing=pricing)
+        assert other[3] == reference[3]
+        if reference[3] is None:
+            assert other[0] == pytest.approx(reference[0], abs=1e-9)
+    # Точный метод - без верхних границ
+    plain = simplex_core.calculate_simplex(raw, MAX, n, signs)
+    exact = simplex_core.calculate_simplex(raw, MAX, n, signs, engine='exact')
+    assert exact[3] == plain[3]
+    if plain[3] is None:
+        assert float(exact[0]) == pytest.approx(plain[0], abs=1e-9)
+
+
+@pytest.mark.parametrize('history', ['none', 'pivots', 'full'])
+def test_history_modes_keep_final_table(history):
+    raw, _ = _random_raw(np.random.default_rng(7), 4, 5)
+    full = simplex_core.calculate_simplex(raw, MAX, 5)
+    other = simplex_core.calculate_simplex(raw, MAX, 5, history=history)
+    assert other[0] == full[0] and other[2] == full[2]
+    assert other[1][-1]['table'] == full[1][-1]['table']
+    assert len(other[1]) == (1 if history == 'none' else len(full[1]))
+
+
+def test_negative_shifted_rhs_is_infeasible():
+    # После сдвига x = l + x' правая часть последней строки становится отрицательной
+    c, A, b = [9.0, -3.0, 3.0, -2.0], np.array([[6.0, 5.0, 1.0, 2.0], [3.0, 4.0, 2.0, 5.0], [6.0, 3.0, 4.0, 5.0]]), [24.0, 15.0, 7.0]
+    lower = [0.0, 1.0, 1.0, 1.0]
+    raw = [[0.0] + c] + [[b[i]] + list(A[i]) for i in range(3)]
+    for engine in ('tableau', 'revised', 'exact'):
+        result = simplex_core.calculate_simplex(raw, MAX, 4, lower=lower, engine=engine)
+        assert result[3] == "Задача не имеет допустимых решений"
+    assert simplex_core.calculate_simplex_sparse(c, A, b, MAX, lower=lower)[3] == "Задача не имеет допустимых решений"
+    session = simplex_session.SimplexSession(raw, MAX, 4, lower=lower)
+    assert session.reoptimize()[2] == "Задача не имеет допустимых решений"
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_phase_one_for_negative_rhs(seed):
+    rng = np.random.default_rng(200 + seed)
+    m, n = rng.integers(2, 6), rng.integers(2, 6)
+    raw, _ = _random_raw(rng, m, n)
+    raw[1:, 1:] = np.abs(raw[1:, 1:])
+    raw[1:, 0] += 15.0
+    signs = ['≥' if rng.random() < 0.3 else '≤' for _ in range(m)]
+    lower = rng.integers(0, 3, n).tolist()
+    reference = simplex_core.calculate_simplex(raw, MAX, n, signs, lower=lower, presolve=True, history='none')
+    for engine in ('tableau', 'revised', 'exact'):
+        result = simplex_core.calculate_simplex(raw, MAX, n, signs, lower=lower, engine=engine, history='none')
+        assert (result[3] is None) == (reference[3] is None)
+        if reference[3] is None:
+            assert float(result[0]) == pytest.approx(reference[0], abs=1e-9)
+            x = np.array([float(result[2].get(f'X{j + 1}', 0.0)) for j in range(n)])
+            assert np.all(x >= np.array(lower) - 1e-9)
+    session = simplex_session.SimplexSession(raw, MAX, n, signs, lower=lower)
+    final_z, _, err = session.reoptimize()
+    assert (err is None) == (reference[3] is None)
+    if err is None:
+        assert final_z == pytest.approx(reference[0], abs=1e-9)
+
+
+@pytest.mark.parametrize('engine', ['tableau', 'revised'])
+def test_beale_cycling(engine):
+    # Пример Била: правило Данцига без защиты зацикливается
+    raw = [[0.0, 0.75, -20.0, 0.5, -6.0], [0.0, 0.25, -8.0, -1.0, 9.0], [0.0, 0.5, -12.0, -0.5, 3.0], [1.0, 0.0, 0.0, 1.0, 0.0]]
+    cycling = simplex_core.calculate_simplex(raw, MAX, 4, engine=engine, options={'degeneracy': 'none'}, history='none')
+    assert cycling[3].startswith("Превышено число итераций")
+    for mode, counter in (('perturb', 'perturbations'), ('bland', 'bland_pivots')):
+        stats = {}
+        result = simplex_core.calculate_simplex(raw, MAX, 4, engine=engine, options={'degeneracy': mode}, history='none', stats=stats)
+        assert result[3] is None and result[0] == pytest.approx(1.25)
+        assert stats[counter] > 0
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_perturbation_with_bounds(seed):
+    # Вырожденные задачи с верхними границами: возмущение после каждого вырожденного поворота
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(3, 9), rng.integers(3, 10)
+    A = rng.integers(-2, 4, (m, n)).astype(float)
+    b = np.where(rng.random(m) < 0.3, 0.0, rng.integers(1, 12, m)).astype(float)
+    c = rng.integers(-2, 6, n).astype(float)
+    upper = np.where(rng.random(n) < 0.9, rng.integers(1, 3, n), np.inf).tolist()
+    raw = [[0.0] + list(c)] + [[b[i]] + list(A[i]) for i in range(m)]
+    result = simplex_core.calculate_simplex(raw, MAX, n, upper=upper, options={'stall_limit': 1}, history='pivots')
+    reference = simplex_core.calculate_simplex(raw, MAX, n, upper=upper, engine='revised', options={'degeneracy': 'bland'}, history='none')
+    assert result[3] == reference[3]
+    if reference[3] is None:
+        assert result[0] == pytest.approx(reference[0], abs=1e-6)
+        # Таблицы истории восстанавливаются по записанным сдвигам
+        full = simplex_core.calculate_simplex(raw, MAX, n, upper=upper, options={'stall_limit': 1})
+        assert result[1][-1]['table'] == full[1][-1]['table']
+
+
+def _klee_minty(n):
+    c = [2.0 ** (n - 1 - j) for j in range(n)]
+    A = np.identity(n)
+    for i in range(n):
+        for j in range(i):
+            A[i, j] = 2.0 ** (i - j + 1)
+    return np.vstack((np.insert(c, 0, 0.0), np.column_stack(([5.0 ** (i + 1) for i in range(n)], A))))
+
+
+@pytest.mark.parametrize('engine', ['tableau', 'revised'])
+def test_pricing_rules_on_klee_minty(engine):
+    # Куб Кли - Минти: правило Данцига обходит все 2^n вершин, наискорейший спуск - один поворот
+    raw = _klee_minty(5)
+    iterations = {}
+    for pricing in simplex_core.PRICING_RULES:
+        stats = {}
+        result = simplex_core.calculate_simplex(raw, MAX, 5, engine=engine, pricing=pricing, stats=stats, history='none')
+        assert result[3] is None and result[0] == pytest.approx(5.0 ** 5)
+        assert stats['pricing'] == pricing
+        iterations[pricing] = stats['iterations']
+    assert iterations['dantzig'] == 2 ** 5 - 1
+    assert iterations['steepest'] == 1
+    assert max(iterations['devex'], iterations['partial'], iterations['multiple']) < iterations['dantzig']
+
+
+def test_steepest_edge_weights_match_column_norms():
+    # Рекуррентные веса совпадают с 1 + ||B^-1·a_j||^2 небазисных столбцов финальной таблицы
+    rng = np.random.default_rng(8)
+    m, n = 10, 15
+    raw = np.vstack((np.insert(rng.integers(1, 9, n).astype(float), 0, 0.0),
+                     np.column_stack((rng.integers(20, 60, m), rng.integers(1, 9, (m, n))))))
+    rule = simplex_core.SteepestEdgePricing()
+    stats = {}
+    _, history, _, err, headers = simplex_core.calculate_simplex(raw, MAX, n, pricing=rule, stats=stats)
+    assert err is None and stats['iterations'] > 1
+    table = history[-1]['table']
+    rows = np.array([table[name][:-1] for name in table if name != 'E'])
+    nonbasic = [j for j, name in enumerate(headers[:n + m]) if name not in table]
+    assert np.allclose(rule.weights[nonbasic], 1.0 + (rows[:, nonbasic] ** 2).sum(axis=0))
+
+
+def test_partial_pricing_walks_segments():
+    rule = simplex_core.PartialPricing(segments=3)
+    rule.start(9)
+    d = np.array([0.0, 0.0, 0.0, 0.0, 2.0, 3.0, 5.0, 0.0, 0.0])
+    seen = []
+    price = lambda a, b: (seen.append((a, b)), d[a:b])[1]
+    # Первый сегмент без улучшений, выбор - лучший столбец второго
+    assert rule.select(price, 9) == 5
+    assert seen == [(0, 3), (3, 6)]
+    # Следующий просмотр начинается с третьего сегмента
+    assert rule.select(price, 9) == 6
+    d[:] = 0.0
+    assert rule.select(price, 9) is None
+
+
+def test_make_pricing():
+    rule = simplex_core.DevexPricing()
+    assert simplex_core.make_pricing(rule) is rule
+    assert isinstance(simplex_core.make_pricing(None), simplex_core.DantzigPricing)
+    with pytest.raises(ValueError):
+        simplex_core.make_pricing('nonexistent')
+    raw, _ = _random_raw(np.random.default_rng(1), 3, 3)
+    assert simplex_core.calculate_simplex(raw, MAX, 3, pricing='nonexistent')[3] == "Неизвестное правило выбора: nonexistent"
+
+
+def test_harris_ratio_test_prefers_large_pivot():
+    # Отношения 1 и 1 + 5e-10 равны в пределах feas_tol: Харрис берет строку с большим |alpha|
+    x_B, alpha = np.array([0.5, 1.0 + 5e-10, 3.0]), np.array([0.5, 1.0, 1.0])
+    standard = simplex_core._ratio_test(x_B, alpha, None, simplex_core.solver_options())
+    harris = simplex_core._ratio_test(x_B, alpha, None, simplex_core.solver_options({'ratio_test': 'harris'}))
+    assert standard[1] == 0 and harris[1] == 1
+    assert np.array_equal(standard[0], harris[0])
+    assert harris[2] == pytest.approx(1.0 + 1e-9)
+    bland = simplex_core._ratio_test(x_B, alpha, None, simplex_core.solver_options({'ratio_test': 'bland'}), basis=np.array([7, 2, 5]))
+    assert bland[1] == 1
+
+
+def test_ratio_test_tolerances_and_bounds():
+    x_B, alpha = np.array([1.0, 4.0]), np.array([1e-3, 1.0])
+    # Ведущий элемент меньше pivot_tol не рассматривается
+    ratios, r, _ = simplex_core._ratio_test(x_B, alpha, None, simplex_core.solver_options({'pivot_tol': 1e-2}))
+    assert r == 1 and ratios[0] == np.inf
+    # Отрицательный alpha и верхняя граница: переменная растет до границы
+    ratios, r, limit = simplex_core._ratio_test(np.array([1.0, 4.0]), np.array([-2.0, 1.0]), np.array([3.0, np.inf]), simplex_core.solver_options())
+    assert r == 0 and ratios[0] == pytest.approx(1.0) and limit == pytest.approx(1.0)
+    assert simplex_core._ratio_test(x_B, -alpha, None, simplex_core.solver_options())[1] == -1
+
+
+def test_solver_options_are_validated():
+    opts = simplex_core.solver_options({'feas_tol': 1e-7})
+    assert opts['feas_tol'] == 1e-7 and opts['pivot_tol'] == simplex_core.DEFAULT_OPTIONS['pivot_tol']
+    for bad in ({'tolerance': 1e-6}, {'ratio_test': 'fast'}, {'degeneracy': 'ignore'}, {'threads': 0}):
+        with pytest.raises(ValueError):
+            simplex_core.solver_options(bad)
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_harris_matches_standard(seed):
+    # Вырожденные задачи (много нулевых b): тест Харриса меняет путь, но не оптимум
+    rng = np.random.default_rng(300 + seed)
+    m, n = rng.integers(3, 8), rng.integers(3, 8)
+    raw, _ = _random_raw(rng, m, n)
+    raw[1:, 0][rng.random(m) < 0.5] = 0.0
+    reference = simplex_core.calculate_simplex(raw, MAX, n, history='none')
+    for engine in ('tableau', 'revised'):
+        result = simplex_core.calculate_simplex(raw, MAX, n, engine=engine, options={'ratio_test': 'harris'}, history='none')
+        assert result[3] == reference[3]
+        if reference[3] is None:
+            assert result[0] == pytest.approx(reference[0], abs=1e-9)
+
+
+@pytest.mark.parametrize('engine', ['tableau', 'revised', 'exact'])
+@pytest.mark.parametrize('history', ['none', 'full'])
+def test_iter_simplex_streams_history(engine, history):
+    raw, _ = _random_raw(np.random.default_rng(11), 5, 6)
+    full = simplex_core.calculate_simplex(raw, MAX, 6, engine=engine)
+    events = list(simplex_core.iter_simplex(raw, MAX, 6, engine=engine, history=history))
+    kinds = [kind for kind, _ in events]
+    assert kinds == ['step'] * len(full[1]) + ['result']
+    # Записи выдаются сразу и совпадают с историей полного решения даже без ее хранения
+    for (_, step), want in zip(events, full[1]):
+        assert step['table'] == want['table']
+        assert step['pivot_col'] == want['pivot_col'] and step['pivot_row'] == want['pivot_row']
+    result = events[-1][1]
+    assert result[0] == full[0] and result[2] == full[2] and result[4] == full[4]
+    assert len(result[1]) == (1 if history == 'none' else len(full[1]))
+
+
+def test_iter_simplex_can_stop_early():
+    raw, _ = _random_raw(np.random.default_rng(12), 6, 8)
+    stats = {}
+    steps = simplex_core.iter_simplex(raw, MAX, 8, stats=stats)
+    kind, first = next(steps)
+    assert kind == 'step' and first['pivot_col'] is not None
+    steps.close()
+    # Ошибки входных данных приходят результатом, а не исключением
+    assert list(simplex_core.iter_simplex(raw, MAX, 8, history='all')) == [('result', (None, None, None, "Неизвестный режим истории: all", None))]
+
+
+@pytest.mark.parametrize('threads, block', [(4, None), (1, 7), (3, 5)])
+def test_threaded_pivot_is_bit_identical(threads, block):
+    T = np.random.default_rng(13).random((41, 30))
+    expected = T.copy()
+    simplex_core._pivot(expected, 5, 9, np.empty_like(expected))
+    # Потоки по блокам строк и короткий рабочий массив (как у таблицы на диске)
+    got = T.copy()
+    simplex_core._pivot(got, 5, 9, np.empty((block or len(T), T.shape[1])), threads)
+    assert np.array_equal(got, expected)
+
+
+def test_threaded_solve_matches_single_thread():
+    raw, _ = _random_raw(np.random.default_rng(14), 30, 40)
+    single = simplex_core.calculate_simplex(raw, MAX, 40)
+    threaded = simplex_core.calculate_simplex(raw, MAX, 40, options={'threads': 4, 'thread_min_size': 0})
+    assert threaded[0] == single[0] and threaded[2] == single[2]
+    assert [step['table'] for step in threaded[1]] == [step['table'] for step in single[1]]
+
+
+def test_pivot_threads_threshold():
+    opts = simplex_core.solver_options({'threads': 4, 'thread_min_size': 100})
+    assert simplex_core._pivot_threads(opts, np.zeros((10, 10))) == 4
+    assert simplex_core._pivot_threads(opts, np.zeros((9, 10))) == 1
+    assert simplex_core.solver_options({'threads': None})['threads'] >= 1
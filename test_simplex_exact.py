@@ -0,0 +1,102 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_exact
+
+MAX = 'Максимизация'
+
+
+def _fraction_simplex(c, A, b):
+    # Образец: таблица из Fraction, правило Бленда; max c·x, A x <= b, b >= 0
+    m, n = len(b), len(c)
+    T = [[Fraction(-v) for v in c] + [Fraction(0)] * m + [Fraction(0)]]
+    for i in range(m):
+        T.append([Fraction(v) for v in A[i]] + [Fraction(int(i == k)) for k in range(m)] + [Fraction(b[i])])
+    basis = list(range(n, n + m))
+    while True:
+        cols = [j for j in range(n + m) if T[0][j] < 0]
+        if not cols:
+            return T[0][-1]
+        q = cols[0]
+        rows = [i for i in range(1, m + 1) if T[i][q] > 0]
+        if not rows:
+            return None
+        r = min(rows, key=lambda i: (T[i][-1] / T[i][q], basis[i - 1]))
+        pivot = T[r][q]
+        T[r] = [v / pivot for v in T[r]]
+        for i in range(m + 1):
+            if i != r and T[i][q] != 0:
+                factor = T[i][q]
+                T[i] = [v - factor * w for v, w in zip(T[i], T[r])]
+        basis[r - 1] = q
+
+
+def _decimal_problem(rng, m, n):
+    # Десятичные дроби, которые не представимы в float точно
+    c = [v / 10 for v in rng.integers(1, 30, n)]
+    A = [[v / 10 for v in row] for row in rng.integers(0, 25, (m, n))]
+    b = [v / 10 for v in rng.integers(10, 90, m)]
+    return c, A, b
+
+
+def test_to_fraction_uses_decimal_notation():
+    assert simplex_exact.to_fraction(0.1) == Fraction(1, 10)
+    assert simplex_exact.to_fraction(3) == Fraction(3)
+    assert simplex_exact.to_fraction(Fraction(2, 3)) == Fraction(2, 3)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_exact_optimum_matches_fractions(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 6), rng.integers(2, 6)
+    c, A, b = _decimal_problem(rng, m, n)
+    raw = [[0.0] + c] + [[b[i]] + A[i] for i in range(m)]
+    fractions = lambda values: [simplex_exact.to_fraction(v) for v in values]
+    expected = _fraction_simplex(fractions(c), [fractions(row) for row in A], fractions(b))
+    final_z, history, final_vars, err, _ = simplex_core.calculate_simplex(raw, MAX, n, engine='exact')
+    if expected is None:
+        assert err == "Задача не ограничена (нет конечного решения)"
+        return
+    assert err is None
+    assert isinstance(final_z, Fraction) and final_z == expected
+    # Ответ допустим без допусков: A x <= b и c·x = Z точно
+    x = [final_vars.get(f'X{j + 1}', Fraction(0)) for j in range(n)]
+    for i in range(m):
+        assert sum(simplex_exact.to_fraction(A[i][j]) * x[j] for j in range(n)) <= simplex_exact.to_fraction(b[i])
+    assert sum(simplex_exact.to_fraction(c[j]) * x[j] for j in range(n)) == final_z
+    assert all(isinstance(v, Fraction) for v in history[-1]['table']['E'])
+
+
+@pytest.mark.parametrize('history', ['pivots', 'full'])
+def test_exact_history_modes(history):
+    c, A, b = _decimal_problem(np.random.default_rng(3), 4, 5)
+    raw = [[0.0] + c] + [[b[i]] + A[i] for i in range(4)]
+    full = simplex_core.calculate_simplex(raw, MAX, 5, engine='exact')
+    other = simplex_core.calculate_simplex(raw, MAX, 5, engine='exact', history=history)
+    assert [step['table'] for step in other[1]] == [step['table'] for step in full[1]]
+
+
+def test_exact_sensitivity_matches_float():
+    c, A, b = [3.0, 5.0, 0.1], [[1.0, 0.0, 0.3], [0.0, 2.0, 0.2], [3.0, 2.0, 0.7]], [4.0, 12.0, 18.0]
+    raw = [[0.0] + c] + [[b[i]] + A[i] for i in range(3)]
+    exact = simplex_core.calculate_simplex(raw, MAX, 3, engine='exact')
+    floats = simplex_core.calculate_simplex(raw, MAX, 3)
+    got = simplex_core.perform_sensitivity_analysis(exact[1][-1]['table'], b, c, 3, 3, True)
+    want = simplex_core.perform_sensitivity_analysis(floats[1][-1]['table'], b, c, 3, 3, True)
+    for got_list, want_list in zip(got[:2], want[:2]):
+        for got_item, want_item in zip(got_list, want_list):
+            for key, value in want_item.items():
+                if isinstance(value, str):
+                    assert got_item[key] == value
+                else:
+                    assert float(got_item[key]) == pytest.approx(value, abs=1e-9)
+    assert isinstance(got[1][1]['shadow_price'], Fraction)
+
+
+def test_exact_rejects_upper_bounds():
+    raw = [[0.0, 1.0, 1.0], [4.0, 1.0, 1.0]]
+    err = simplex_core.calculate_simplex(raw, MAX, 2, engine='exact', upper=[1.0, None])[3]
+    assert err == "Точный метод не поддерживает верхние границы переменных"
@@ -0,0 +1,74 @@
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_parallel
+
+MAX = 'Максимизация'
+
+
+def _problems(count):
+    rng = np.random.default_rng(0)
+    problems = []
+    for _ in range(count):
+        m, n = rng.integers(2, 6), rng.integers(2, 6)
+        raw = np.zeros((m + 1, n + 1))
+        raw[0, 1:] = rng.integers(1, 9, n)
+        raw[1:, 0] = rng.integers(10, 40, m)
+        raw[1:, 1:] = rng.integers(0, 8, (m, n))
+        problems.append((raw, MAX, int(n)))
+    return problems
+
+
+def test_results_match_calculate_simplex():
+    problems = _problems(6)
+    problems.append({'raw_matrix': problems[0][0], 'operation': MAX, 'num_vars': problems[0][2], 'engine': 'revised', 'sensitivity': True})
+    results = {r[0]: r for r in simplex_parallel.solve_many(problems, workers=2)}
+    assert sorted(results) == list(range(len(problems)))
+    for index, (raw, operation, num_vars) in enumerate(problems[:-1]):
+        final_z, _, final_vars, err, _ = simplex_core.calculate_simplex(raw, operation, num_vars, history='none')
+        _, got_z, got_vars, got_err, stats = results[index]
+        assert got_err == err and got_z == pytest.approx(final_z)
+        assert got_vars == pytest.approx(final_vars)
+        assert stats['iterations'] >= 0 and stats['time'] >= 0
+    extra = results[len(problems) - 1][4]
+    assert extra['engine'] == 'revised' and set(extra['sensitivity']) == {'variables', 'constraints'}
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="нужен fork")
+def test_timeout_and_crash_replace_worker(monkeypatch):
+    # fork: рабочие процессы наследуют подмененный calculate_simplex
+    solve = simplex_core.calculate_simplex
+
+    def patched(raw, operation, num_vars, **kwargs):
+        if num_vars == 7:
+            time.sleep(30)
+        if num_vars == 8:
+            os._exit(3)
+        return solve(raw, operation, num_vars, **kwargs)
+
+    monkeypatch.setattr(simplex_core, 'calculate_simplex', patched)
+    problems = _problems(4)
+    problems.insert(1, (np.zeros((2, 8)), MAX, 7))
+    problems.insert(3, (np.zeros((2, 9)), MAX, 8))
+    started = time.monotonic()
+    results = {r[0]: r for r in simplex_parallel.solve_many(problems, workers=2, timeout=1.0, start_method='fork')}
+    assert time.monotonic() - started < 20
+    assert results[1][3] == "Превышено время решения (1.0 с)"
+    assert results[3][3] == "Процесс решателя завершился аварийно"
+    # Остальные задачи решены замененными процессами
+    for index in (0, 2, 4, 5):
+        assert results[index][3] is None and results[index][1] is not None
+    assert not multiprocessing.active_children()
+
+
+def test_stopping_early_releases_workers():
+    results = simplex_parallel.solve_many(_problems(8), workers=2)
+    next(results)
+    results.close()
+    assert not multiprocessing.active_children()
+    assert list(simplex_parallel.solve_many([])) == []
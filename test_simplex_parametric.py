@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_parametric
+
+MAX = 'Максимизация'
+
+
+def _raw(c, A, b):
+    return [[0.0] + list(c)] + [[b[i]] + list(A[i]) for i in range(len(b))]
+
+
+def _random_model(rng):
+    m, n = rng.integers(2, 6), rng.integers(2, 6)
+    A = rng.integers(1, 8, (m, n)).astype(float)
+    b = rng.integers(10, 30, m).astype(float)
+    c = rng.integers(1, 9, n).astype(float)
+    return c, A, b
+
+
+def _cold(c, A, b):
+    return simplex_core.calculate_simplex(_raw(c, A, b), MAX, len(c), history='none')
+
+
+def _check_segments(segments, solve_at):
+    for prev, segment in zip(segments, segments[1:]):
+        assert segment['t_from'] == pytest.approx(prev['t_to'])
+        assert segment['z_from'] == pytest.approx(prev['z_to'], abs=1e-9)
+    for segment in segments:
+        t_mid = 0.5 * (segment['t_from'] + segment['t_to'])
+        z_mid = segment['z_from'] + segment['slope'] * (t_mid - segment['t_from'])
+        for t, z in ((segment['t_from'], segment['z_from']), (t_mid, z_mid), (segment['t_to'], segment['z_to'])):
+            cold = solve_at(t)
+            assert cold[3] is None
+            assert z == pytest.approx(cold[0], abs=1e-8)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_rhs_segments_match_direct_solves(seed):
+    rng = np.random.default_rng(seed)
+    c, A, b = _random_model(rng)
+    direction = rng.integers(-3, 6, len(b)).astype(float)
+    segments, stop, err = simplex_parametric.parametric_rhs(_raw(c, A, b), MAX, len(c), direction, 0.0, 5.0)
+    assert err is None and segments
+    _check_segments(segments, lambda t: _cold(c, A, b + t * direction))
+    if stop is None:
+        assert segments[-1]['t_to'] == 5.0
+    else:
+        # Сразу за концом последнего участка задача не решается
+        assert _cold(c, A, b + (segments[-1]['t_to'] + 1e-6) * direction)[3] is not None
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_cost_segments_match_direct_solves(seed):
+    rng = np.random.default_rng(50 + seed)
+    c, A, b = _random_model(rng)
+    direction = rng.integers(-4, 5, len(c)).astype(float)
+    segments, stop, err = simplex_parametric.parametric_cost(_raw(c, A, b), MAX, len(c), direction, 0.0, 3.0)
+    assert err is None and stop is None
+    assert segments[0]['t_from'] == 0.0 and segments[-1]['t_to'] == 3.0
+    _check_segments(segments, lambda t: _cold(c + t * direction, A, b))
+    for segment in segments:
+        # Решение на участке постоянно
+        assert segment['vars_from'] == pytest.approx(segment['vars_to'], abs=1e-9)
+
+
+def test_curve_points():
+    c, A, b = [3.0, 5.0], np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]), np.array([4.0, 12.0, 18.0])
+    segments, _, _ = simplex_parametric.parametric_rhs(_raw(c, A, b), MAX, 2, [0.0, 0.0, 1.0], 0.0, 20.0)
+    t, z = simplex_parametric.curve(segments)
+    assert len(t) == len(z) == len(segments) + 1
+    assert t[0] == 0.0 and t[-1] == 20.0 and np.all(np.diff(t) > 0)
+    assert z[0] == pytest.approx(36.0)
+    t, z = simplex_parametric.curve([])
+    assert t.size == z.size == 0
+
+
+def test_rhs_stops_when_infeasible():
+    # x1 + x2 >= 2 и x1 + x2 <= 10 - t: решений нет при t > 8
+    raw = _raw([1.0, 1.0], [[1.0, 1.0], [1.0, 1.0]], [2.0, 10.0])
+    segments, stop, err = simplex_parametric.parametric_rhs(raw, MAX, 2, [0.0, -1.0], 0.0, 20.0, constr_signs=['≥', '≤'])
+    assert err is None
+    assert stop == "Задача не имеет допустимых решений"
+    assert segments[-1]['t_to'] == pytest.approx(8.0)
+    assert segments[-1]['z_to'] == pytest.approx(2.0)
+
+
+def test_cost_stops_when_unbounded():
+    # x1 - x2 <= 4, c = (1, t - 1): при t > 1 выгодно неограниченно увеличивать x2
+    raw = _raw([1.0, -1.0], [[1.0, -1.0], [1.0, 0.0]], [4.0, 6.0])
+    segments, stop, err = simplex_parametric.parametric_cost(raw, MAX, 2, [0.0, 1.0], 0.0, 5.0)
+    assert err is None
+    assert stop == "Задача не ограничена (нет конечного решения)"
+    assert segments[-1]['t_to'] == pytest.approx(1.0)
+
+
+def test_invalid_arguments():
+    raw = _raw([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0]], [4.0, 12.0])
+    assert simplex_parametric.parametric_rhs(raw, MAX, 2, [1.0], 0.0, 1.0)[2] == "Размер направления не совпадает с числом ограничений"
+    assert simplex_parametric.parametric_cost(raw, MAX, 2, [1.0], 0.0, 1.0)[2] == "Размер направления не совпадает с числом переменных"
+    assert simplex_parametric.parametric_rhs(raw, MAX, 2, [1.0, 1.0], 1.0, 0.0)[2] == "Конец диапазона параметра меньше начала"
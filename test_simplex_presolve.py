@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_presolve
+
+MAX = 'Максимизация'
+
+
+def _raw(c, A, b):
+    return [[0.0] + list(c)] + [[b[i]] + list(A[i]) for i in range(len(b))]
+
+
+def _values(final_vars, n):
+    return np.array([final_vars.get(f'X{j+1}', 0.0) for j in range(n)])
+
+
+def test_reductions_are_reported():
+    # Строка 2 - одиночная, строка 3 дублирует строку 1, X3 закреплена, X4 вне ограничений
+    c = [3.0, 2.0, 1.0, 4.0]
+    A = np.array([[1.0, 1.0, 1.0, 0.0], [0.0, 2.0, 0.0, 0.0], [2.0, 2.0, 2.0, 0.0]])
+    b = np.array([10.0, 8.0, 30.0])
+    lower, upper = [0.0, 0.0, 2.0, 0.0], [np.inf, np.inf, 2.0, 5.0]
+    model, err = simplex_presolve.presolve(c, A, b, lower, upper)
+    assert err is None
+    report = model['report']
+    assert 2 in report['fixed_cols'] and 3 in report['empty_cols']
+    assert 1 in report['singleton_rows'] and report['duplicate_rows']
+    assert model['fixed'][2] == 2.0 and model['fixed'][3] == 5.0
+    assert report['rows'][1] < report['rows'][0]
+    assert simplex_presolve.summary(report)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_presolve_and_postsolve_match_plain_solve(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 7), rng.integers(2, 8)
+    A = rng.integers(0, 6, (m, n)).astype(float)
+    b = rng.integers(5, 30, m).astype(float)
+    c = rng.integers(-2, 9, n).astype(float)
+    upper = np.where(rng.random(n) < 0.4, rng.integers(0, 4, n), np.inf).tolist()
+    plain = simplex_core.calculate_simplex(_raw(c, A, b), MAX, n, upper=upper, history='none')
+    stats = {}
+    presolved = simplex_core.calculate_simplex(_raw(c, A, b), MAX, n, upper=upper, history='none', presolve=True, stats=stats)
+    assert (presolved[3] is None) == (plain[3] is None)
+    if plain[3] is None:
+        assert presolved[0] == pytest.approx(plain[0], abs=1e-9)
+        # Ответ исходной задачи: допустим и дает то же значение ЦФ
+        x = _values(presolved[2], n)
+        assert np.all(A @ x <= b + 1e-9) and np.all(x <= np.array(upper) + 1e-9) and np.all(x >= -1e-9)
+        assert c @ x == pytest.approx(plain[0], abs=1e-9)
+        for i, slack in enumerate(b - A @ x):
+            assert presolved[2].get(f'X{n + i + 1}', 0.0) == pytest.approx(slack, abs=1e-9)
+        assert 'presolve' in stats
+
+
+def test_sensitivity_after_presolve_matches_tableau():
+    c, A, b = [3.0, 5.0, 1.0], np.array([[1.0, 0.0, 1.0], [0.0, 2.0, 0.0], [3.0, 2.0, 1.0]]), np.array([4.0, 12.0, 18.0])
+    raw = _raw(c, A, b)
+    full = simplex_core.calculate_simplex(raw, MAX, 3)
+    expected = simplex_core.perform_sensitivity_analysis(full[1][-1]['table'], list(b), c, 3, 3, True)
+    final_vars = simplex_core.calculate_simplex(raw, MAX, 3, presolve=True, history='none')[2]
+    got = simplex_presolve.sensitivity(raw, MAX, 3, final_vars)
+    for got_list, want_list in zip(got[:2], expected[:2]):
+        for got_item, want_item in zip(got_list, want_list):
+            for key, value in want_item.items():
+                assert got_item[key] == (value if isinstance(value, str) else pytest.approx(value, abs=1e-9))
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_revised
+from simplex_sparse import CscMatrix
+
+MAX = 'Максимизация'
+
+
+def _problem(rng, m, n, sparse):
+    A = rng.random((m, n)) * 9 + 1
+    A[rng.random((m, n)) < 0.5] = 0.0
+    A[np.arange(m), rng.integers(0, n, m)] += 5.0
+    return simplex_revised.RevisedProblem(rng.random(n), CscMatrix.from_dense(A) if sparse else A, rng.random(m) * 10)
+
+
+def _basis_matrix(problem, basis):
+    return np.column_stack([problem.column(j) for j in basis])
+
+
+def _solved_state(rng, m, n, sparse):
+    problem = _problem(rng, m, n, sparse)
+    st = simplex_revised.initial_state(problem)
+    _, err = simplex_revised.primal_simplex(problem, st)
+    assert err is None
+    return problem, st
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_factor_solves_match_basis_matrix(sparse):
+    rng = np.random.default_rng(1)
+    problem = _problem(rng, 12, 15, sparse)
+    basis = np.concatenate((rng.choice(15, 8, replace=False), 15 + np.arange(4)))
+    factor = simplex_revised.BasisFactor(problem, basis)
+    # Две замены столбцов через eta-файл
+    for r, q in ((0, 15 + 11), (5, 15 + 9)):
+        factor.update(r, factor.ftran(problem.column(q)))
+        basis[r] = q
+    B = _basis_matrix(problem, basis)
+    a, C = rng.random(12), rng.random((12, 3))
+    assert np.allclose(B @ factor.ftran(a), a)
+    assert np.allclose(B @ factor.ftran(C), C)
+    assert np.allclose(B.T @ factor.btran(a), a)
+    assert np.allclose(B.T @ factor.btran(C), C)
+
+
+def test_dense_lu_by_blocks(monkeypatch):
+    # LU на NumPy: несколько панелей и блочные подстановки
+    monkeypatch.setattr(simplex_revised, '_LU_BLOCK', 4)
+    rng = np.random.default_rng(5)
+    K = rng.random((11, 11))
+    kernel = simplex_revised._DenseKernel(K)
+    a, C = rng.random(11), rng.random((11, 3))
+    assert np.allclose(K @ kernel.solve(a), a)
+    assert np.allclose(K @ kernel.solve(C), C)
+    assert np.allclose(K.T @ kernel.solve_transposed(a), a)
+    assert np.allclose(K.T @ kernel.solve_transposed(C), C)
+    with pytest.raises(np.linalg.LinAlgError):
+        simplex_revised._DenseKernel(np.outer(K[0], K[1]))
+
+
+def test_sparse_kernel_with_scipy():
+    pytest.importorskip('scipy')
+    problem = _problem(np.random.default_rng(2), 20, 25, sparse=True)
+    factor = simplex_revised.BasisFactor(problem, np.arange(20))
+    assert isinstance(factor.kernel, simplex_revised._SparseKernel)
+    B = _basis_matrix(problem, np.arange(20))
+    a = np.arange(20.0)
+    assert np.allclose(B @ factor.ftran(a), a)
+    assert np.allclose(B.T @ factor.btran(a), a)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_singular_basis_is_rejected(sparse):
+    A = np.array([[1.0, 2.0], [2.0, 4.0]])
+    problem = simplex_revised.RevisedProblem([1.0, 1.0], CscMatrix.from_dense(A) if sparse else A, [1.0, 1.0])
+    with pytest.raises(np.linalg.LinAlgError):
+        simplex_revised.BasisFactor(problem, np.array([0, 1]))
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_column_norms_by_blocks(sparse, monkeypatch):
+    problem, st = _solved_state(np.random.default_rng(3), 10, 14, sparse)
+    assert (st['basis'] < problem.n).any()
+    B = _basis_matrix(problem, st['basis'])
+    full = np.column_stack((problem.A.to_dense(), np.identity(10)))
+    expected = (np.linalg.solve(B, full) ** 2).sum(axis=0)
+    monkeypatch.setattr(simplex_revised, '_BLOCK_ELEMENTS', 25)
+    assert np.allclose(simplex_revised._column_norms_sq(problem, st), expected)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_blockwise_sensitivity_matches_tableau(sparse, monkeypatch):
+    rng = np.random.default_rng(4)
+    m, n = 8, 11
+    A = rng.integers(1, 9, (m, n)).astype(float)
+    b = rng.integers(20, 60, m).astype(float)
+    c = rng.integers(1, 9, n).astype(float)
+    raw = np.vstack((np.insert(c, 0, 0.0), np.column_stack((b, A))))
+    table = simplex_core.calculate_simplex(raw, MAX, n)[1][-1]['table']
+    expected = simplex_core.perform_sensitivity_analysis(table, list(b), list(c), n, m, True)
+
+    _, history, _, err, _ = simplex_core.calculate_simplex_sparse(c, CscMatrix.from_dense(A) if sparse else A, b, MAX, history='none')
+    assert err is None
+    # Блоки из нескольких столбцов B^-1 и строк таблицы
+    monkeypatch.setattr(simplex_core, '_SENSITIVITY_BLOCK', 20)
+    got = simplex_core.perform_sparse_sensitivity(c, CscMatrix.from_dense(A) if sparse else A, b, history[-1]['basis'], True)
+    for got_list, want_list in zip(got[:2], expected[:2]):
+        for got_item, want_item in zip(got_list, want_list):
+            for key, value in want_item.items():
+                assert got_item[key] == (value if isinstance(value, str) else pytest.approx(value, abs=1e-9))
+
+
+@pytest.mark.parametrize('history', ['pivots', 'full'])
+def test_revised_history_tables(history):
+    import simplex_cache
+    rng = np.random.default_rng(6)
+    A = rng.integers(1, 9, (5, 7)).astype(float)
+    raw = np.vstack((np.insert(rng.integers(1, 9, 7).astype(float), 0, 0.0), np.column_stack((rng.integers(20, 60, 5), A))))
+    tableau = simplex_core.calculate_simplex(raw, MAX, 7)
+    result = simplex_core.calculate_simplex(raw, MAX, 7, engine='revised', history=history)
+    size = simplex_cache.result_nbytes(result)
+    assert len(result[1]) == len(tableau[1])
+    for got, want in zip(result[1], tableau[1]):
+        for key, column in want['table'].items():
+            assert got['table'][key] == pytest.approx(column, abs=1e-9)
+    # Просмотр истории не добавляет в нее таблиц
+    assert simplex_cache.result_nbytes(result) <= size
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_scaling
+
+MAX = 'Максимизация'
+MIN = 'Минимизация'
+
+
+@pytest.mark.parametrize('engine', ['tableau', 'revised'])
+def test_small_scaled_reduced_cost_is_not_optimal(engine):
+    # Нормировка строки ЦФ делала оценку X1 (-0.00475) меньше opt_tol
+    raw = np.array([
+        [0, 7e-3, 8, 3e-2],
+        [70, 700, 0, 3e-3],
+        [90, 6000, 0.3, 8e4],
+        [1700, 8000, 7e-3, 3e-3],
+    ])
+    upper = [1, 2, np.inf]
+    plain = simplex_core.calculate_simplex(raw, MAX, 3, upper=upper, engine=engine, history='none')
+    scaled = simplex_core.calculate_simplex(raw, MAX, 3, upper=upper, engine=engine, history='none', scaling=True)
+    assert plain[3] is None and scaled[3] is None
+    assert scaled[0] == pytest.approx(16.0001043, rel=1e-12)
+    assert scaled[0] == pytest.approx(plain[0], rel=1e-12)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_scaled_matches_unscaled(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 7, size=2)
+    A = rng.integers(1, 9, (m, n)) * 10.0 ** rng.integers(-4, 5, (m, n))
+    raw = np.zeros((m + 1, n + 1))
+    raw[0, 1:] = rng.integers(1, 9, n) * 10.0 ** rng.integers(-3, 3, n)
+    raw[1:, 0] = rng.integers(1, 50, m) * 10.0 ** rng.integers(-2, 3, m)
+    raw[1:, 1:] = A
+    operation = MAX if seed % 2 else MIN
+    plain = simplex_core.calculate_simplex(raw, operation, n, history='none')
+    scaled = simplex_core.calculate_simplex(raw, operation, n, history='full', scaling=True)
+    assert plain[3] == scaled[3]
+    if plain[3] is None:
+        assert scaled[0] == pytest.approx(plain[0], rel=1e-9, abs=1e-12)
+
+
+def test_history_and_result_are_in_user_units():
+    raw = np.array([[0, 3e3, 5e-2], [4, 1, 0], [12e3, 0, 2e3], [18, 3, 2e-3]])
+    final_z, history, final_vars, err, _ = simplex_core.calculate_simplex(raw, MAX, 2, scaling=True)
+    plain = simplex_core.calculate_simplex(raw, MAX, 2)
+    assert err is None
+    assert final_z == pytest.approx(plain[0])
+    for name, value in plain[2].items():
+        assert final_vars[name] == pytest.approx(value)
+    assert history[-1]['table']['E'][-1] == pytest.approx(plain[1][-1]['table']['E'][-1])
+
+
+def test_scale_factors_are_powers_of_two():
+    A = np.array([[1e-3, 5e4], [7.0, 0.0]])
+    scaled = simplex_scaling.scale_problem([1.0, 2.0], A, [1.0, 1.0], [0.0, 0.0], [np.inf, np.inf])
+    for factors in (scaled['row'], scaled['col']):
+        assert np.all(np.log2(factors) == np.round(np.log2(factors)))
+    assert scaled['spread'][1] <= scaled['spread'][0]
+    assert 0 < scaled['tol'] <= 1
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_parametric
+import simplex_session
+
+MAX = 'Максимизация'
+
+
+def _raw(c, A, b):
+    return [[0.0] + list(c)] + [[b[i]] + list(A[i]) for i in range(len(b))]
+
+
+def _random_model(rng):
+    m, n = rng.integers(2, 7), rng.integers(2, 8)
+    A = rng.integers(1, 8, (m, n)).astype(float)
+    b = rng.integers(5, 30, m).astype(float)
+    c = rng.integers(1, 9, n).astype(float)
+    return c, A, b
+
+
+def _assert_same(session_result, c, A, b, upper=None):
+    final_z, _, err = session_result
+    cold = simplex_core.calculate_simplex(_raw(c, A, b), MAX, len(c), upper=upper, history='none')
+    assert (err is None) == (cold[3] is None)
+    if err is None:
+        assert final_z == pytest.approx(cold[0], abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_reoptimize_matches_cold_solve(seed):
+    rng = np.random.default_rng(seed)
+    c, A, b = _random_model(rng)
+    upper = np.where(rng.random(len(c)) < 0.3, rng.integers(1, 5, len(c)), np.inf)
+    session = simplex_session.SimplexSession(_raw(c, A, b), MAX, len(c), upper=upper.tolist())
+    _assert_same(session.reoptimize(), c, A, b, upper.tolist())
+
+    i, j = rng.integers(len(b)), rng.integers(len(c))
+    b[i] += rng.integers(-4, 5)
+    c[j] += rng.integers(-3, 4)
+    session.set_rhs(i, b[i])
+    session.set_cost(j, c[j])
+    _assert_same(session.reoptimize(), c, A, b, upper.tolist())
+
+    row = rng.integers(1, 6, len(c)).astype(float)
+    session.add_constraint(row, 10.0)
+    A, b = np.vstack((A, row)), np.append(b, 10.0)
+    _assert_same(session.reoptimize(), c, A, b, upper.tolist())
+
+    session.remove_constraint(0)
+    A, b = A[1:], b[1:]
+    _assert_same(session.reoptimize(), c, A, b, upper.tolist())
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_bulk_updates_match_cold_solve(seed):
+    rng = np.random.default_rng(100 + seed)
+    c, A, b = _random_model(rng)
+    session = simplex_session.SimplexSession(_raw(c, A, b), MAX, len(c))
+    session.reoptimize()
+    b = b + rng.integers(-4, 5, len(b))
+    c = c + rng.integers(-3, 4, len(c))
+    session.set_rhs_vector(b)
+    session.set_cost_vector(c)
+    _assert_same(session.reoptimize(), c, A, b)
+    assert session.last_method in ('none', 'primal', 'dual', 'cold')
+
+
+def test_bulk_update_checks_size():
+    session = simplex_session.SimplexSession(_raw([1.0, 2.0], [[1.0, 1.0]], [4.0]), MAX, 2)
+    with pytest.raises(ValueError):
+        session.set_rhs_vector([1.0, 2.0])
+    with pytest.raises(ValueError):
+        session.set_cost_vector([1.0])
+
+
+def test_change_within_range_keeps_basis():
+    c, A, b = [3.0, 5.0], np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]), np.array([4.0, 12.0, 18.0])
+    session = simplex_session.SimplexSession(_raw(c, A, b), MAX, 2)
+    assert session.reoptimize()[0] == pytest.approx(36.0)
+    low, high = session.rhs_range(2)
+    assert low < 20.0 < high
+    assert session.set_rhs(2, 20.0)
+    final_z, _, err = session.reoptimize()
+    assert err is None and session.last_method == 'range'
+    _assert_same((final_z, None, err), c, A, [4.0, 12.0, 20.0])
+
+
+def test_parametric_rhs_endpoints_match_cold_solves():
+    c, A, b = [3.0, 5.0], np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]), np.array([4.0, 12.0, 18.0])
+    direction = np.array([0.0, 0.0, 1.0])
+    segments, stop, err = simplex_parametric.parametric_rhs(_raw(c, A, b), MAX, 2, direction, 0.0, 20.0)
+    assert err is None and stop is None and len(segments) > 1
+    for segment in segments:
+        for t, z in ((segment['t_from'], segment['z_from']), (segment['t_to'], segment['z_to'])):
+            cold = simplex_core.calculate_simplex(_raw(c, A, b + t * direction), MAX, 2, history='none')
+            assert z == pytest.approx(cold[0])
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_ranges_match_sensitivity(seed):
+    rng = np.random.default_rng(200 + seed)
+    c, A, b = _random_model(rng)
+    m, n = A.shape
+    session = simplex_session.SimplexSession(_raw(c, A, b), MAX, n)
+    assert session.rhs_range(0) is None
+    session.reoptimize()
+    table = simplex_core.calculate_simplex(_raw(c, A, b), MAX, n)[1][-1]['table']
+    var_an, constr_an, _ = simplex_core.perform_sensitivity_analysis(table, list(b), list(c), n, m, True)
+    for i, item in enumerate(constr_an):
+        assert session.rhs_range(i) == pytest.approx((b[i] - item['allow_decrease'], b[i] + item['allow_increase']), abs=1e-9)
+    # Отчет пропускает небазисные столбцы с нулевой оценкой, сессия их учитывает:
+    # при двойственной вырожденности ее диапазон уже (и только он сохраняет базис)
+    degenerate = any(abs(d) < 1e-9 and f'X{k+1}' not in table for k, d in enumerate(table['E'][:-1]))
+    for j, item in enumerate(var_an):
+        expected = (c[j] - item['allow_decrease'], c[j] + item['allow_increase'])
+        low, high = session.cost_range(j)
+        if degenerate:
+            assert expected[0] <= low + 1e-9 and high <= expected[1] + 1e-9
+        else:
+            assert (low, high) == pytest.approx(expected, abs=1e-9)
+
+
+def test_cost_change_within_range_keeps_basis():
+    c, A, b = [3.0, 5.0], np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]), np.array([4.0, 12.0, 18.0])
+    session = simplex_session.SimplexSession(_raw(c, A, b), MAX, 2)
+    session.reoptimize()
+    low, high = session.cost_range(0)
+    assert session.set_cost(0, 0.5 * (c[0] + high))
+    final_z, _, err = session.reoptimize()
+    assert err is None and session.last_method == 'range'
+    _assert_same((final_z, None, err), [0.5 * (c[0] + high), 5.0], A, b)
+
+
+def test_change_outside_range_reoptimizes():
+    c, A, b = [3.0, 5.0], np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]), np.array([4.0, 12.0, 18.0])
+    session = simplex_session.SimplexSession(_raw(c, A, b), MAX, 2)
+    session.reoptimize()
+    b = np.array([4.0, 12.0, session.rhs_range(2)[1] + 5.0])
+    assert not session.set_rhs(2, b[2])
+    _assert_same(session.reoptimize(), c, A, b)
+    assert session.last_method != 'range'
+
+    c = [3.0, session.cost_range(1)[0] - 1.0]
+    assert not session.set_cost(1, c[1])
+    _assert_same(session.reoptimize(), c, A, b)
+    assert session.last_method != 'range'
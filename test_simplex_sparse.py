@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import simplex_core
+from simplex_sparse import CscMatrix, DenseMatrix, as_constraint_matrix
+
+MAX = 'Максимизация'
+
+
+def _random_sparse(rng, m, n, density=0.3):
+    A = rng.random((m, n)) * 9 + 1
+    A[rng.random((m, n)) >= density] = 0.0
+    return A
+
+
+def test_csc_operations_match_dense():
+    rng = np.random.default_rng(0)
+    A = _random_sparse(rng, 30, 40)
+    S, D = CscMatrix.from_dense(A), DenseMatrix(A)
+    x, y = rng.random(40), rng.random(30)
+    X, Y = rng.random((40, 5)), rng.random((30, 5))
+    for M in (S, D):
+        assert np.allclose(M.matvec(x), A @ x)
+        assert np.allclose(M.matvec(X), A @ X)
+        assert np.allclose(M.rmatvec(y), A.T @ y)
+        assert np.allclose(M.rmatvec(Y), A.T @ Y)
+        assert np.allclose(M.rmatvec_range(y, 5, 17), A[:, 5:17].T @ y)
+        assert np.allclose(M.col_norms_sq(), (A * A).sum(axis=0))
+        assert np.allclose(M.select_columns([7, 2, 2]).to_dense(), A[:, [7, 2, 2]])
+        assert np.allclose(M.submatrix([3, 1, 9], [5, 0, 8]).to_dense(), A[np.ix_([3, 1, 9], [5, 0, 8])])
+    assert S.nnz == D.nnz
+
+
+def test_csc_constructors():
+    rows, cols, vals = [0, 2, 0, 1, 0], [0, 0, 2, 1, 0], [1.0, 2.0, 3.0, 4.0, 5.0]
+    S = CscMatrix.from_coo(rows, cols, vals, (3, 3))
+    expected = np.array([[6.0, 0, 3.0], [0, 4.0, 0], [2.0, 0, 0]])
+    assert np.array_equal(S.to_dense(), expected)
+    indptr = np.concatenate(([0], np.cumsum((expected != 0).sum(axis=1))))
+    csr = CscMatrix.from_csr(indptr, np.nonzero(expected)[1], expected[expected != 0], expected.shape)
+    assert np.array_equal(csr.to_dense(), expected)
+    assert as_constraint_matrix(S) is S
+    assert isinstance(as_constraint_matrix(expected), DenseMatrix)
+
+
+@pytest.mark.parametrize('pricing', simplex_core.PRICING_RULES)
+def test_sparse_solver_matches_tableau(pricing):
+    rng = np.random.default_rng(len(pricing))
+    for _ in range(10):
+        m, n = rng.integers(2, 12), rng.integers(2, 15)
+        A = _random_sparse(rng, m, n, 0.4)
+        b = rng.integers(1, 40, m).astype(float)
+        c = rng.integers(1, 9, n).astype(float)
+        upper = np.where(rng.random(n) < 0.4, rng.integers(1, 5, n), np.inf).tolist()
+        raw = np.vstack((np.insert(c, 0, 0.0), np.column_stack((b, A))))
+        reference = simplex_core.calculate_simplex(raw, MAX, n, upper=upper)
+        final_z, history, _, err, _ = simplex_core.calculate_simplex_sparse(
+            c, CscMatrix.from_dense(A), b, MAX, upper=upper, pricing=pricing, history='none'
+        )
+        assert err == reference[3]
+        if err is None:
+            assert final_z == pytest.approx(reference[0], abs=1e-9)
+            table_vars, table_constrs, _ = simplex_core.perform_sensitivity_analysis(
+                reference[1][-1]['table'], list(b), list(c), n, m, True,
+                upper=upper, flipped=reference[1][-1].get('flipped'),
+            )
+            sparse_vars, sparse_constrs, _ = simplex_core.perform_sparse_sensitivity(
+                c, CscMatrix.from_dense(A), b, history[-1]['basis'], True,
+                upper=upper, flipped=history[-1].get('flipped'),
+            )
+            for got, want in zip(sparse_constrs, table_constrs):
+                assert got['shadow_price'] == pytest.approx(want['shadow_price'], abs=1e-9)
+            for got, want in zip(sparse_vars, table_vars):
+                assert got['final_value'] == pytest.approx(want['final_value'], abs=1e-9)
@@ -0,0 +1,58 @@
+import gc
+import os
+
+import numpy as np
+import pytest
+
+import simplex_core
+import simplex_storage
+
+MAX = 'Максимизация'
+
+
+def _raw(seed, m=12, n=15):
+    rng = np.random.default_rng(seed)
+    raw = np.zeros((m + 1, n + 1))
+    raw[0, 1:] = rng.integers(1, 9, n)
+    raw[1:, 0] = rng.integers(20, 60, m)
+    raw[1:, 1:] = rng.integers(0, 9, (m, n))
+    return raw
+
+
+@pytest.mark.parametrize('engine, history', [('tableau', 'full'), ('tableau', 'pivots'), ('revised', 'full')])
+def test_disk_storage_matches_memory(engine, history, tmp_path, monkeypatch):
+    # Маленький блок: поворот и запись истории идут несколькими блоками строк
+    monkeypatch.setattr(simplex_storage, 'BLOCK_BYTES', 3 * 8 * 28)
+    raw = _raw(1)
+    memory = simplex_core.calculate_simplex(raw, MAX, 15, engine=engine, history=history)
+    disk = simplex_core.calculate_simplex(raw, MAX, 15, engine=engine, history=history,
+                                          options={'storage': 'disk', 'scratch_dir': str(tmp_path)})
+    assert disk[0] == memory[0] and disk[2] == memory[2]
+    assert [step['table'] for step in disk[1]] == [step['table'] for step in memory[1]]
+    if history == 'full':
+        assert isinstance(disk[1].tableaux, simplex_storage._DiskLog)
+
+
+def test_scratch_files_removed_with_history(tmp_path):
+    result = simplex_core.calculate_simplex(_raw(2), MAX, 15, options={'storage': 'disk', 'scratch_dir': str(tmp_path)})
+    (scratch,) = os.listdir(tmp_path)
+    assert os.listdir(tmp_path / scratch)
+    del result
+    gc.collect()
+    assert not os.listdir(tmp_path)
+
+
+def test_disk_log_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(simplex_storage, 'BLOCK_BYTES', 64)
+    storage = simplex_storage.DiskStorage(str(tmp_path))
+    log = storage.log((5, 4))
+    items = [np.random.default_rng(k).random((5, 4)) for k in range(3)]
+    for item in items:
+        log.append(item)
+    assert log.size == 3 and log.nbytes == 3 * 5 * 4 * 8
+    for k, item in enumerate(items):
+        assert np.array_equal(log[k], item)
+    assert np.array_equal(log[-1], items[-1])
+    T = storage.copy(items[0])
+    assert isinstance(T, np.memmap) and np.array_equal(T, items[0])
+    assert len(storage.work(T)) == 2